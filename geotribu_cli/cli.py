@@ -10,8 +10,9 @@
 # standard lib
 import argparse
 import logging
+import multiprocessing
 import sys
-from os import getenv
+from os import environ, getenv
 
 # 3rd party
 import argcomplete
@@ -28,6 +29,7 @@ from geotribu_cli.__about__ import (
     __version__,
 )
 from geotribu_cli.subcommands import (
+    parser_cache,
     parser_comments_broadcast,
     parser_comments_latest,
     parser_comments_read,
@@ -38,10 +40,13 @@ from geotribu_cli.subcommands import (
     parser_new_article,
     parser_open_result,
     parser_search_content,
+    parser_search_daemon,
     parser_search_image,
     parser_upgrade,
 )
+from geotribu_cli.utils.http_client import OfflineModeError
 from geotribu_cli.utils.journalizer import configure_logger
+from geotribu_cli.utils.str2bool import str2bool
 
 # #############################################################################
 # ########## Globals ###############
@@ -73,6 +78,14 @@ def add_common_arguments(parser_to_update: argparse.ArgumentParser):
         dest="verbosity",
         help="Niveau de verbosité : None = WARNING, -v = INFO, -vv = DEBUG",
     )
+    parser_to_update.add_argument(
+        "--offline",
+        action="store_true",
+        default=argparse.SUPPRESS,
+        dest="offline",
+        help="Mode hors-ligne : utiliser uniquement les fichiers déjà téléchargés, "
+        "même périmés, sans jamais accéder au réseau.",
+    )
     return parser_to_update
 
 
@@ -128,6 +141,10 @@ def main(args: list[str] | None = None):
     Args:
         args (list[str], optional): list of command-line arguments. Defaults to None.
     """
+    # frozen builds (PyInstaller): the processes analyzing the contents must not run
+    # the CLI again
+    multiprocessing.freeze_support()
+
     # create the top-level parser
     main_parser = argparse.ArgumentParser(
         formatter_class=RawDescriptionRichHelpFormatter,
@@ -160,6 +177,16 @@ def main(args: list[str] | None = None):
         help="Désactiver les fichiers de journalisation (logs).",
     )
 
+    main_parser.add_argument(
+        "--offline",
+        action="store_true",
+        default=str2bool(getenv("GEOTRIBU_OFFLINE", False)),
+        dest="offline",
+        help="Mode hors-ligne : utiliser uniquement les fichiers déjà téléchargés, "
+        "même périmés, sans jamais accéder au réseau. Réglable avec la variable "
+        "d'environnement GEOTRIBU_OFFLINE.",
+    )
+
     main_parser.add_argument(
         "-h",
         "--help",
@@ -211,6 +238,17 @@ def main(args: list[str] | None = None):
     add_common_arguments(subcmd_search_image)
     parser_search_image(subcmd_search_image)
 
+    # Search daemon
+    subcmd_search_daemon = subparsers.add_parser(
+        "search-daemon",
+        aliases=["démon", "daemon"],
+        help="Garder les index de recherche en mémoire pour des recherches instantanées",
+        formatter_class=main_parser.formatter_class,
+        prog="search-daemon",
+    )
+    add_common_arguments(subcmd_search_daemon)
+    parser_search_daemon(subcmd_search_daemon)
+
     # Content reader
     subcmd_opener = subparsers.add_parser(
         "ouvrir",
@@ -223,6 +261,16 @@ def main(args: list[str] | None = None):
     add_common_arguments(subcmd_opener)
     parser_open_result(subcmd_opener)
 
+    # Cache manager
+    subcmd_cache = subparsers.add_parser(
+        "cache",
+        help="Inspecter, purger ou préremplir le cache local (~/.geotribu).",
+        formatter_class=main_parser.formatter_class,
+        prog="cache",
+    )
+    add_common_arguments(subcmd_cache)
+    parser_cache(subcmd_cache)
+
     # Upgrader
     subcmd_upgrade = subparsers.add_parser(
         "upgrade",
@@ -387,9 +435,16 @@ def main(args: list[str] | None = None):
     logger = logging.getLogger(__title_clean__)
     logger.debug(f"Log level set: {logging.getLevelName(args.verbosity)}")
 
+    # offline mode, read by every network call (and inherited by subprocesses)
+    if args.offline:
+        environ["GEOTRIBU_OFFLINE"] = "true"
+
     # -- RUN LOGIC --
     if hasattr(args, "func"):
-        args.func(args)
+        try:
+            args.func(args)
+        except OfflineModeError as err:
+            sys.exit(str(err))
 
 
 # -- Stand alone execution
@@ -83,6 +83,7 @@ def format_output_result_search_content(
     search_term: str | None = None,
     format_type: str | None = None,
     count: int = 5,
+    results_total: int | None = None,
     search_filter_dates: tuple | None = None,
     search_filter_type: str | None = None,
 ) -> list[dict] | Table:
@@ -93,6 +94,8 @@ def format_output_result_search_content(
         search_term (str, optional): term used for search. Defaults to None.
         format_type (str, optional): format output option. Defaults to None.
         count (int, optional): default number of results to display. Defaults to 5.
+        results_total (int, optional): total number of results, when only the best \
+            ones are passed. Defaults to None (length of result).
         search_filter_dates: dates used to filter search. Defaults to None.
         search_filter_type: type used to filter search. Defaults to None.
 
@@ -106,7 +109,7 @@ def format_output_result_search_content(
             search_filter_dates=search_filter_dates,
             search_filter_type=search_filter_type,
             search_term=search_term,
-            search_results_total=len(result),
+            search_results_total=results_total or len(result),
             search_results_displayed=count,
             hint="Astuce : ctrl+clic sur le titre pour ouvrir le contenu",
         )
@@ -149,6 +152,7 @@ def format_output_result_search_image(
     search_term: str | None = None,
     format_type: str | None = None,
     count: int = 5,
+    results_total: int | None = None,
     search_filter_type: str | None = None,
 ) -> list[dict] | Table:
     """Format result according to output option.
@@ -158,6 +162,8 @@ def format_output_result_search_image(
         search_term (str, optional): term used for search. Defaults to None.
         format_type (str, optional): format output option. Defaults to None.
         count (int, optional): default number of results to display. Defaults to 5.
+        results_total (int, optional): total number of results, when only the best \
+            ones are passed. Defaults to None (length of result).
 
     Returns:
         str: formatted result ready to print
@@ -167,7 +173,7 @@ def format_output_result_search_image(
             in_txt="Recherche dans les images",
             search_term=search_term,
             search_filter_type=search_filter_type,
-            search_results_total=len(result),
+            search_results_total=results_total or len(result),
             search_results_displayed=count,
             hint="Astuce : ctrl+clic sur le nom pour ouvrir l'image",
         )
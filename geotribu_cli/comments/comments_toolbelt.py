@@ -12,6 +12,7 @@ from typing import Literal
 # package
 from geotribu_cli.comments.mdl_comment import Comment
 from geotribu_cli.constants import GeotribuDefaults
+from geotribu_cli.utils.file_compression import open_local_file
 from geotribu_cli.utils.file_downloader import download_remote_file_to_local
 
 # ############################################################################
@@ -39,7 +40,7 @@ def filter_comment_by_id(comment_id: int) -> Comment | None:
     comments_file = defaults_settings.geotribu_working_folder.joinpath(
         "comments/latest.json"
     )
-    with comments_file.open(mode="r", encoding="UTF-8") as f:
+    with open_local_file(comments_file, mode="rt", encoding="UTF-8") as f:
         comments = json.loads(f.read())
 
     li_comments = [Comment(**c) for c in comments]
@@ -169,10 +170,12 @@ def get_latest_comments(
         "author_asc", "author_desc", "created_asc", "created_desc"
     ] = "created_asc",
     expiration_rotating_hours: int = 1,
-    attempt: int = 1,
 ) -> list[Comment]:
     """Download and parse latest comments published.
 
+    Network failures are retried by the download layer. A local file which can't \
+        be parsed is removed, to be downloaded again from scratch by the next call.
+
     Args:
         number: count of comments to download. Must be > 1. Defaults to 5.
         sort_by: comments sorting criteria. Defaults to "created_asc".
@@ -194,18 +197,16 @@ def get_latest_comments(
         ),
         expiration_rotating_hours=expiration_rotating_hours,
         content_type="application/json",
+        compress_at_rest=True,
     )
 
     try:
-        with comments_file.open(mode="r", encoding="UTF-8") as f:
+        with open_local_file(comments_file, mode="rt", encoding="UTF-8") as f:
             comments = json.loads(f.read())
     except json.decoder.JSONDecodeError as err:
         logger.error(f"Impossible de lire le fichier des commentaires. Trace {err}")
-        if attempt < 2:
-            logger.info("Deuxième essai en forçant le téléchargement du fichier.")
-            return get_latest_comments(
-                number=number, sort_by=sort_by, expiration_rotating_hours=0, attempt=2
-            )
+        # a revalidation would keep it: removed to be downloaded again next time
+        comments_file.unlink(missing_ok=True)
         raise err
 
     li_comments = [Comment(**c) for c in comments]
@@ -13,12 +13,21 @@ from geotribu_cli.constants import (
 )
 from geotribu_cli.json.json_client import JsonFeedClient
 from geotribu_cli.utils.check_path import check_path
-from geotribu_cli.utils.file_downloader import download_remote_file_to_local
+from geotribu_cli.utils.file_compression import read_local_file
+from geotribu_cli.utils.file_downloader import (
+    download_remote_file_to_local,
+    download_remote_files_to_local,
+)
 from geotribu_cli.utils.slugger import sluggy
 
 logger = logging.getLogger(__name__)
 defaults_settings = GeotribuDefaults()
 
+images_sizes_remote_url: str = f"{defaults_settings.cdn_base_url}img/search-index.json"
+images_sizes_local_path: Path = defaults_settings.geotribu_working_folder.joinpath(
+    "img/search-index.json"
+)
+
 
 # ############################################################################
 # ########## CLI #################
@@ -114,15 +123,13 @@ def download_image_sizes() -> dict:
     """
     # download images sizes and indexes
     local_dims = download_remote_file_to_local(
-        remote_url_to_download=f"{defaults_settings.cdn_base_url}img/search-index.json",
-        local_file_path=defaults_settings.geotribu_working_folder.joinpath(
-            "img/search-index.json"
-        ),
+        remote_url_to_download=images_sizes_remote_url,
+        local_file_path=images_sizes_local_path,
         expiration_rotating_hours=24,
+        compress_at_rest=True,
     )
-    with local_dims.open("rb") as fd:
-        img_dims = orjson.loads(fd.read())
-        return img_dims["images"]
+    img_dims = orjson.loads(read_local_file(local_dims))
+    return img_dims["images"]
 
 
 def check_image_size(
@@ -226,7 +233,17 @@ def run(args: argparse.Namespace) -> None:
     logger.debug(f"Running {args.command} with {args}")
     content_paths: list[Path] = args.content_path
 
-    # fetch image sizes dict once before processing
+    # fetch remote files used by the checks at once, before processing
+    jfc = JsonFeedClient()
+    download_remote_files_to_local(
+        files_to_download=(
+            (images_sizes_remote_url, images_sizes_local_path, 24),
+            (jfc.tags_url, jfc.local_tags_path, jfc.expiration_rotating_hours),
+        ),
+        compress_at_rest=True,
+    )
+
+    # load image sizes dict once before processing
     image_sizes = download_image_sizes()
 
     for content_path in content_paths:
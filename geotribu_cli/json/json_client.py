@@ -17,7 +17,11 @@ import orjson
 
 # project
 from geotribu_cli.constants import GeotribuDefaults
-from geotribu_cli.utils.file_downloader import download_remote_file_to_local
+from geotribu_cli.utils.file_compression import read_local_file
+from geotribu_cli.utils.file_downloader import (
+    download_remote_file_to_local,
+    download_remote_files_to_local,
+)
 
 # ############################################################################
 # ########## GLOBALS #############
@@ -64,6 +68,25 @@ class JsonFeedClient:
         )
         self.local_tags_path.parent.mkdir(parents=True, exist_ok=True)
 
+    def download(self) -> list[Path | Exception]:
+        """Fetch JSON feed and tags at once, if local files are outdated.
+
+        Returns:
+            Local paths to the JSON feed and tags files, or the exception raised \
+                while downloading them
+        """
+        return download_remote_files_to_local(
+            files_to_download=(
+                (
+                    self.json_feed_url,
+                    self.local_json_feed_path,
+                    self.expiration_rotating_hours,
+                ),
+                (self.tags_url, self.local_tags_path, self.expiration_rotating_hours),
+            ),
+            compress_at_rest=True,
+        )
+
     def items(self) -> list[dict[str, Any]]:
         """Fetch Geotribu JSON feed latest created items.
 
@@ -75,10 +98,10 @@ class JsonFeedClient:
             remote_url_to_download=self.json_feed_url,
             local_file_path=self.local_json_feed_path,
             expiration_rotating_hours=self.expiration_rotating_hours,
+            compress_at_rest=True,
         )
 
-        with local_json_feed.open("rb") as fd:
-            json_feed = orjson.loads(fd.read())
+        json_feed = orjson.loads(read_local_file(local_json_feed))
 
         return json_feed.get("items")
 
@@ -96,10 +119,10 @@ class JsonFeedClient:
             remote_url_to_download=self.tags_url,
             local_file_path=self.local_tags_path,
             expiration_rotating_hours=self.expiration_rotating_hours,
+            compress_at_rest=True,
         )
 
-        with local_tags.open("rb") as fd:
-            search_tags = orjson.loads(fd.read())
+        search_tags = orjson.loads(read_local_file(local_tags))
 
         tags = set()
         for item in search_tags.get("mappings"):
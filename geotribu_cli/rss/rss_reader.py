@@ -24,6 +24,7 @@ from geotribu_cli.constants import GeotribuDefaults
 from geotribu_cli.history import CliHistory
 from geotribu_cli.rss.mdl_rss import RssItem
 from geotribu_cli.subcommands.open_result import open_content
+from geotribu_cli.utils.file_compression import open_local_file
 from geotribu_cli.utils.file_downloader import download_remote_file_to_local
 from geotribu_cli.utils.formatters import convert_octets, url_add_utm
 from geotribu_cli.utils.str2bool import str2bool
@@ -195,6 +196,8 @@ def run(args: argparse.Namespace):
             remote_url_to_download=args.remote_index_file,
             local_file_path=args.local_index_file,
             expiration_rotating_hours=args.expiration_rotating_hours,
+            compress_at_rest=True,
+            stale_while_revalidate=True,
         )
         if not isinstance(get_or_update_local_search_index, Path):
             logger.error(
@@ -211,7 +214,8 @@ def run(args: argparse.Namespace):
 
     # Parse the feed
     with console.status("Lecture du fichier local...", spinner="earth"):
-        feed = ET.parse(args.local_index_file)
+        with open_local_file(args.local_index_file) as fd:
+            feed = ET.parse(fd)
         feed_items: list[RssItem] = []
 
         # Find all articles in the feed
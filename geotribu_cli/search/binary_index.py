@@ -0,0 +1,1451 @@
+#! python3  # noqa: E265
+
+"""Compact binary and memory-mapped on-disk format for lunr search indexes.
+
+The JSON serialization of a lunr index has to be entirely parsed and turned into
+Python objects before the first query can run. This module stores the same index
+into packed arrays (term dictionary, posting lists and field vectors) which are
+memory-mapped at load time: a search only reads the pages it needs.
+
+Every document can also be given a type and a date, stored as precomputed
+attributes: searches restricted to some types or to a period skip the other
+documents when reading postings, before any scoring.
+
+Searches score every matching document, so that the total number of results is
+exact, but only sort the best ones with a heap of the number of results expected.
+Skipping the postings which can't reach the best scores (MaxScore, from per-term
+score upper bounds) does not pay off on the website contents: the text field postings
+of most queries cover nearly every matching document, so almost no posting list can
+be skipped.
+
+The vocabulary is also indexed by trigrams, so that wildcard patterns without a
+known prefix (`*gis*`) and approximate searches (typos) only check the terms sharing
+trigrams with the query instead of walking the whole term dictionary.
+
+The format is a local cache, not an exchange format: it's written with the native
+byte order and rejected (so regenerated by the caller) on a mismatch.
+"""
+
+# ############################################################################
+# ########## IMPORTS #############
+# ################################
+
+# standard library
+import heapq
+import logging
+import mmap
+import re
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from collections.abc import Callable, Collection, Iterator, Mapping
+from itertools import islice
+from pathlib import Path
+
+# 3rd party
+import orjson
+from lunr import __TARGET_JS_VERSION__
+from lunr.index import Index
+from lunr.pipeline import Pipeline
+from lunr.query import Clause, QueryPresence
+from lunr.query_parser import QueryParser
+from lunr.token_set import TokenSet
+from lunr.utils import CompleteSet
+from lunr.vector import Vector
+
+# package
+from geotribu_cli.search.mdl_search import CompiledClause, QueryPlan
+from geotribu_cli.utils.atomic_files import atomic_write
+
+# ############################################################################
+# ########## GLOBALS #############
+# ################################
+
+logger = logging.getLogger(__name__)
+
+BINARY_INDEX_MAGIC: bytes = b"GTBX"
+BINARY_INDEX_FORMAT_VERSION: int = 4
+
+# minimal length of a term to also match the index terms starting with it, in
+# approximate searches
+APPROXIMATE_PREFIX_MIN_LENGTH: int = 3
+
+# compiled queries kept in memory by index
+QUERY_PLANS_MAX_ENTRIES: int = 256
+
+# sections are stored in this order, each one aligned on 8 bytes
+_SECTIONS: tuple[str, ...] = (
+    "meta",
+    "doc_offsets",
+    "doc_blob",
+    "doc_types",
+    "doc_dates",
+    "term_offsets",
+    "term_blob",
+    "term_indexes",
+    "posting_offsets",
+    "postings",
+    "posting_weights",
+    "vector_offsets",
+    "vector_terms",
+    "vector_values",
+    "gram_offsets",
+    "gram_blob",
+    "gram_term_offsets",
+    "gram_terms",
+)
+# magic, format version, byte order (0 = little, 1 = big), docs, terms, fields
+_HEADER = struct.Struct(f"<4sHH3I{len(_SECTIONS) * 2}Q")
+_ALIGNMENT: int = 8
+# greater than any byte of an UTF-8 encoded string: used to bound prefix ranges
+_UTF8_UPPER_BOUND: bytes = b"\xff"
+# terms are padded before being split into trigrams, so that trigrams also tell
+# where a term starts and ends
+_TERM_START: str = "\x02"
+_TERM_END: str = "\x03"
+
+# ############################################################################
+# ########## FUNCTIONS ###########
+# ################################
+
+
+def pack_strings(strings: list[str]) -> tuple[array, bytes]:
+    """Pack a list of strings into an offsets array and an UTF-8 blob.
+
+    Args:
+        strings (list[str]): strings to pack
+
+    Returns:
+        tuple[array, bytes]: offsets (len(strings) + 1) and concatenated bytes
+    """
+    offsets = array("Q", [0])
+    blob = bytearray()
+    for string in strings:
+        blob += string.encode("utf-8")
+        offsets.append(len(blob))
+    return offsets, bytes(blob)
+
+
+def get_trigrams(term: str) -> set[str]:
+    """Split a term, padded with start and end markers, into trigrams.
+
+    Args:
+        term (str): term to split
+
+    Returns:
+        set[str]: distinct trigrams
+    """
+    padded = f"{_TERM_START}{term}{_TERM_END}"
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def get_max_edit_distance(term: str) -> int:
+    """Get the number of typos tolerated in a term by approximate searches.
+
+    Args:
+        term (str): searched term
+
+    Returns:
+        int: 0 for short terms, 1 up to 7 characters, 2 beyond
+    """
+    if len(term) < 4:
+        return 0
+    elif len(term) < 8:
+        return 1
+    return 2
+
+
+def get_edit_distance(source: str, target: str, max_distance: int) -> int:
+    """Compute the number of edits (insertion, deletion, substitution or \
+        transposition of adjacent characters) to turn a string into another.
+
+    Args:
+        source (str): first string
+        target (str): second string
+        max_distance (int): distance beyond which the exact value is useless
+
+    Returns:
+        int: edit distance, or max_distance + 1 if it's greater than max_distance
+    """
+    if abs(len(source) - len(target)) > max_distance:
+        return max_distance + 1
+
+    previous_row: list[int] = []
+    current_row = list(range(len(target) + 1))
+    for i, source_char in enumerate(source, start=1):
+        row_before, previous_row = previous_row, current_row
+        current_row = [i] + [0] * len(target)
+        for j, target_char in enumerate(target, start=1):
+            current_row[j] = min(
+                previous_row[j] + 1,
+                current_row[j - 1] + 1,
+                previous_row[j - 1] + (source_char != target_char),
+            )
+            if (
+                i > 1
+                and j > 1
+                and source_char == target[j - 2]
+                and source[i - 2] == target_char
+            ):
+                current_row[j] = min(current_row[j], row_before[j - 2] + 1)
+        if min(current_row) > max_distance:
+            return max_distance + 1
+
+    return min(current_row[-1], max_distance + 1)
+
+
+def _pack_trigrams(terms: list[str]) -> list[bytes]:
+    """Index the vocabulary by trigrams.
+
+    Args:
+        terms (list[str]): sorted terms dictionary
+
+    Returns:
+        list[bytes]: sections of the trigrams (sorted by UTF-8 bytes), then of the \
+            sorted positions of the terms having each of them
+    """
+    gram_term_positions: dict[str, list[int]] = {}
+    for term_position, term in enumerate(terms):
+        for gram in get_trigrams(term):
+            gram_term_positions.setdefault(gram, []).append(term_position)
+
+    grams = sorted(gram_term_positions, key=lambda gram: gram.encode("utf-8"))
+    gram_offsets, gram_blob = pack_strings(grams)
+    gram_term_offsets = array("Q", [0])
+    gram_terms = array("I")
+    for gram in grams:
+        gram_terms.extend(gram_term_positions[gram])
+        gram_term_offsets.append(len(gram_terms))
+
+    return [
+        gram_offsets.tobytes(),
+        gram_blob,
+        gram_term_offsets.tobytes(),
+        gram_terms.tobytes(),
+    ]
+
+
+def write_binary_index(
+    idx: Index,
+    output_path: Path,
+    doc_attributes: Callable[[str], tuple[int, int]] | None = None,
+) -> Path:
+    """Write a lunr index into the binary format.
+
+    Posting metadata (positions...) is not stored since the CLI does not use any
+    metadata whitelist.
+
+    Args:
+        idx (Index): lunr index to write
+        output_path (Path): path to the output binary file
+        doc_attributes (Callable[[str], tuple[int, int]] | None, optional): \
+            function returning the type (0-255) and the date (proleptic Gregorian \
+            ordinal, 0 if unknown) of a document from its reference. Defaults to \
+            None (no type nor date).
+
+    Returns:
+        Path: path to the written file
+    """
+    fields: list[str] = list(idx.fields)
+    field_position = {field: i for i, field in enumerate(fields)}
+
+    # documents ids follow the order of insertion in the index
+    doc_refs: list[str] = []
+    doc_ids: dict[str, int] = {}
+    for field_ref in idx.field_vectors:
+        doc_ref = field_ref.split("/", 1)[1]
+        if doc_ref not in doc_ids:
+            doc_ids[doc_ref] = len(doc_refs)
+            doc_refs.append(doc_ref)
+    doc_offsets, doc_blob = pack_strings(doc_refs)
+    doc_types = array("B", bytes(len(doc_refs)))
+    doc_dates = array("I", bytes(4 * len(doc_refs)))
+    if doc_attributes is not None:
+        for doc_id, doc_ref in enumerate(doc_refs):
+            doc_types[doc_id], doc_dates[doc_id] = doc_attributes(doc_ref)
+
+    # weight of each term in each document field (values of the field vectors),
+    # stored along postings to score documents without rebuilding their vectors
+    term_weights: dict[tuple[int, int], dict[int, float]] = {}
+    for field_ref, vector in idx.field_vectors.items():
+        field_name, doc_ref = field_ref.split("/", 1)
+        elements = vector.elements
+        for term_index, weight in zip(elements[0::2], elements[1::2]):
+            term_weights.setdefault((term_index, field_position[field_name]), {})[
+                doc_ids[doc_ref]
+            ] = weight
+
+    # term dictionary sorted by UTF-8 bytes to allow binary search on raw bytes
+    terms = sorted(idx.inverted_index, key=lambda term: term.encode("utf-8"))
+    term_offsets, term_blob = pack_strings(terms)
+    term_indexes = array("I")
+    posting_offsets = array("Q", [0])
+    postings = array("I")
+    # aligned on postings: counts slots are left to 0
+    posting_weights = array("d")
+    for term in terms:
+        posting = idx.inverted_index[term]
+        term_indexes.append(posting["_index"])
+        field_postings = [
+            sorted(doc_ids[doc_ref] for doc_ref in posting.get(field, {}))
+            for field in fields
+        ]
+        postings.extend(len(field_posting) for field_posting in field_postings)
+        posting_weights.extend(0.0 for _ in field_postings)
+        for field_id, field_posting in enumerate(field_postings):
+            postings.extend(field_posting)
+            field_weights = term_weights.get((posting["_index"], field_id), {})
+            posting_weights.extend(
+                field_weights.get(doc_id, 0.0) for doc_id in field_posting
+            )
+        posting_offsets.append(len(postings))
+
+    # one vector per document and field, ordered by document then field
+    vector_slots: list[Vector | None] = [None] * (len(doc_refs) * len(fields))
+    for field_ref, vector in idx.field_vectors.items():
+        field_name, doc_ref = field_ref.split("/", 1)
+        vector_slots[doc_ids[doc_ref] * len(fields) + field_position[field_name]] = (
+            vector
+        )
+    vector_offsets = array("Q", [0])
+    vector_terms = array("I")
+    vector_values = array("d")
+    for vector in vector_slots:
+        if vector is not None:
+            elements = vector.elements
+            vector_terms.extend(elements[0::2])
+            vector_values.extend(elements[1::2])
+        vector_offsets.append(len(vector_terms))
+
+    meta = orjson.dumps(
+        {
+            "version": __TARGET_JS_VERSION__,
+            "fields": fields,
+            "pipeline": idx.pipeline.serialize(),
+        }
+    )
+
+    sections: list[bytes] = [
+        meta,
+        doc_offsets.tobytes(),
+        doc_blob,
+        doc_types.tobytes(),
+        doc_dates.tobytes(),
+        term_offsets.tobytes(),
+        term_blob,
+        term_indexes.tobytes(),
+        posting_offsets.tobytes(),
+        postings.tobytes(),
+        posting_weights.tobytes(),
+        vector_offsets.tobytes(),
+        vector_terms.tobytes(),
+        vector_values.tobytes(),
+        *_pack_trigrams(terms),
+    ]
+
+    # compute sections positions
+    positions: list[int] = []
+    cursor = _HEADER.size
+    for section in sections:
+        cursor += -cursor % _ALIGNMENT
+        positions.extend((cursor, len(section)))
+        cursor += len(section)
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with atomic_write(output_path) as fd:
+        fd.write(
+            _HEADER.pack(
+                BINARY_INDEX_MAGIC,
+                BINARY_INDEX_FORMAT_VERSION,
+                int(sys.byteorder == "big"),
+                len(doc_refs),
+                len(terms),
+                len(fields),
+                *positions,
+            )
+        )
+        for section, position in zip(sections, positions[0::2]):
+            fd.write(b"\x00" * (position - fd.tell()))
+            fd.write(section)
+
+    logger.debug(
+        f"Binary index written to {output_path}: {len(doc_refs)} documents, "
+        f"{len(terms)} terms, {len(fields)} fields."
+    )
+    return output_path
+
+
+def load_binary_index(input_path: Path) -> "BinaryIndex":
+    """Load a binary index as a lunr index backed by memory-mapped arrays.
+
+    Args:
+        input_path (Path): path to the binary index file
+
+    Raises:
+        ValueError: if the file is not a binary index or has been written with an
+            incompatible format version or byte order
+
+    Returns:
+        BinaryIndex: lunr index ready to be searched
+    """
+    return BinaryIndexReader(input_path).as_lunr_index()
+
+
+# ############################################################################
+# ########## CLASSES #############
+# ################################
+
+
+class StringTable:
+    """Read-only sequence of UTF-8 strings (as bytes) stored as offsets + blob."""
+
+    def __init__(self, offsets: memoryview, blob: memoryview):
+        self.offsets = offsets
+        self.blob = blob
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, position: int) -> bytes:
+        return bytes(self.blob[self.offsets[position] : self.offsets[position + 1]])
+
+    def get_str(self, position: int) -> str:
+        """Return the decoded string at the given position.
+
+        Args:
+            position (int): position in the table
+
+        Returns:
+            str: decoded string
+        """
+        return str(
+            self.blob[self.offsets[position] : self.offsets[position + 1]], "utf-8"
+        )
+
+
+class BinaryIndexReader:
+    """Memory-mapped reader of a binary search index."""
+
+    def __init__(self, input_path: Path):
+        """Open and map the binary index file.
+
+        Args:
+            input_path (Path): path to the binary index file
+
+        Raises:
+            ValueError: if the file is not a compatible binary index
+        """
+        self.input_path = input_path
+        with input_path.open(mode="rb") as fd:
+            self._mmap = mmap.mmap(fd.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._mmap) < _HEADER.size:
+            self.close()
+            raise ValueError(f"{input_path} is too small to be a binary index.")
+
+        header = _HEADER.unpack_from(self._mmap, 0)
+        magic, format_version, big_endian = header[:3]
+        if magic != BINARY_INDEX_MAGIC:
+            self.close()
+            raise ValueError(f"{input_path} is not a binary search index.")
+        if format_version != BINARY_INDEX_FORMAT_VERSION:
+            self.close()
+            raise ValueError(
+                f"{input_path} has been written with format version {format_version} "
+                f"but version {BINARY_INDEX_FORMAT_VERSION} is expected."
+            )
+        if bool(big_endian) != (sys.byteorder == "big"):
+            self.close()
+            raise ValueError(f"{input_path} has been written with another byte order.")
+
+        self.docs_count, self.terms_count, self.fields_count = header[3:6]
+        buffer = memoryview(self._mmap)
+        self._sections: dict[str, memoryview] = {}
+        for i, name in enumerate(_SECTIONS):
+            position, length = header[6 + i * 2 : 8 + i * 2]
+            self._sections[name] = buffer[position : position + length]
+
+        meta = orjson.loads(bytes(self._sections["meta"]))
+        if meta.get("version") != __TARGET_JS_VERSION__:
+            logger.warning(
+                f"Version mismatch when loading binary index {input_path}: "
+                f"{meta.get('version')} instead of {__TARGET_JS_VERSION__}."
+            )
+        self.fields: list[str] = meta.get("fields")
+        self.pipeline: list[str] = meta.get("pipeline")
+
+        self.doc_refs = StringTable(
+            self._sections["doc_offsets"].cast("Q"), self._sections["doc_blob"]
+        )
+        self.doc_types = self._sections["doc_types"].cast("B")
+        self.doc_dates = self._sections["doc_dates"].cast("I")
+        self.terms = StringTable(
+            self._sections["term_offsets"].cast("Q"), self._sections["term_blob"]
+        )
+        self.term_indexes = self._sections["term_indexes"].cast("I")
+        self.posting_offsets = self._sections["posting_offsets"].cast("Q")
+        self.postings = self._sections["postings"].cast("I")
+        self.posting_weights = self._sections["posting_weights"].cast("d")
+        self.vector_offsets = self._sections["vector_offsets"].cast("Q")
+        self.vector_terms = self._sections["vector_terms"].cast("I")
+        self.vector_values = self._sections["vector_values"].cast("d")
+        self.grams = StringTable(
+            self._sections["gram_offsets"].cast("Q"), self._sections["gram_blob"]
+        )
+        self.gram_term_offsets = self._sections["gram_term_offsets"].cast("Q")
+        self.gram_terms = self._sections["gram_terms"].cast("I")
+
+    def close(self):
+        """Release the memory mapping. Required before replacing the file on Windows."""
+        self._sections = {}
+        for attribute in (
+            "doc_refs",
+            "doc_types",
+            "doc_dates",
+            "terms",
+            "term_indexes",
+            "posting_offsets",
+            "postings",
+            "posting_weights",
+            "vector_offsets",
+            "vector_terms",
+            "vector_values",
+            "grams",
+            "gram_term_offsets",
+            "gram_terms",
+        ):
+            self.__dict__.pop(attribute, None)
+        try:
+            self._mmap.close()
+        except BufferError:
+            # some views are still referenced: let the garbage collector do it
+            logger.debug(f"Memory mapping of {self.input_path} is still in use.")
+
+    def find_term(self, term: str) -> int | None:
+        """Look for a term in the dictionary.
+
+        Args:
+            term (str): term to look for
+
+        Returns:
+            int | None: term position in the dictionary or None if not found
+        """
+        encoded = term.encode("utf-8")
+        position = bisect_left(self.terms, encoded)
+        if position < len(self.terms) and self.terms[position] == encoded:
+            return position
+        return None
+
+    def prefix_range(
+        self, prefix: bytes, low: int = 0, high: int | None = None
+    ) -> tuple[int, int]:
+        """Return the range of terms positions starting with the given prefix.
+
+        Args:
+            prefix (bytes): UTF-8 encoded prefix
+            low (int, optional): lower bound of the search. Defaults to 0.
+            high (int | None, optional): upper bound of the search. Defaults to None.
+
+        Returns:
+            tuple[int, int]: range (start included, end excluded)
+        """
+        if high is None:
+            high = len(self.terms)
+        start = bisect_left(self.terms, prefix, low, high)
+        end = bisect_left(self.terms, prefix + _UTF8_UPPER_BOUND, start, high)
+        return start, end
+
+    def gram_term_positions(self, gram: str) -> memoryview:
+        """Return the positions of the terms having a trigram.
+
+        Args:
+            gram (str): trigram, as returned by get_trigrams
+
+        Returns:
+            memoryview: sorted terms positions, empty if no term has this trigram
+        """
+        encoded = gram.encode("utf-8")
+        position = bisect_left(self.grams, encoded)
+        if position < len(self.grams) and self.grams[position] == encoded:
+            return self.gram_terms[
+                self.gram_term_offsets[position] : self.gram_term_offsets[position + 1]
+            ]
+        return self.gram_terms[0:0]
+
+    def find_pattern_terms(self, pattern: str) -> list[int] | None:
+        """Look for the terms matching a wildcard pattern (`*` for any characters) \
+            among the ones having all the trigrams of its literal parts.
+
+        Args:
+            pattern (str): wildcard pattern
+
+        Returns:
+            list[int] | None: sorted positions of the matching terms, or None if \
+                the pattern has no literal part long enough to use trigrams
+        """
+        # literal parts, padded when they are the start or the end of the terms
+        parts = f"{_TERM_START}{pattern}{_TERM_END}".split("*")
+        grams = {part[i : i + 3] for part in parts for i in range(len(part) - 2)}
+        if not grams:
+            return None
+
+        candidates: set[int] | None = None
+        for gram_terms in sorted(map(self.gram_term_positions, grams), key=len):
+            candidates = (
+                set(gram_terms) if candidates is None else candidates & set(gram_terms)
+            )
+            if not candidates:
+                return []
+
+        matcher = re.compile(
+            ".*".join(re.escape(part) for part in pattern.split("*")), re.DOTALL
+        )
+        return [
+            term_position
+            for term_position in sorted(candidates)
+            if matcher.fullmatch(self.terms.get_str(term_position))
+        ]
+
+    def find_similar_terms(self, term: str, max_distance: int) -> list[int]:
+        """Look for the terms within an edit distance of a term, among the ones \
+            sharing enough trigrams with it.
+
+        An edit changes at most 4 trigrams (3 for an insertion, a deletion or a \
+            substitution, 4 for a transposition), so a term within the distance \
+            shares at least (trigrams count - 4 * distance) trigrams with the \
+            searched one.
+
+        Args:
+            term (str): searched term
+            max_distance (int): maximum edit distance
+
+        Returns:
+            list[int]: sorted positions of the similar terms, including the term itself
+        """
+        grams = get_trigrams(term)
+        min_shared_grams = len(grams) - 4 * max_distance
+        if min_shared_grams > 0:
+            shared_grams = Counter()
+            for gram in grams:
+                shared_grams.update(self.gram_term_positions(gram))
+            candidates = sorted(
+                term_position
+                for term_position, count in shared_grams.items()
+                if count >= min_shared_grams
+            )
+        else:
+            # short term: any term may be similar
+            candidates = range(len(self.terms))
+
+        return [
+            term_position
+            for term_position in candidates
+            if get_edit_distance(term, self.terms.get_str(term_position), max_distance)
+            <= max_distance
+        ]
+
+    def find_approximate_terms(self, term: str) -> list[int]:
+        """Look for the terms starting with or close to a term. The tolerated number \
+            of typos depends on the term length (see get_max_edit_distance).
+
+        Args:
+            term (str): searched term
+
+        Returns:
+            list[int]: sorted positions of the matching terms
+        """
+        term_positions = set(self.find_similar_terms(term, get_max_edit_distance(term)))
+        if len(term) >= APPROXIMATE_PREFIX_MIN_LENGTH:
+            term_positions.update(range(*self.prefix_range(term.encode("utf-8"))))
+        return sorted(term_positions)
+
+    def term_field_postings(self, term_position: int) -> list[memoryview]:
+        """Return the documents ids containing a term, for each field.
+
+        Args:
+            term_position (int): position of the term in the dictionary
+
+        Returns:
+            list[memoryview]: sorted documents ids, one array per field
+        """
+        cursor = self.posting_offsets[term_position]
+        counts = self.postings[cursor : cursor + self.fields_count]
+        cursor += self.fields_count
+        field_postings = []
+        for count in counts:
+            field_postings.append(self.postings[cursor : cursor + count])
+            cursor += count
+        return field_postings
+
+    def term_field_weights(self, term_position: int) -> list[memoryview]:
+        """Return the weights of a term in the documents containing it, for each field.
+
+        Args:
+            term_position (int): position of the term in the dictionary
+
+        Returns:
+            list[memoryview]: weights, one array per field, in the same order as \
+                term_field_postings
+        """
+        cursor = self.posting_offsets[term_position]
+        counts = self.postings[cursor : cursor + self.fields_count]
+        cursor += self.fields_count
+        field_weights = []
+        for count in counts:
+            field_weights.append(self.posting_weights[cursor : cursor + count])
+            cursor += count
+        return field_weights
+
+    def field_vector(self, doc_id: int, field_position: int) -> Vector:
+        """Rebuild the lunr vector of a document field.
+
+        Args:
+            doc_id (int): document id
+            field_position (int): position of the field in the index fields
+
+        Returns:
+            Vector: lunr vector
+        """
+        slot = doc_id * self.fields_count + field_position
+        start, end = self.vector_offsets[slot], self.vector_offsets[slot + 1]
+        elements = [None] * ((end - start) * 2)
+        elements[0::2] = self.vector_terms[start:end].tolist()
+        elements[1::2] = self.vector_values[start:end].tolist()
+        return Vector(elements)
+
+    def get_doc_filter(
+        self,
+        doc_types: Collection[int] | None = None,
+        date_min: int | None = None,
+        date_max: int | None = None,
+    ) -> Callable[[int], bool] | None:
+        """Build a filter on documents attributes. Documents without date are \
+            rejected as soon as a date bound is set.
+
+        Args:
+            doc_types (Collection[int] | None, optional): accepted types. Defaults \
+                to None (any type).
+            date_min (int | None, optional): oldest accepted date, as ordinal. \
+                Defaults to None.
+            date_max (int | None, optional): most recent accepted date, as ordinal. \
+                Defaults to None.
+
+        Returns:
+            Callable[[int], bool] | None: function accepting or not a document id, \
+                None if there is nothing to filter
+        """
+        if doc_types is None and date_min is None and date_max is None:
+            return None
+
+        types, dates = self.doc_types, self.doc_dates
+        is_date_bounded = date_min is not None or date_max is not None
+
+        def accept(doc_id: int) -> bool:
+            if doc_types is not None and types[doc_id] not in doc_types:
+                return False
+            doc_date = dates[doc_id]
+            if is_date_bounded and not doc_date:
+                return False
+            if date_min is not None and doc_date < date_min:
+                return False
+            if date_max is not None and doc_date > date_max:
+                return False
+            return True
+
+        return accept
+
+    def as_lunr_index(self) -> "BinaryIndex":
+        """Expose the binary index as a lunr index, using lazy mappings.
+
+        Returns:
+            BinaryIndex: lunr index
+        """
+        return BinaryIndex(self)
+
+
+class BinaryIndex(Index):
+    """lunr index backed by a binary index reader, which can be restricted to the
+    documents matching some attributes."""
+
+    def __init__(
+        self,
+        reader: BinaryIndexReader,
+        doc_filter: Callable[[int], bool] | None = None,
+        query_plans: dict[tuple[str, bool], QueryPlan] | None = None,
+    ):
+        """Class initialization.
+
+        Args:
+            reader (BinaryIndexReader): binary index reader
+            doc_filter (Callable[[int], bool] | None, optional): documents to keep, \
+                as returned by BinaryIndexReader.get_doc_filter. Defaults to None.
+            query_plans (dict[tuple[str, bool], QueryPlan] | None, optional): \
+                compiled queries cache, shared with restricted indexes. Defaults to \
+                None.
+        """
+        self.reader = reader
+        self.doc_filter = doc_filter
+        self.query_plans: dict[tuple[str, bool], QueryPlan] = (
+            {} if query_plans is None else query_plans
+        )
+        doc_ids: dict[str, int] = {}
+        super().__init__(
+            inverted_index=_InvertedIndexView(reader, doc_ids, doc_filter),
+            field_vectors=_FieldVectorsView(reader, doc_ids, doc_filter),
+            token_set=TermDictionaryTokenSet(reader),
+            fields=reader.fields,
+            pipeline=Pipeline.load(reader.pipeline),
+        )
+
+    def restrict(
+        self,
+        doc_types: Collection[int] | None = None,
+        date_min: int | None = None,
+        date_max: int | None = None,
+    ) -> "BinaryIndex":
+        """Get the same index restricted to the documents matching the given \
+            attributes. Scores of the remaining documents are unchanged.
+
+        Args:
+            doc_types (Collection[int] | None, optional): accepted types. Defaults \
+                to None (any type).
+            date_min (int | None, optional): oldest accepted date, as ordinal. \
+                Defaults to None.
+            date_max (int | None, optional): most recent accepted date, as ordinal. \
+                Defaults to None.
+
+        Returns:
+            BinaryIndex: restricted index, or this one if there is nothing to filter
+        """
+        doc_filter = self.reader.get_doc_filter(
+            doc_types=doc_types, date_min=date_min, date_max=date_max
+        )
+        if doc_filter is None:
+            return self
+        return BinaryIndex(self.reader, doc_filter, query_plans=self.query_plans)
+
+    def close(self):
+        """Release the memory mapping of the reader, shared with the restricted \
+        indexes. Required before replacing the file on Windows."""
+        self.query_plans.clear()
+        self.reader.close()
+
+    def compile_query(
+        self, query_string: str, is_approximate: bool = False
+    ) -> QueryPlan:
+        """Parse a query, run its terms through the index pipeline (trimmer, stop \
+            words, stemmer) and expand them against the terms dictionary.
+
+        Plans only depend on the index terms, not on the documents filter, so they \
+            are cached and reused by every query with the same string, including on \
+            restricted indexes.
+
+        Args:
+            query_string (str): query, using lunr syntax
+            is_approximate (bool, optional): also match the index terms starting \
+                with or close to (typos) the plain terms of the query. Defaults to \
+                False.
+
+        Raises:
+            QueryParseError: if the query syntax is invalid
+
+        Returns:
+            QueryPlan: compiled query
+        """
+        cache_key = (query_string, is_approximate)
+        query_plan = self.query_plans.pop(cache_key, None)
+        if query_plan is None:
+            query_plan = self._compile_query(query_string, is_approximate)
+            while len(self.query_plans) >= QUERY_PLANS_MAX_ENTRIES:
+                # least recently used plan is the first one
+                del self.query_plans[next(iter(self.query_plans))]
+        self.query_plans[cache_key] = query_plan
+        return query_plan
+
+    def _compile_query(self, query_string: str, is_approximate: bool) -> QueryPlan:
+        """Compile a query, like lunr's Index.query processes its clauses.
+
+        Args:
+            query_string (str): query, using lunr syntax
+            is_approximate (bool): also match terms close to the plain terms
+
+        Returns:
+            QueryPlan: compiled query
+        """
+        query = self.create_query()
+        QueryParser(query_string, query).parse()
+
+        compiled_clauses = []
+        for clause in query.clauses:
+            if clause.use_pipeline:
+                terms = self.pipeline.run_string(clause.term, {"fields": clause.fields})
+            else:
+                terms = [clause.term]
+
+            term_positions: list[int] = []
+            has_unmatched_required_term = False
+            for term in terms:
+                clause.term = term
+                expanded_term_positions = self._expand_term(clause, is_approximate)
+                # a required term without match makes further terms useless
+                if (
+                    len(expanded_term_positions) == 0
+                    and clause.presence == QueryPresence.REQUIRED
+                ):
+                    has_unmatched_required_term = True
+                    break
+                term_positions.extend(expanded_term_positions)
+
+            compiled_clauses.append(
+                CompiledClause(
+                    fields=tuple(clause.fields),
+                    presence=clause.presence,
+                    boost=clause.boost,
+                    term_positions=tuple(term_positions),
+                    has_unmatched_required_term=has_unmatched_required_term,
+                )
+            )
+
+        return QueryPlan(
+            query_string=query_string,
+            clauses=tuple(compiled_clauses),
+            is_negated=query.is_negated(),
+            is_approximate=is_approximate,
+        )
+
+    def _expand_term(self, clause: Clause, is_approximate: bool) -> list[int]:
+        """Get the index terms matching the term of a clause.
+
+        Args:
+            clause (Clause): lunr query clause, with a term processed by the pipeline
+            is_approximate (bool): also match terms close to a plain term
+
+        Returns:
+            list[int]: positions of the matching terms
+        """
+        is_plain_term = not clause.edit_distance and "*" not in clause.term
+        if (
+            is_approximate
+            and is_plain_term
+            and clause.presence != QueryPresence.PROHIBITED
+        ):
+            return self.reader.find_approximate_terms(clause.term)
+
+        if not clause.edit_distance and not is_plain_term:
+            term_positions = self.reader.find_pattern_terms(clause.term)
+            if term_positions is not None:
+                return term_positions
+
+        return [
+            self.reader.find_term(expanded_term)
+            for expanded_term in self.token_set.intersect(
+                TokenSet.from_clause(clause)
+            ).to_list()
+        ]
+
+    def iter_search(
+        self, query_string: str, is_approximate: bool = False, k: int | None = None
+    ) -> tuple[Iterator[dict], int, int]:
+        """Search the index like lunr's Index.search, sorting results lazily.
+
+        All matching documents are scored, without early termination, but only the \
+            k best ones are sorted, using a heap of size k: O(n log k) instead of \
+            O(n log n). Results beyond them are sorted only if they are consumed.
+
+        Args:
+            query_string (str): query, using lunr syntax
+            is_approximate (bool, optional): also match the index terms starting \
+                with or close to the plain terms of the query. Defaults to False.
+            k (int | None, optional): number of results expected to be consumed. \
+                Defaults to None (all of them).
+
+        Returns:
+            tuple[Iterator[dict], int, int]: results (ref and score) by decreasing \
+                score, number of matching documents and number of matching \
+                documents before the documents filter
+        """
+        query_plan = self.compile_query(query_string, is_approximate=is_approximate)
+        scores, count_rejected = self.score_query(query_plan)
+        return self.iter_ranked(scores, k=k), len(scores), len(scores) + count_rejected
+
+    def search_top_k(
+        self, query_string: str, k: int | None = None, is_approximate: bool = False
+    ) -> tuple[list[dict], int]:
+        """Search the index like lunr's Index.search, but only return the best results.
+
+        Args:
+            query_string (str): query, using lunr syntax
+            k (int | None, optional): maximum number of results to return. Defaults \
+                to None (all of them).
+            is_approximate (bool, optional): also match the index terms starting \
+                with or close to the plain terms of the query. Defaults to False.
+
+        Returns:
+            tuple[list[dict], int]: best results (ref and score) sorted by score \
+                and total number of matching documents
+        """
+        results, count, _ = self.iter_search(
+            query_string, is_approximate=is_approximate, k=k
+        )
+        return list(islice(results, k)), count
+
+    def query_scores(self, query_plan: QueryPlan) -> dict[int, float]:
+        """Score the documents matching a compiled query like lunr's Index.query does.
+
+        Args:
+            query_plan (QueryPlan): compiled query
+
+        Returns:
+            dict[int, float]: score by document id, in lunr's results order
+        """
+        return self.score_query(query_plan)[0]
+
+    def score_query(self, query_plan: QueryPlan) -> tuple[dict[int, float], int]:
+        """Score the documents matching a compiled query like lunr's Index.query \
+            does, counting the matching documents rejected by the documents filter \
+            in the same pass.
+
+        Documents are scored from the term weights stored along postings instead of \
+            rebuilding their field vectors, with the same operations in the same \
+            order, so scores are the same.
+
+        Args:
+            query_plan (QueryPlan): compiled query
+
+        Returns:
+            tuple[dict[int, float], int]: score by document id, in lunr's results \
+                order, and number of matching documents rejected by the filter
+        """
+        if not query_plan.clauses:
+            return {}, 0
+
+        matches = _QueryMatches(self, doc_filter=self.doc_filter)
+        matching_fields, all_required_matches, all_prohibited_matches = (
+            matches.match_query(query_plan)
+        )
+        count_rejected = sum(
+            1
+            for doc_id in matches.rejected_doc_ids
+            if doc_id in all_required_matches and doc_id not in all_prohibited_matches
+        )
+
+        # query vectors as mappings, with their magnitude
+        query_weights = []
+        for field in self.fields:
+            elements = matches.query_vectors[field].elements
+            query_weights.append(
+                (
+                    dict(zip(elements[0::2], elements[1::2])),
+                    matches.query_vectors[field].magnitude,
+                )
+            )
+
+        # score documents: same operations in the same order as lunr's vectors
+        # similarity (dot product by increasing term index), so same floats
+        scores: dict[int, float] = {}
+        for (doc_id, field_position), field_matches in matching_fields.items():
+            if doc_id not in all_required_matches or doc_id in all_prohibited_matches:
+                continue
+
+            field_query_weights, magnitude = query_weights[field_position]
+            score = 0
+            if magnitude:
+                dot_product = 0
+                for term_index, weight in sorted(field_matches):
+                    dot_product += field_query_weights[term_index] * weight
+                score = dot_product / magnitude
+
+            if doc_id in scores:
+                scores[doc_id] += score
+            else:
+                scores[doc_id] = score
+
+        return scores, count_rejected
+
+    def iter_ranked(
+        self, scores: dict[int, float], k: int | None = None
+    ) -> Iterator[dict]:
+        """Yield results by decreasing score.
+
+        The k best results are selected with a heap of size k. If more results are \
+            consumed, the remaining ones are popped from a heap built on demand.
+
+        Args:
+            scores (dict[int, float]): score by document id, in lunr's results order
+            k (int | None, optional): number of results expected to be consumed. \
+                Defaults to None (all of them).
+
+        Yields:
+            Iterator[dict]: result (ref and score)
+        """
+
+        def ranked() -> Iterator[tuple[float, int, int]]:
+            # lunr's results order is used to break ties, like its stable sort
+            return (
+                (-score, rank, doc_id)
+                for rank, (doc_id, score) in enumerate(scores.items())
+            )
+
+        last_best = None
+        if k is not None and 0 < k < len(scores):
+            best = heapq.nsmallest(k, ranked())
+            for negative_score, _, doc_id in best:
+                yield {
+                    "ref": self.reader.doc_refs.get_str(doc_id),
+                    "score": -negative_score,
+                }
+            last_best = best[-1]
+
+        # ranks are unique: the remaining results are the ones after the best ones
+        heap = [item for item in ranked() if last_best is None or item > last_best]
+        heapq.heapify(heap)
+        while heap:
+            negative_score, _, doc_id = heapq.heappop(heap)
+            yield {
+                "ref": self.reader.doc_refs.get_str(doc_id),
+                "score": -negative_score,
+            }
+
+
+class _QueryMatches:
+    """Documents matched by the clauses of a compiled query, like in lunr.Index.query \
+        but with documents ids and the term weights read from the postings."""
+
+    def __init__(
+        self,
+        binary_index: BinaryIndex,
+        doc_filter: Callable[[int], bool] | None = None,
+    ):
+        self.index = binary_index
+        # documents to match, the other ones are skipped
+        self.doc_filter = doc_filter
+        # documents matched by the query but rejected by the filter
+        self.rejected_doc_ids: set[int] = set()
+        self.field_positions = {field: i for i, field in enumerate(binary_index.fields)}
+        # (doc id, field position) -> [(term index, weight)], in lunr's matching order
+        self.matching_fields: dict[tuple[int, int], list[tuple[int, float]]] = {}
+        self.query_vectors = {field: Vector() for field in binary_index.fields}
+        self.term_field_cache: set[tuple[int, str]] = set()
+        self.required_matches: dict = {}
+        self.prohibited_matches: dict[str, set] = defaultdict(set)
+
+    def match_query(
+        self, query_plan: QueryPlan
+    ) -> tuple[dict[tuple[int, int], list[tuple[int, float]]], set, set]:
+        """Match the documents of every clause of a compiled query.
+
+        Args:
+            query_plan (QueryPlan): compiled query, with clauses
+
+        Returns:
+            tuple[dict[tuple[int, int], list[tuple[int, float]]], set, set]: matching \
+                fields (term index and weight by document id and field position), \
+                documents ids required (may be a CompleteSet) and prohibited
+        """
+        for clause in query_plan.clauses:
+            self.match_clause(clause)
+        all_required_matches, all_prohibited_matches = self.get_required_prohibited()
+
+        matching_fields = self.matching_fields
+        if query_plan.is_negated:
+            matching_fields = {}
+            for doc_id in range(len(self.index.reader.doc_refs)):
+                if self.doc_filter is not None and not self.doc_filter(doc_id):
+                    self.rejected_doc_ids.add(doc_id)
+                    continue
+                for field_position in range(len(self.index.fields)):
+                    matching_fields[(doc_id, field_position)] = []
+
+        return matching_fields, all_required_matches, all_prohibited_matches
+
+    def match_clause(self, clause: CompiledClause):
+        """Match the documents of a compiled query clause.
+
+        Args:
+            clause (CompiledClause): compiled query clause
+        """
+        clause_matches = set()
+        for term_position in clause.term_positions:
+            self.match_term(clause, term_position, clause_matches)
+
+        if clause.has_unmatched_required_term:
+            for field in clause.fields:
+                self.required_matches[field] = CompleteSet()
+
+        if clause.presence == QueryPresence.REQUIRED:
+            for field in clause.fields:
+                self.required_matches[field] = self.required_matches[
+                    field
+                ].intersection(clause_matches)
+
+    def match_term(
+        self, clause: CompiledClause, term_position: int, clause_matches: set
+    ):
+        """Match the documents containing a term of the index in the clause fields.
+
+        Args:
+            clause (CompiledClause): compiled query clause
+            term_position (int): position of the term in the terms dictionary
+            clause_matches (set): documents ids matched by the clause, updated
+        """
+        reader = self.index.reader
+        doc_filter = self.doc_filter
+        term_index = reader.term_indexes[term_position]
+        field_postings = reader.term_field_postings(term_position)
+        field_weights = reader.term_field_weights(term_position)
+
+        for field in clause.fields:
+            field_position = self.field_positions[field]
+            doc_ids = field_postings[field_position]
+            if doc_filter is None:
+                matching_documents = list(zip(doc_ids, field_weights[field_position]))
+            else:
+                # rejected documents are kept out of the scores but still count for
+                # the required and prohibited documents, to count them as matching
+                matching_documents = []
+                for doc_id, weight in zip(doc_ids, field_weights[field_position]):
+                    if doc_filter(doc_id):
+                        matching_documents.append((doc_id, weight))
+                    elif clause.presence != QueryPresence.PROHIBITED:
+                        self.rejected_doc_ids.add(doc_id)
+
+            if clause.presence == QueryPresence.REQUIRED:
+                clause_matches.update(doc_ids)
+                if field not in self.required_matches:
+                    self.required_matches[field] = CompleteSet()
+            elif clause.presence == QueryPresence.PROHIBITED:
+                self.prohibited_matches[field].update(doc_ids)
+                continue
+
+            self.query_vectors[field].upsert(
+                term_index, clause.boost, lambda a, b: a + b
+            )
+
+            if (term_position, field) in self.term_field_cache:
+                continue
+
+            for doc_id, weight in matching_documents:
+                self.matching_fields.setdefault((doc_id, field_position), []).append(
+                    (term_index, weight)
+                )
+
+            self.term_field_cache.add((term_position, field))
+
+    def get_required_prohibited(self) -> tuple[set, set]:
+        """Combine the required and prohibited documents of every field.
+
+        Returns:
+            tuple[set, set]: documents ids required (may be a CompleteSet) and \
+                prohibited
+        """
+        all_required_matches = CompleteSet()
+        all_prohibited_matches = set()
+        for field in self.index.fields:
+            if field in self.required_matches:
+                all_required_matches = all_required_matches.intersection(
+                    self.required_matches[field]
+                )
+            if field in self.prohibited_matches:
+                all_prohibited_matches.update(self.prohibited_matches[field])
+        return all_required_matches, all_prohibited_matches
+
+
+class _InvertedIndexView(Mapping):
+    """Lazy mapping term -> posting, compatible with lunr.Index.inverted_index."""
+
+    def __init__(
+        self,
+        reader: BinaryIndexReader,
+        doc_ids: dict[str, int],
+        doc_filter: Callable[[int], bool] | None = None,
+    ):
+        self.reader = reader
+        # shared with the field vectors view: refs resolved while reading postings
+        self.doc_ids = doc_ids
+        # filtered out documents are never matched, so never scored
+        self.doc_filter = doc_filter
+
+    def __getitem__(self, term: str) -> dict:
+        term_position = self.reader.find_term(term)
+        if term_position is None:
+            raise KeyError(term)
+
+        posting = {"_index": self.reader.term_indexes[term_position]}
+        for field, field_posting in zip(
+            self.reader.fields, self.reader.term_field_postings(term_position)
+        ):
+            docs = {}
+            for doc_id in field_posting:
+                if self.doc_filter is not None and not self.doc_filter(doc_id):
+                    continue
+                doc_ref = self.reader.doc_refs.get_str(doc_id)
+                self.doc_ids[doc_ref] = doc_id
+                docs[doc_ref] = {}
+            posting[field] = docs
+        return posting
+
+    def __contains__(self, term: object) -> bool:
+        return isinstance(term, str) and self.reader.find_term(term) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        return (self.reader.terms.get_str(i) for i in range(len(self.reader.terms)))
+
+    def __len__(self) -> int:
+        return len(self.reader.terms)
+
+
+class _FieldVectorsView(Mapping):
+    """Lazy mapping 'field/ref' -> Vector, compatible with lunr.Index.field_vectors."""
+
+    def __init__(
+        self,
+        reader: BinaryIndexReader,
+        doc_ids: dict[str, int],
+        doc_filter: Callable[[int], bool] | None = None,
+    ):
+        self.reader = reader
+        self.doc_ids = doc_ids
+        self.doc_filter = doc_filter
+        self.field_positions = {field: i for i, field in enumerate(reader.fields)}
+
+    def _resolve_doc_id(self, doc_ref: str) -> int:
+        """Return the document id matching a reference.
+
+        Args:
+            doc_ref (str): document reference
+
+        Returns:
+            int: document id
+        """
+        if doc_ref not in self.doc_ids:
+            # rare path (refs not met through postings): full scan once
+            for doc_id in range(len(self.reader.doc_refs)):
+                self.doc_ids[self.reader.doc_refs.get_str(doc_id)] = doc_id
+        return self.doc_ids[doc_ref]
+
+    def __getitem__(self, field_ref: str) -> Vector:
+        field_name, _, doc_ref = field_ref.partition("/")
+        if field_name not in self.field_positions:
+            raise KeyError(field_ref)
+        return self.reader.field_vector(
+            self._resolve_doc_id(doc_ref), self.field_positions[field_name]
+        )
+
+    def _iter_doc_ids(self) -> Iterator[int]:
+        """Yield the ids of the documents kept by the filter.
+
+        Yields:
+            int: document id
+        """
+        for doc_id in range(len(self.reader.doc_refs)):
+            if self.doc_filter is None or self.doc_filter(doc_id):
+                yield doc_id
+
+    def __iter__(self) -> Iterator[str]:
+        for doc_id in self._iter_doc_ids():
+            doc_ref = self.reader.doc_refs.get_str(doc_id)
+            self.doc_ids[doc_ref] = doc_id
+            for field in self.reader.fields:
+                yield f"{field}/{doc_ref}"
+
+    def __len__(self) -> int:
+        if self.doc_filter is None:
+            return len(self.reader.doc_refs) * len(self.reader.fields)
+        return sum(1 for _ in self._iter_doc_ids()) * len(self.reader.fields)
+
+
+class _ExpandedTerms:
+    """Result of a token set intersection, exposing lunr's TokenSet.to_list."""
+
+    def __init__(self, terms: list[str]):
+        self.terms = terms
+
+    def to_list(self) -> list[str]:
+        """Return the matched terms.
+
+        Returns:
+            list[str]: terms of the index accepted by the query token set
+        """
+        return self.terms
+
+
+class TermDictionaryTokenSet:
+    """Stand-in for lunr's TokenSet of all the index terms, walking the sorted term
+    dictionary instead of building the whole automaton at load time.
+
+    Each state of the implicit trie is a prefix, represented by the range of terms
+    starting with it.
+    """
+
+    def __init__(self, reader: BinaryIndexReader):
+        """Initialize the token set.
+
+        Args:
+            reader (BinaryIndexReader): binary index reader
+        """
+        self.reader = reader
+
+    def _next_chars(self, prefix: str, start: int, end: int) -> Iterator[str]:
+        """Yield the distinct characters following a prefix in the terms range.
+
+        Args:
+            prefix (str): current prefix
+            start (int): first term position starting with the prefix
+            end (int): last term position (excluded) starting with the prefix
+
+        Yields:
+            str: next character
+        """
+        position = start
+        while position < end:
+            term = self.reader.terms.get_str(position)
+            if len(term) == len(prefix):
+                position += 1
+                continue
+            char = term[len(prefix)]
+            yield char
+            position = bisect_left(
+                self.reader.terms,
+                (prefix + char).encode("utf-8") + _UTF8_UPPER_BOUND,
+                position,
+                end,
+            )
+
+    def intersect(self, other: TokenSet) -> _ExpandedTerms:
+        """Intersect the index terms with a query token set (wildcards, fuzzy...).
+
+        Args:
+            other (TokenSet): query token set, built from a query clause
+
+        Returns:
+            _ExpandedTerms: matching terms
+        """
+        matched: dict[str, None] = {}
+        stack = [(other, "", 0, len(self.reader.terms))]
+        visited: set[tuple[int, str]] = set()
+
+        while stack:
+            q_node, prefix, start, end = stack.pop()
+            if (id(q_node), prefix) in visited:
+                continue
+            visited.add((id(q_node), prefix))
+            for q_edge, q_next in q_node.edges.items():
+                if q_edge == "*":
+                    next_chars = list(self._next_chars(prefix, start, end))
+                else:
+                    next_chars = [q_edge]
+
+                for char in next_chars:
+                    child = prefix + char
+                    child_start, child_end = self.reader.prefix_range(
+                        child.encode("utf-8"), start, end
+                    )
+                    if child_start == child_end:
+                        continue
+                    if q_next.final and self.reader.terms.get_str(child_start) == child:
+                        matched[child] = None
+                    stack.append((q_next, child, child_start, child_end))
+
+        return _ExpandedTerms(list(matched))
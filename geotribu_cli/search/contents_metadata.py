@@ -0,0 +1,301 @@
+#! python3  # noqa: E265
+
+"""Compact and memory-mapped store of the indexed contents metadata.
+
+Search results only give the location of the matching contents. Title, tags, date
+and type of every indexed content are written with the local index into a binary
+file sorted by location, so that enriching a result is a binary search in a
+memory-mapped file instead of a scan of the whole contents listing.
+
+Sections of a page (locations with an anchor: `page/#section`) share the parent id
+of their page, computed once at index time, so that results can be merged by page
+with a set of integers.
+
+Like the binary index, the format is a local cache written with the native byte
+order and rejected (so regenerated by the caller) on a mismatch.
+"""
+
+# ############################################################################
+# ########## IMPORTS #############
+# ################################
+
+# standard library
+import logging
+import mmap
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable
+from datetime import date
+from pathlib import Path
+
+# 3rd party
+import orjson
+
+# package
+from geotribu_cli.search.binary_index import StringTable, pack_strings
+from geotribu_cli.search.mdl_search import ContentMetadata, MkdocsSearchDocument
+from geotribu_cli.utils.atomic_files import atomic_write
+from geotribu_cli.utils.dates_manipulation import get_date_from_content_location
+
+# ############################################################################
+# ########## GLOBALS #############
+# ################################
+
+logger = logging.getLogger(__name__)
+
+CONTENTS_METADATA_MAGIC: bytes = b"GTBM"
+CONTENTS_METADATA_FORMAT_VERSION: int = 2
+
+# content types, stored as their position in this tuple (0 = unknown)
+CONTENT_TYPES: tuple[str | None, ...] = (None, "article", "rdp")
+
+# sections are stored in this order, each one aligned on 8 bytes
+_SECTIONS: tuple[str, ...] = (
+    "location_offsets",
+    "location_blob",
+    "title_offsets",
+    "title_blob",
+    "tags_offsets",
+    "tags_blob",
+    "dates",
+    "types",
+    "parents",
+)
+# magic, format version, byte order (0 = little, 1 = big), docs
+_HEADER = struct.Struct(f"<4sHHI{len(_SECTIONS) * 2}Q")
+_ALIGNMENT: int = 8
+
+# ############################################################################
+# ########## FUNCTIONS ###########
+# ################################
+
+
+def get_content_type(location: str) -> str | None:
+    """Get the type of a content from its location.
+
+    Args:
+        location (str): content location, relative to the website root
+
+    Returns:
+        str | None: "article", "rdp" or None if it's neither of them
+    """
+    if location.startswith("articles/"):
+        return "article"
+    elif location.startswith("rdp/"):
+        return "rdp"
+    return None
+
+
+def get_content_attributes(location: str) -> tuple[int, int]:
+    """Get the type and the date of a content from its location, as integers.
+
+    Args:
+        location (str): content location, relative to the website root
+
+    Returns:
+        tuple[int, int]: type (position in CONTENT_TYPES) and date (proleptic \
+            Gregorian ordinal, 0 if unknown)
+    """
+    content_date = get_date_from_content_location(location)
+    return (
+        CONTENT_TYPES.index(get_content_type(location)),
+        content_date.toordinal() if isinstance(content_date, date) else 0,
+    )
+
+
+def write_contents_metadata(
+    contents_listing: Iterable[MkdocsSearchDocument], output_path: Path
+) -> Path:
+    """Write the metadata of the indexed contents into the binary format.
+
+    Args:
+        contents_listing (Iterable[MkdocsSearchDocument]): indexed contents
+        output_path (Path): path to the output binary file
+
+    Returns:
+        Path: path to the written file
+    """
+    # sorted by UTF-8 bytes to allow binary search on raw bytes, last one wins
+    documents: dict[str, MkdocsSearchDocument] = {
+        document.get("location"): document for document in contents_listing
+    }
+    locations = sorted(documents, key=lambda location: location.encode("utf-8"))
+
+    location_offsets, location_blob = pack_strings(locations)
+    title_offsets, title_blob = pack_strings(
+        [documents[location].get("title") or "" for location in locations]
+    )
+    tags_offsets, tags_blob = pack_strings(
+        [
+            orjson.dumps(documents[location].get("tags")).decode("utf-8")
+            for location in locations
+        ]
+    )
+    dates = array("I")
+    types = array("B")
+    # page location (without anchor) -> parent id
+    page_ids: dict[str, int] = {}
+    parents = array("I")
+    for location in locations:
+        content_type, content_date = get_content_attributes(location)
+        types.append(content_type)
+        dates.append(content_date)
+        parents.append(page_ids.setdefault(location.split("#")[0], len(page_ids)))
+
+    sections: list[bytes] = [
+        location_offsets.tobytes(),
+        location_blob,
+        title_offsets.tobytes(),
+        title_blob,
+        tags_offsets.tobytes(),
+        tags_blob,
+        dates.tobytes(),
+        types.tobytes(),
+        parents.tobytes(),
+    ]
+
+    # compute sections positions
+    positions: list[int] = []
+    cursor = _HEADER.size
+    for section in sections:
+        cursor += -cursor % _ALIGNMENT
+        positions.extend((cursor, len(section)))
+        cursor += len(section)
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with atomic_write(output_path) as fd:
+        fd.write(
+            _HEADER.pack(
+                CONTENTS_METADATA_MAGIC,
+                CONTENTS_METADATA_FORMAT_VERSION,
+                int(sys.byteorder == "big"),
+                len(locations),
+                *positions,
+            )
+        )
+        for section, position in zip(sections, positions[0::2]):
+            fd.write(b"\x00" * (position - fd.tell()))
+            fd.write(section)
+
+    logger.debug(
+        f"Contents metadata written to {output_path}: {len(locations)} documents."
+    )
+    return output_path
+
+
+# ############################################################################
+# ########## CLASSES #############
+# ################################
+
+
+class ContentsMetadataReader:
+    """Memory-mapped reader of the contents metadata store."""
+
+    def __init__(self, input_path: Path):
+        """Open and map the contents metadata file.
+
+        Args:
+            input_path (Path): path to the contents metadata file
+
+        Raises:
+            ValueError: if the file is not a compatible contents metadata store
+        """
+        self.input_path = input_path
+        with input_path.open(mode="rb") as fd:
+            self._mmap = mmap.mmap(fd.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._mmap) < _HEADER.size:
+            self.close()
+            raise ValueError(f"{input_path} is too small to be a metadata store.")
+
+        header = _HEADER.unpack_from(self._mmap, 0)
+        magic, format_version, big_endian = header[:3]
+        if magic != CONTENTS_METADATA_MAGIC:
+            self.close()
+            raise ValueError(f"{input_path} is not a contents metadata store.")
+        if format_version != CONTENTS_METADATA_FORMAT_VERSION:
+            self.close()
+            raise ValueError(
+                f"{input_path} has been written with format version {format_version} "
+                f"but version {CONTENTS_METADATA_FORMAT_VERSION} is expected."
+            )
+        if bool(big_endian) != (sys.byteorder == "big"):
+            self.close()
+            raise ValueError(f"{input_path} has been written with another byte order.")
+
+        self.docs_count: int = header[3]
+        buffer = memoryview(self._mmap)
+        sections: dict[str, memoryview] = {}
+        for i, name in enumerate(_SECTIONS):
+            position, length = header[4 + i * 2 : 6 + i * 2]
+            sections[name] = buffer[position : position + length]
+
+        self.locations = StringTable(
+            sections["location_offsets"].cast("Q"), sections["location_blob"]
+        )
+        self.titles = StringTable(
+            sections["title_offsets"].cast("Q"), sections["title_blob"]
+        )
+        self.tags = StringTable(
+            sections["tags_offsets"].cast("Q"), sections["tags_blob"]
+        )
+        self.dates = sections["dates"].cast("I")
+        self.types = sections["types"].cast("B")
+        self.parents = sections["parents"].cast("I")
+
+    def __len__(self) -> int:
+        return self.docs_count
+
+    def __contains__(self, location: object) -> bool:
+        return isinstance(location, str) and self.find(location) is not None
+
+    def close(self):
+        """Release the memory mapping. Required before replacing the file on Windows."""
+        for attribute in ("locations", "titles", "tags", "dates", "types", "parents"):
+            self.__dict__.pop(attribute, None)
+        try:
+            self._mmap.close()
+        except BufferError:
+            # some views are still referenced: let the garbage collector do it
+            logger.debug(f"Memory mapping of {self.input_path} is still in use.")
+
+    def find(self, location: str) -> int | None:
+        """Look for a content location in the store.
+
+        Args:
+            location (str): content location
+
+        Returns:
+            int | None: position of the content or None if not found
+        """
+        encoded = location.encode("utf-8")
+        position = bisect_left(self.locations, encoded)
+        if position < len(self.locations) and self.locations[position] == encoded:
+            return position
+        return None
+
+    def get(self, location: str) -> ContentMetadata | None:
+        """Get the metadata of a content.
+
+        Args:
+            location (str): content location, as used as reference in the index
+
+        Returns:
+            ContentMetadata | None: content metadata or None if not found
+        """
+        position = self.find(location)
+        if position is None:
+            return None
+
+        return ContentMetadata(
+            location=location,
+            title=self.titles.get_str(position),
+            tags=orjson.loads(self.tags[position]),
+            date=(
+                date.fromordinal(self.dates[position]) if self.dates[position] else None
+            ),
+            type=CONTENT_TYPES[self.types[position]],
+            parent_id=self.parents[position],
+        )
@@ -0,0 +1,379 @@
+#! python3  # noqa: E265
+
+"""Compact and memory-mapped catalog of the images stored on the CDN.
+
+The CDN search index maps every image path to its dimensions. Parsing it builds a
+Python string and a list for each image on every run. The catalog stores the same
+data into a binary file, memory-mapped at load time:
+
+- paths are sorted, to find an image with a binary search, and interned: the folder
+  of each path is stored once and images only refer to it by its position.
+- dimensions are packed into an array of integers (width, height).
+- images with known dimensions are also sorted by width, by height and by ratio, so
+  that dimensions ranges are found with binary searches instead of a scan.
+
+Like the binary index, the format is a local cache written with the native byte
+order and rejected (so regenerated by the caller) on a mismatch.
+"""
+
+# ############################################################################
+# ########## IMPORTS #############
+# ################################
+
+# standard library
+import logging
+import mmap
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterator, Mapping, Sequence
+from pathlib import Path
+
+# package
+from geotribu_cli.search.binary_index import StringTable, pack_strings
+from geotribu_cli.search.mdl_search import ImageDimensionsFilter
+from geotribu_cli.utils.atomic_files import atomic_write
+
+# ############################################################################
+# ########## GLOBALS #############
+# ################################
+
+logger = logging.getLogger(__name__)
+
+IMAGES_CATALOG_MAGIC: bytes = b"GTBC"
+IMAGES_CATALOG_FORMAT_VERSION: int = 2
+
+# dimensions of the images without valid ones in the CDN index
+UNKNOWN_DIMENSIONS: tuple[int, int] = (-1, -1)
+
+# sections are stored in this order, each one aligned on 8 bytes
+_SECTIONS: tuple[str, ...] = (
+    "folder_offsets",
+    "folder_blob",
+    "name_offsets",
+    "name_blob",
+    "folders",
+    "dimensions",
+    "width_order",
+    "height_order",
+    "ratio_order",
+)
+# magic, format version, byte order (0 = little, 1 = big), images
+_HEADER = struct.Struct(f"<4sHHI{len(_SECTIONS) * 2}Q")
+_ALIGNMENT: int = 8
+
+# ############################################################################
+# ########## FUNCTIONS ###########
+# ################################
+
+
+def write_images_catalog(
+    images: Mapping[str, Sequence[int] | None], output_path: Path
+) -> Path:
+    """Write the images of the CDN index into the binary catalog format.
+
+    Args:
+        images (Mapping[str, Sequence[int] | None]): dimensions (width, height) by \
+            image path, as stored in the CDN search index
+        output_path (Path): path to the output binary file
+
+    Returns:
+        Path: path to the written file
+    """
+    # sorted by UTF-8 bytes to allow binary search on raw bytes
+    paths = sorted(images, key=lambda path: path.encode("utf-8"))
+
+    # folder (with its trailing slash) -> position, in order of appearance
+    folder_positions: dict[str, int] = {}
+    folders = array("I")
+    names: list[str] = []
+    dimensions = array("i")
+    for path in paths:
+        folder, _, name = path.rpartition("/")
+        folders.append(
+            folder_positions.setdefault(
+                f"{folder}/" if folder else "", len(folder_positions)
+            )
+        )
+        names.append(name)
+
+        image_dimensions = images[path]
+        if not isinstance(image_dimensions, (list, tuple)) or len(image_dimensions) < 2:
+            logger.debug(f"No valid dimensions for {path}: {image_dimensions}")
+            image_dimensions = UNKNOWN_DIMENSIONS
+        dimensions.extend((int(image_dimensions[0]), int(image_dimensions[1])))
+
+    # positions of the images with known dimensions, sorted by width, height, ratio
+    known_positions = [
+        position
+        for position in range(len(paths))
+        if dimensions[position * 2] > 0 and dimensions[position * 2 + 1] > 0
+    ]
+    width_order = array(
+        "I", sorted(known_positions, key=lambda position: dimensions[position * 2])
+    )
+    height_order = array(
+        "I", sorted(known_positions, key=lambda position: dimensions[position * 2 + 1])
+    )
+    ratio_order = array(
+        "I",
+        sorted(
+            known_positions,
+            key=lambda position: dimensions[position * 2]
+            / dimensions[position * 2 + 1],
+        ),
+    )
+
+    folder_offsets, folder_blob = pack_strings(list(folder_positions))
+    name_offsets, name_blob = pack_strings(names)
+    sections: list[bytes] = [
+        folder_offsets.tobytes(),
+        folder_blob,
+        name_offsets.tobytes(),
+        name_blob,
+        folders.tobytes(),
+        dimensions.tobytes(),
+        width_order.tobytes(),
+        height_order.tobytes(),
+        ratio_order.tobytes(),
+    ]
+
+    # compute sections positions
+    positions: list[int] = []
+    cursor = _HEADER.size
+    for section in sections:
+        cursor += -cursor % _ALIGNMENT
+        positions.extend((cursor, len(section)))
+        cursor += len(section)
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with atomic_write(output_path) as fd:
+        fd.write(
+            _HEADER.pack(
+                IMAGES_CATALOG_MAGIC,
+                IMAGES_CATALOG_FORMAT_VERSION,
+                int(sys.byteorder == "big"),
+                len(paths),
+                *positions,
+            )
+        )
+        for section, position in zip(sections, positions[0::2]):
+            fd.write(b"\x00" * (position - fd.tell()))
+            fd.write(section)
+
+    logger.debug(
+        f"Images catalog written to {output_path}: {len(paths)} images in "
+        f"{len(folder_positions)} folders."
+    )
+    return output_path
+
+
+# ############################################################################
+# ########## CLASSES #############
+# ################################
+
+
+class _CatalogPaths(Sequence):
+    """Full paths of the catalog images, as UTF-8 bytes, built on access."""
+
+    def __init__(self, catalog: "ImagesCatalogReader"):
+        self.catalog = catalog
+
+    def __len__(self) -> int:
+        return self.catalog.images_count
+
+    def __getitem__(self, position: int) -> bytes:
+        return (
+            self.catalog.folders[self.catalog.image_folders[position]]
+            + self.catalog.names[position]
+        )
+
+
+class ImagesCatalogReader(Mapping):
+    """Memory-mapped reader of the images catalog: a read-only mapping of image \
+        path to dimensions (width, height)."""
+
+    def __init__(self, input_path: Path):
+        """Open and map the images catalog file.
+
+        Args:
+            input_path (Path): path to the images catalog file
+
+        Raises:
+            ValueError: if the file is not a compatible images catalog
+        """
+        self.input_path = input_path
+        with input_path.open(mode="rb") as fd:
+            self._mmap = mmap.mmap(fd.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._mmap) < _HEADER.size:
+            self.close()
+            raise ValueError(f"{input_path} is too small to be an images catalog.")
+
+        header = _HEADER.unpack_from(self._mmap, 0)
+        magic, format_version, big_endian = header[:3]
+        if magic != IMAGES_CATALOG_MAGIC:
+            self.close()
+            raise ValueError(f"{input_path} is not an images catalog.")
+        if format_version != IMAGES_CATALOG_FORMAT_VERSION:
+            self.close()
+            raise ValueError(
+                f"{input_path} has been written with format version {format_version} "
+                f"but version {IMAGES_CATALOG_FORMAT_VERSION} is expected."
+            )
+        if bool(big_endian) != (sys.byteorder == "big"):
+            self.close()
+            raise ValueError(f"{input_path} has been written with another byte order.")
+
+        self.images_count: int = header[3]
+        buffer = memoryview(self._mmap)
+        sections: dict[str, memoryview] = {}
+        for i, name in enumerate(_SECTIONS):
+            position, length = header[4 + i * 2 : 6 + i * 2]
+            sections[name] = buffer[position : position + length]
+
+        self.folders = StringTable(
+            sections["folder_offsets"].cast("Q"), sections["folder_blob"]
+        )
+        self.names = StringTable(
+            sections["name_offsets"].cast("Q"), sections["name_blob"]
+        )
+        self.image_folders = sections["folders"].cast("I")
+        self.dimensions = sections["dimensions"].cast("i")
+        self.width_order = sections["width_order"].cast("I")
+        self.height_order = sections["height_order"].cast("I")
+        self.ratio_order = sections["ratio_order"].cast("I")
+        self.paths = _CatalogPaths(self)
+
+    def __len__(self) -> int:
+        return self.images_count
+
+    def __iter__(self) -> Iterator[str]:
+        for position in range(self.images_count):
+            yield self.paths[position].decode("utf-8")
+
+    def __getitem__(self, path: str) -> tuple[int, int]:
+        position = self.find(path) if isinstance(path, str) else None
+        if position is None:
+            raise KeyError(path)
+        return (self.dimensions[position * 2], self.dimensions[position * 2 + 1])
+
+    def close(self):
+        """Release the memory mapping. Required before replacing the file on Windows."""
+        for attribute in (
+            "folders",
+            "names",
+            "image_folders",
+            "dimensions",
+            "width_order",
+            "height_order",
+            "ratio_order",
+            "paths",
+        ):
+            self.__dict__.pop(attribute, None)
+        try:
+            self._mmap.close()
+        except BufferError:
+            # some views are still referenced: let the garbage collector do it
+            logger.debug(f"Memory mapping of {self.input_path} is still in use.")
+
+    def find(self, path: str) -> int | None:
+        """Look for an image path in the catalog.
+
+        Args:
+            path (str): image path, relative to the CDN images folder
+
+        Returns:
+            int | None: position of the image or None if not found
+        """
+        encoded = path.encode("utf-8")
+        position = bisect_left(self.paths, encoded)
+        if position < self.images_count and self.paths[position] == encoded:
+            return position
+        return None
+
+    def get_width(self, position: int) -> int:
+        """Get the width of an image.
+
+        Args:
+            position (int): image position
+
+        Returns:
+            int: width, in pixels
+        """
+        return self.dimensions[position * 2]
+
+    def get_height(self, position: int) -> int:
+        """Get the height of an image.
+
+        Args:
+            position (int): image position
+
+        Returns:
+            int: height, in pixels
+        """
+        return self.dimensions[position * 2 + 1]
+
+    def get_ratio(self, position: int) -> float:
+        """Get the ratio (width / height) of an image with known dimensions.
+
+        Args:
+            position (int): image position
+
+        Returns:
+            float: ratio
+        """
+        return self.dimensions[position * 2] / self.dimensions[position * 2 + 1]
+
+    def find_by_dimensions(self, dimensions_filter: ImageDimensionsFilter) -> list[int]:
+        """Find the images within dimensions ranges.
+
+        The range of the most selective bound is found by binary search in its \
+            sorted index, then only its images are checked against the other bounds.
+
+        Args:
+            dimensions_filter (ImageDimensionsFilter): accepted dimensions
+
+        Returns:
+            list[int]: positions of the matching images, sorted (by path)
+        """
+        if dimensions_filter.is_empty():
+            return list(range(self.images_count))
+
+        # (start, end, order) of every bounded dimension
+        ranges: list[tuple[int, int, memoryview]] = []
+        for order, key, low, high in (
+            (
+                self.width_order,
+                self.get_width,
+                dimensions_filter.min_width,
+                dimensions_filter.max_width,
+            ),
+            (
+                self.height_order,
+                self.get_height,
+                dimensions_filter.min_height,
+                dimensions_filter.max_height,
+            ),
+            (
+                self.ratio_order,
+                self.get_ratio,
+                dimensions_filter.min_ratio,
+                dimensions_filter.max_ratio,
+            ),
+        ):
+            if low is None and high is None:
+                continue
+            start = 0 if low is None else bisect_left(order, low, key=key)
+            end = len(order) if high is None else bisect_right(order, high, key=key)
+            ranges.append((start, max(start, end), order))
+
+        start, end, order = min(ranges, key=lambda bounds: bounds[1] - bounds[0])
+        return sorted(
+            position
+            for position in order[start:end]
+            if dimensions_filter.match(
+                self.get_width(position), self.get_height(position)
+            )
+        )
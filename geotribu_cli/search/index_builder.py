@@ -0,0 +1,446 @@
+#! python3  # noqa: E265
+
+"""Incremental and parallel build of the search-content index.
+
+Most of the time spent building a lunr index goes into the text processing pipeline
+(tokenization, stop words, stemming) of every field of every document. Its output
+only depends on the document itself, so it's cached per document along with a hash
+of its content: when the contents listing is refreshed, only new and modified
+documents go through the pipeline again. Documents to analyze can also be shared
+between several worker processes.
+
+Scoring (BM25) depends on the whole corpus (documents count, average field length,
+terms frequencies) and is always computed again by lunr's builder, from analyses
+added in the documents order, which guarantees the same index as a full build.
+"""
+
+# ############################################################################
+# ########## IMPORTS #############
+# ################################
+
+# standard library
+import hashlib
+import logging
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import chain, islice
+from pathlib import Path
+
+# 3rd party
+import orjson
+from lunr.builder import Builder
+from lunr.index import Index
+from lunr.lunr import get_default_builder
+from lunr.tokenizer import Tokenizer
+
+# package
+from geotribu_cli.search.mdl_search import MkdocsSearchDocument
+from geotribu_cli.utils.atomic_files import atomic_write
+
+# ############################################################################
+# ########## GLOBALS #############
+# ################################
+
+logger = logging.getLogger(__name__)
+
+# field name -> (field length, {term: term frequency})
+DocumentAnalysis = dict[str, tuple[int, dict[str, int]]]
+
+# below this number of documents per process, starting the workers costs more time
+# than it saves
+MIN_DOCUMENTS_PER_WORKER: int = 200
+# documents read at once from the listing and sent to the worker processes: only a
+# few chunks are in memory at a time
+ANALYSIS_CHUNK_SIZE: int = 2000
+
+# builder of the current worker process, see _init_analysis_worker
+_worker_builder: Builder | None = None
+
+# ############################################################################
+# ########## FUNCTIONS ###########
+# ################################
+
+
+def get_document_hash(document: MkdocsSearchDocument, fields: Iterable[str]) -> str:
+    """Compute a hash of the indexed fields of a document.
+
+    Args:
+        document (MkdocsSearchDocument): document to hash
+        fields (Iterable[str]): indexed fields names
+
+    Returns:
+        str: hexadecimal digest
+    """
+    return hashlib.sha256(
+        orjson.dumps([document.get(field) for field in fields])
+    ).hexdigest()
+
+
+def get_index_builder(
+    index_ref_id: str,
+    index_configuration: dict,
+    index_fieds_definition: list[dict],
+) -> Builder:
+    """Get a lunr builder configured like the lunr() shortcut would do.
+
+    Args:
+        index_ref_id (str): field to use as index primary key
+        index_configuration (dict): index configuration (language, etc.)
+        index_fieds_definition (list[dict]): fields settings (boost, etc.)
+
+    Returns:
+        Builder: configured builder, without any document
+    """
+    builder = get_default_builder(index_configuration.get("lang", "fr"))
+    builder.ref(index_ref_id)
+    for field in index_fieds_definition:
+        builder.field(**field)
+    return builder
+
+
+def analyze_document(
+    builder: Builder, document: MkdocsSearchDocument
+) -> DocumentAnalysis:
+    """Run the builder pipeline on every field of a document, like Builder.add does.
+
+    Args:
+        builder (Builder): configured lunr builder
+        document (MkdocsSearchDocument): document to analyze
+
+    Returns:
+        DocumentAnalysis: length and terms frequencies for each field
+    """
+    analysis: DocumentAnalysis = {}
+    for field_name, field in builder._fields.items():
+        extractor = field.extractor
+        field_value = document[field_name] if extractor is None else extractor(document)
+        terms = builder.pipeline.run(Tokenizer(field_value), field_name)
+
+        # dict keeps the order of first occurrence, used by lunr to number terms
+        term_frequencies: dict[str, int] = {}
+        for term in terms:
+            term_key = str(term)
+            term_frequencies[term_key] = term_frequencies.get(term_key, 0) + 1
+        analysis[field_name] = (len(terms), term_frequencies)
+
+    return analysis
+
+
+def _init_analysis_worker(
+    index_ref_id: str,
+    index_configuration: dict,
+    index_fieds_definition: list[dict],
+):
+    """Configure the builder of a worker process, once for all its documents.
+
+    Args:
+        index_ref_id (str): field to use as index primary key
+        index_configuration (dict): index configuration (language, etc.)
+        index_fieds_definition (list[dict]): fields settings (boost, etc.)
+    """
+    global _worker_builder
+    # forked workers inherit the languages functions registered by the parent
+    logging.getLogger("lunr.pipeline").setLevel(logging.ERROR)
+    _worker_builder = get_index_builder(
+        index_ref_id=index_ref_id,
+        index_configuration=index_configuration,
+        index_fieds_definition=index_fieds_definition,
+    )
+
+
+def _analyze_document_in_worker(document: MkdocsSearchDocument) -> DocumentAnalysis:
+    """Analyze a document with the builder of the worker process.
+
+    Args:
+        document (MkdocsSearchDocument): document to analyze
+
+    Returns:
+        DocumentAnalysis: length and terms frequencies for each field
+    """
+    return analyze_document(_worker_builder, document)
+
+
+def iter_documents_analyses(
+    builder: Builder,
+    documents: Iterable[MkdocsSearchDocument],
+    index_ref_id: str,
+    index_configuration: dict,
+    index_fieds_definition: list[dict],
+    max_workers: int = 1,
+) -> Iterator[tuple[MkdocsSearchDocument, DocumentAnalysis]]:
+    """Analyze documents as they are read, sharing them between worker processes if \
+        they're numerous enough.
+
+    Documents are read by chunks of ANALYSIS_CHUNK_SIZE: two chunks are analyzed \
+        by the workers while the next one is read, so the whole listing is never in \
+        memory. Builders can't be sent to other processes, so each worker \
+        configures its own from the index settings.
+
+    Args:
+        builder (Builder): configured lunr builder, used to analyze documents in \
+            the current process
+        documents (Iterable[MkdocsSearchDocument]): documents to analyze
+        index_ref_id (str): field to use as index primary key
+        index_configuration (dict): index configuration (language, etc.)
+        index_fieds_definition (list[dict]): fields settings (boost, etc.)
+        max_workers (int, optional): maximum number of worker processes. Defaults \
+            to 1 (analyzed in the current process).
+
+    Yields:
+        Iterator[tuple[MkdocsSearchDocument, DocumentAnalysis]]: document and its \
+            analysis (length and terms frequencies for each field), in the same \
+            order as the documents
+    """
+    documents = iter(documents)
+    chunk = list(islice(documents, ANALYSIS_CHUNK_SIZE))
+    workers = min(max_workers, len(chunk) // MIN_DOCUMENTS_PER_WORKER)
+    # chunks sent to the workers, with their analyses and how many were yielded
+    pending: deque[tuple[list[MkdocsSearchDocument], Iterator]] = deque()
+    count_yielded = 0
+
+    if workers > 1:
+        logger.debug(f"Analyzing documents with {workers} processes.")
+        try:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_analysis_worker,
+                initargs=(index_ref_id, index_configuration, index_fieds_definition),
+            ) as executor:
+                while chunk or pending:
+                    if chunk:
+                        pending.append(
+                            (
+                                chunk,
+                                executor.map(
+                                    _analyze_document_in_worker,
+                                    chunk,
+                                    chunksize=max(1, len(chunk) // (workers * 4)),
+                                ),
+                            )
+                        )
+                        chunk = list(islice(documents, ANALYSIS_CHUNK_SIZE))
+                        if chunk and len(pending) < 2:
+                            continue
+
+                    pending_chunk, analyses = pending[0]
+                    for analysis in analyses:
+                        yield pending_chunk[count_yielded], analysis
+                        count_yielded += 1
+                    pending.popleft()
+                    count_yielded = 0
+            return
+        except (BrokenProcessPool, OSError) as err:
+            logger.warning(
+                "Unable to analyze documents in parallel, fallback to a single "
+                f"process. Trace: {err}"
+            )
+
+    # documents not analyzed yet: rest of the pending chunks, read chunk and the others
+    for document in chain(
+        *(
+            pending_chunk[count_yielded if position == 0 else 0 :]
+            for position, (pending_chunk, _) in enumerate(pending)
+        ),
+        chunk,
+        documents,
+    ):
+        yield document, analyze_document(builder, document)
+
+
+def add_analyzed_document(builder: Builder, doc_ref: str, analysis: DocumentAnalysis):
+    """Add a document to the builder from its cached analysis, skipping the pipeline.
+
+    Mirrors lunr.builder.Builder.add (without metadata since none is whitelisted).
+
+    Args:
+        builder (Builder): configured lunr builder
+        doc_ref (str): document reference
+        analysis (DocumentAnalysis): document analysis
+    """
+    builder._documents[doc_ref] = {}
+    builder.document_count += 1
+
+    for field_name in builder._fields:
+        field_length, term_frequencies = analysis[field_name]
+        field_ref = f"{field_name}/{doc_ref}"
+        builder.field_term_frequencies[field_ref] = dict(term_frequencies)
+        builder.field_lengths[field_ref] = field_length
+
+        for term_key in term_frequencies:
+            if term_key not in builder.inverted_index:
+                posting = {_field_name: {} for _field_name in builder._fields}
+                posting["_index"] = builder.term_index
+                builder.term_index += 1
+                builder.inverted_index[term_key] = posting
+            builder.inverted_index[term_key][field_name][doc_ref] = {}
+
+
+def load_analysis_cache(cache_path: Path, cache_configuration: dict) -> dict:
+    """Load cached documents analyses, if compatible with the index configuration.
+
+    Args:
+        cache_path (Path): path to the cache file
+        cache_configuration (dict): index configuration (ref, language, fields)
+
+    Returns:
+        dict: document reference -> {"hash": str, "fields": DocumentAnalysis}
+    """
+    if not cache_path.exists():
+        return {}
+
+    try:
+        with cache_path.open(mode="rb") as fd:
+            cache = orjson.loads(fd.read())
+    except orjson.JSONDecodeError as err:
+        logger.warning(f"Unable to read analysis cache {cache_path}. Trace: {err}")
+        return {}
+
+    if cache.get("configuration") != cache_configuration:
+        logger.info(
+            f"Index configuration changed since the analysis cache ({cache_path}) was "
+            "written: every document will be analyzed again."
+        )
+        return {}
+
+    return cache.get("documents", {})
+
+
+def build_index(
+    input_documents_to_index: Iterable[MkdocsSearchDocument],
+    index_ref_id: str,
+    index_configuration: dict,
+    index_fieds_definition: list[dict],
+    max_workers: int = 1,
+) -> Index:
+    """Build search index from input documents, analyzing them in parallel.
+
+    Args:
+        input_documents_to_index (Iterable[MkdocsSearchDocument]): documents to index
+        index_ref_id (str): field to use as index primary key
+        index_configuration (dict): index configuration (language, etc.)
+        index_fieds_definition (list[dict]): fields settings (boost, etc.)
+        max_workers (int, optional): maximum number of worker processes used to \
+            analyze documents. Defaults to 1.
+
+    Returns:
+        Index: lunr Index, identical to the one built by lunr() in a single process
+    """
+    builder = get_index_builder(
+        index_ref_id=index_ref_id,
+        index_configuration=index_configuration,
+        index_fieds_definition=index_fieds_definition,
+    )
+    for document, analysis in iter_documents_analyses(
+        builder=builder,
+        documents=input_documents_to_index,
+        index_ref_id=index_ref_id,
+        index_configuration=index_configuration,
+        index_fieds_definition=index_fieds_definition,
+        max_workers=max_workers,
+    ):
+        add_analyzed_document(builder, str(document[index_ref_id]), analysis)
+
+    return builder.build()
+
+
+def build_index_incrementally(
+    input_documents_to_index: Iterable[MkdocsSearchDocument],
+    index_ref_id: str,
+    index_configuration: dict,
+    index_fieds_definition: list[dict],
+    analysis_cache_path: Path,
+    max_workers: int = 1,
+) -> Index:
+    """Build search index from input documents, only analyzing new or modified ones.
+
+    Args:
+        input_documents_to_index (Iterable[MkdocsSearchDocument]): documents to index
+        index_ref_id (str): field to use as index primary key
+        index_configuration (dict): index configuration (language, etc.)
+        index_fieds_definition (list[dict]): fields settings (boost, etc.)
+        analysis_cache_path (Path): path to the documents analyses cache file, \
+            updated after the build
+        max_workers (int, optional): maximum number of worker processes used to \
+            analyze new and modified documents. Defaults to 1.
+
+    Returns:
+        Index: lunr Index, identical to the one built from scratch
+    """
+    builder = get_index_builder(
+        index_ref_id=index_ref_id,
+        index_configuration=index_configuration,
+        index_fieds_definition=index_fieds_definition,
+    )
+    fields = list(builder._fields)
+    cache_configuration = {
+        "ref": index_ref_id,
+        "lang": index_configuration.get("lang", "fr"),
+        "fields": fields,
+        "pipeline": [
+            getattr(fn, "label", type(fn).__name__) for fn in builder.pipeline._stack
+        ],
+    }
+    previous_analyses = load_analysis_cache(analysis_cache_path, cache_configuration)
+
+    # (document reference, cache entry) in the documents order. Only the entries are
+    # kept: documents are dropped once analyzed.
+    entries: list[tuple[str, dict]] = []
+    entries_to_analyze: deque[dict] = deque()
+    count_added = count_modified = 0
+
+    def iter_documents_to_analyze() -> Iterator[MkdocsSearchDocument]:
+        nonlocal count_added, count_modified
+        for document in input_documents_to_index:
+            doc_ref = str(document[index_ref_id])
+            doc_hash = get_document_hash(document, fields)
+            cached = previous_analyses.get(doc_ref)
+            entry = {"hash": doc_hash, "fields": None}
+
+            if cached is not None and cached.get("hash") == doc_hash:
+                entry["fields"] = {
+                    field_name: tuple(field_analysis)
+                    for field_name, field_analysis in cached["fields"].items()
+                }
+            else:
+                if cached is None:
+                    count_added += 1
+                else:
+                    count_modified += 1
+                entries_to_analyze.append(entry)
+                yield document
+
+            entries.append((doc_ref, entry))
+
+    for _, analysis in iter_documents_analyses(
+        builder=builder,
+        documents=iter_documents_to_analyze(),
+        index_ref_id=index_ref_id,
+        index_configuration=index_configuration,
+        index_fieds_definition=index_fieds_definition,
+        max_workers=max_workers,
+    ):
+        entries_to_analyze.popleft()["fields"] = analysis
+
+    analyses = {}
+    for doc_ref, entry in entries:
+        analyses[doc_ref] = entry
+        add_analyzed_document(builder, doc_ref, entry["fields"])
+
+    count_removed = len(previous_analyses.keys() - analyses.keys())
+    logger.info(
+        f"Incremental index build: {count_added} added, {count_modified} modified, "
+        f"{count_removed} removed and "
+        f"{len(analyses) - count_added - count_modified} unchanged document(s)."
+    )
+
+    idx = builder.build()
+
+    # update the cache for the next build
+    with atomic_write(analysis_cache_path) as fd:
+        fd.write(
+            orjson.dumps({"configuration": cache_configuration, "documents": analyses})
+        )
+
+    return idx
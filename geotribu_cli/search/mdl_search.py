@@ -4,8 +4,13 @@
 """Search related models."""
 
 # standard library
+from dataclasses import dataclass
+from datetime import date
 from typing import TypedDict
 
+# 3rd party
+from lunr.query import QueryPresence
+
 # ############################################################################
 # ########## CLASSES #############
 # ################################
@@ -35,3 +40,88 @@ class MkdocsSearchListing(TypedDict):
 
     config: MkdocsSearchConfiguration
     docs: list[MkdocsSearchDocument]
+
+
+class ContentMetadata(TypedDict):
+    """Metadata of an indexed content, stored alongside the local search index."""
+
+    location: str
+    title: str
+    tags: list[str] | None
+    date: date | None
+    type: str | None
+    # shared by a page and its sections
+    parent_id: int
+
+
+@dataclass(frozen=True)
+class CompiledClause:
+    """Clause of a search query, with its terms already processed by the index \
+        pipeline and expanded against the index terms dictionary."""
+
+    fields: tuple[str, ...]
+    presence: QueryPresence
+    boost: float
+    # positions of the matching terms in the index terms dictionary
+    term_positions: tuple[int, ...]
+    # a required term matches no index term: the clause can't be satisfied
+    has_unmatched_required_term: bool = False
+
+
+@dataclass(frozen=True)
+class QueryPlan:
+    """Search query compiled against an index, reusable for the same query."""
+
+    query_string: str
+    clauses: tuple[CompiledClause, ...]
+    # only prohibited clauses: every document matches
+    is_negated: bool = False
+    # plain terms also match the index terms starting with or close to them
+    is_approximate: bool = False
+
+
+@dataclass(frozen=True)
+class ImageDimensionsFilter:
+    """Ranges of dimensions accepted by an image search, bounds included. None \
+        means no bound."""
+
+    min_width: int | None = None
+    max_width: int | None = None
+    min_height: int | None = None
+    max_height: int | None = None
+    # width / height
+    min_ratio: float | None = None
+    max_ratio: float | None = None
+
+    def is_empty(self) -> bool:
+        """Check if the filter accepts any image.
+
+        Returns:
+            bool: True if no bound is set
+        """
+        return all(bound is None for bound in vars(self).values())
+
+    def match(self, width: int, height: int) -> bool:
+        """Check if dimensions are within the ranges. Unknown dimensions (not \
+            positive) never match a filter which is not empty.
+
+        Args:
+            width (int): image width, in pixels
+            height (int): image height, in pixels
+
+        Returns:
+            bool: True if the dimensions are accepted
+        """
+        if self.is_empty():
+            return True
+        if width <= 0 or height <= 0:
+            return False
+
+        for value, low, high in (
+            (width, self.min_width, self.max_width),
+            (height, self.min_height, self.max_height),
+            (width / height, self.min_ratio, self.max_ratio),
+        ):
+            if (low is not None and value < low) or (high is not None and value > high):
+                return False
+        return True
@@ -0,0 +1,145 @@
+#! python3  # noqa: E265
+
+"""On-disk cache of search results.
+
+Results of a search (after enrichment and filters) are stored in a file per query,
+named after a hash of the index fingerprint, the normalized query and the filters.
+Any change of the index file changes its fingerprint, so outdated results are never
+used again and are evicted like the least recently used ones.
+"""
+
+# ############################################################################
+# ########## IMPORTS #############
+# ################################
+
+# standard library
+import hashlib
+import logging
+import os
+from pathlib import Path
+
+# 3rd party
+import orjson
+
+# package
+from geotribu_cli.utils.atomic_files import atomic_write
+
+# ############################################################################
+# ########## GLOBALS #############
+# ################################
+
+logger = logging.getLogger(__name__)
+
+# ############################################################################
+# ########## CLASSES #############
+# ################################
+
+
+class QueryCache:
+    """Least recently used cache of search results, one JSON file per query."""
+
+    def __init__(self, cache_folder: Path, max_entries: int = 100):
+        """Class initialization.
+
+        Args:
+            cache_folder (Path): folder where to store cached results
+            max_entries (int, optional): maximum number of cached queries. Defaults \
+                to 100.
+        """
+        self.cache_folder = cache_folder
+        self.max_entries = max_entries
+
+    @staticmethod
+    def get_key(index_file: Path, query: str, filters: dict) -> str:
+        """Compute the cache key of a query.
+
+        Args:
+            index_file (Path): path to the index file the search is performed on
+            query (str): search query
+            filters (dict): filters applied to the results
+
+        Returns:
+            str: hexadecimal digest
+        """
+        index_stats = index_file.stat()
+        return hashlib.sha256(
+            orjson.dumps(
+                [
+                    # index fingerprint
+                    str(index_file.resolve()),
+                    index_stats.st_size,
+                    index_stats.st_mtime_ns,
+                    # lunr ignores extra whitespaces
+                    " ".join(query.split()),
+                    filters,
+                ],
+                default=str,
+                option=orjson.OPT_SORT_KEYS,
+            )
+        ).hexdigest()
+
+    def get_entry_path(self, key: str) -> Path:
+        """Get the path to the cached results of a query.
+
+        Args:
+            key (str): cache key
+
+        Returns:
+            Path: path to the cache file
+        """
+        return self.cache_folder / f"{key}.json"
+
+    def get(self, key: str) -> dict | None:
+        """Get cached results of a query.
+
+        Args:
+            key (str): cache key
+
+        Returns:
+            dict | None: cached results or None if not cached
+        """
+        entry_path = self.get_entry_path(key)
+        try:
+            with entry_path.open(mode="rb") as fd:
+                entry = orjson.loads(fd.read())
+            # mark it as recently used
+            os.utime(entry_path)
+        except FileNotFoundError:
+            return None
+        except (OSError, orjson.JSONDecodeError) as err:
+            logger.warning(f"Unable to read cached results {entry_path}. Trace: {err}")
+            return None
+
+        logger.info(f"Search results read from the query cache: {entry_path}")
+        return entry
+
+    def set(self, key: str, value: dict):
+        """Store results of a query, evicting the least recently used ones if the \
+            cache is full.
+
+        Args:
+            key (str): cache key
+            value (dict): results to store
+        """
+        with atomic_write(self.get_entry_path(key)) as fd:
+            fd.write(orjson.dumps(value))
+
+        self.evict()
+
+    def evict(self):
+        """Remove the least recently used entries beyond the maximum number."""
+        entries = []
+        for entry_path in self.cache_folder.glob("*.json"):
+            try:
+                entries.append((entry_path.stat().st_mtime, entry_path))
+            except FileNotFoundError:
+                # removed by another process meanwhile
+                continue
+
+        if len(entries) <= self.max_entries:
+            return
+
+        entries.sort(reverse=True)
+        for _, entry_path in entries[self.max_entries :]:
+            logger.debug(f"Evicting cached results: {entry_path}")
+            entry_path.unlink(missing_ok=True)
@@ -0,0 +1,121 @@
+#! python3  # noqa: E265
+
+"""Run many searches against an index loaded once.
+
+Queries are read from a file or the standard input, one per line: either a plain
+search term or a JSON object (JSON Lines) with the search term and the arguments to
+override for this query. Results are written as soon as they are available, one JSON
+object per line, so that the output can be consumed while the batch is running.
+"""
+
+# ############################################################################
+# ########## IMPORTS #############
+# ################################
+
+# standard library
+import argparse
+import logging
+import sys
+from collections.abc import Callable, Iterable
+from typing import TextIO
+
+# 3rd party
+import orjson
+from lunr.exceptions import QueryParseError
+
+# package
+from geotribu_cli.search.search_daemon import decode_request_args
+
+# ############################################################################
+# ########## GLOBALS #############
+# ################################
+
+logger = logging.getLogger(__name__)
+
+# ############################################################################
+# ########## FUNCTIONS ###########
+# ################################
+
+
+def parse_batch_line(
+    line: str, args: argparse.Namespace, query_args_names: Iterable[str]
+) -> argparse.Namespace:
+    """Get the arguments of a query from a line of a batch file.
+
+    Args:
+        line (str): line, stripped: a search term or a JSON object with the search \
+            term and the arguments to override
+        args (argparse.Namespace): arguments passed to the subcommand, used as \
+            defaults
+        query_args_names (Iterable[str]): names of the arguments which can be \
+            overridden by a query
+
+    Raises:
+        ValueError: if the line is not a valid query
+
+    Returns:
+        argparse.Namespace: arguments of the query
+    """
+    if not line.startswith("{"):
+        return argparse.Namespace(**{**vars(args), "search_term": line})
+
+    query = orjson.loads(line)
+    if not isinstance(query, dict) or not query.get("search_term"):
+        raise ValueError(
+            "La requête doit contenir un terme de recherche (search_term)."
+        )
+    unknown_args = set(query) - {"search_term", *query_args_names}
+    if unknown_args:
+        raise ValueError(
+            f"Arguments non pris en charge : {', '.join(sorted(unknown_args))}."
+        )
+
+    return argparse.Namespace(**{**vars(args), **vars(decode_request_args(query))})
+
+
+def run_batch(
+    args: argparse.Namespace,
+    search: Callable[[argparse.Namespace], dict],
+    query_args_names: Iterable[str],
+    output_stream: TextIO | None = None,
+) -> int:
+    """Run the queries of a batch file and write their results as JSON Lines.
+
+    A query which fails is reported in the output (line number and error) without \
+        stopping the batch.
+
+    Args:
+        args (argparse.Namespace): arguments passed to the subcommand, with the \
+            queries stream (batch_file)
+        search (Callable[[argparse.Namespace], dict]): function performing a search \
+            with the arguments of a query, against an index already loaded
+        query_args_names (Iterable[str]): names of the arguments which can be \
+            overridden by a query
+        output_stream (TextIO | None, optional): where to write results. Defaults \
+            to None (standard output).
+
+    Returns:
+        int: number of failed queries
+    """
+    output_stream = output_stream or sys.stdout
+    count_errors = 0
+
+    for line_number, line in enumerate(args.batch_file, start=1):
+        line = line.strip()
+        if not line:
+            continue
+
+        try:
+            query_args = parse_batch_line(
+                line=line, args=args, query_args_names=query_args_names
+            )
+            response = {"search_term": query_args.search_term, **search(query_args)}
+        except (QueryParseError, TypeError, ValueError) as err:
+            logger.error(f"Requête n°{line_number} en erreur : {line}. Trace : {err}")
+            response = {"line": line_number, "error": str(err)}
+            count_errors += 1
+
+        output_stream.write(orjson.dumps(response).decode("utf-8") + "\n")
+        output_stream.flush()
+
+    return count_errors
@@ -8,9 +8,9 @@
 import argparse
 import logging
 import sys
-from collections.abc import Iterator
+from collections.abc import Iterable, Iterator
 from datetime import date
-from os import getenv
+from os import cpu_count, getenv
 from pathlib import Path
 
 # 3rd party
@@ -18,22 +18,45 @@ import orjson
 from lunr import lunr
 from lunr.index import Index
 from rich.prompt import Prompt
+from rich.table import Table
 
 # package
 from geotribu_cli.cli_results_rich_formatters import format_output_result_search_content
 from geotribu_cli.console import console
 from geotribu_cli.constants import GeotribuDefaults
 from geotribu_cli.history import CliHistory
-from geotribu_cli.search.mdl_search import MkdocsSearchDocument, MkdocsSearchListing
+from geotribu_cli.search.binary_index import (
+    BinaryIndex,
+    load_binary_index,
+    write_binary_index,
+)
+from geotribu_cli.search.contents_metadata import (
+    CONTENT_TYPES,
+    ContentsMetadataReader,
+    get_content_attributes,
+    write_contents_metadata,
+)
+from geotribu_cli.search.index_builder import build_index, build_index_incrementally
+from geotribu_cli.search.mdl_search import MkdocsSearchDocument
+from geotribu_cli.search.query_cache import QueryCache
+from geotribu_cli.search.search_batch import run_batch
+from geotribu_cli.search.search_daemon import query_search_daemon
+from geotribu_cli.search.search_interactive import (
+    IncrementalSearch,
+    run_interactive_search,
+)
 from geotribu_cli.subcommands.open_result import open_content
 from geotribu_cli.utils.args_types import arg_date_iso_max_today
-from geotribu_cli.utils.dates_manipulation import (
-    get_date_from_content_location,
-    is_more_recent,
+from geotribu_cli.utils.atomic_files import atomic_write, file_lock
+from geotribu_cli.utils.dates_manipulation import is_more_recent
+from geotribu_cli.utils.file_downloader import (
+    download_remote_file_to_local,
+    read_local_file_metadata,
+    write_local_file_metadata,
 )
-from geotribu_cli.utils.file_downloader import download_remote_file_to_local
 from geotribu_cli.utils.file_stats import is_file_older_than
 from geotribu_cli.utils.formatters import convert_octets
+from geotribu_cli.utils.json_stream import iter_json_array_items
 from geotribu_cli.utils.str2bool import str2bool
 
 # ############################################################################
@@ -43,6 +66,31 @@ from geotribu_cli.utils.str2bool import str2bool
 logger = logging.getLogger(__name__)
 defaults_settings = GeotribuDefaults()
 
+# arguments forwarded to the search daemon
+search_content_args_names: tuple[str, ...] = (
+    "search_term",
+    "remote_index_file",
+    "local_index_file",
+    "expiration_rotating_hours",
+    "opt_incremental_index",
+    "index_workers",
+    "filter_type",
+    "filter_date_start",
+    "filter_date_end",
+    "opt_merge_unique_url",
+    "opt_fuzzy",
+    "results_number",
+)
+# arguments which can be set by each query of a batch
+search_content_batch_args_names: tuple[str, ...] = (
+    "filter_type",
+    "filter_date_start",
+    "filter_date_end",
+    "opt_merge_unique_url",
+    "opt_fuzzy",
+    "results_number",
+)
+
 # ############################################################################
 # ########## FUNCTIONS ###########
 # ################################
@@ -52,22 +100,16 @@ def filter_content_listing(json_filepath: Path) -> Iterator[MkdocsSearchDocument
     """Filtering out irrelevant docs from content search index to reduce number of
         documents to keep in local index.
 
+    The file is parsed incrementally: documents are read one by one and discarded
+        ones are never held in memory along with the whole file.
+
     Args:
         json_filepath (Path): path to the input JSON file search index, generated by
             lunr (through mkdocs)
 
-    Returns:
-        Iterator[MkdocsSearchDocument]: filtered list of document
+    Yields:
+        Iterator[MkdocsSearchDocument]: filtered documents
     """
-    with json_filepath.open(mode="rb") as j:
-        data: MkdocsSearchListing = orjson.loads(j.read())
-
-    if not isinstance(data, dict) or "docs" not in data:
-        logger.error(
-            f"Le fichier {json_filepath} ne semble pas être un index de recherche "
-            "lunr valide."
-        )
-        sys.exit(1)
 
     def keep_it(indexed_content_part: MkdocsSearchDocument) -> bool:
         """Determines if a document's 'location' is valid based on defined criteria.
@@ -87,7 +129,18 @@ def filter_content_listing(json_filepath: Path) -> Iterator[MkdocsSearchDocument
         location = indexed_content_part.get("location", "")
         return location.startswith(("articles", "rdp"))
 
-    return filter(keep_it, data.get("docs", []))
+    try:
+        for indexed_content_part in iter_json_array_items(
+            json_filepath=json_filepath, array_key="docs"
+        ):
+            if keep_it(indexed_content_part):
+                yield indexed_content_part
+    except ValueError as err:
+        logger.error(
+            f"Le fichier {json_filepath} ne semble pas être un index de recherche "
+            f"lunr valide. Trace : {err}"
+        )
+        sys.exit(1)
 
 
 def generate_index_from_docs(
@@ -95,6 +148,7 @@ def generate_index_from_docs(
     index_ref_id: str,
     index_configuration: dict,
     index_fieds_definition: list[dict],
+    max_workers: int = 1,
 ) -> Index:
     """Build search index from input documents.
 
@@ -103,10 +157,21 @@ def generate_index_from_docs(
         index_ref_id (str): field to use as index primary key
         index_configuration (dict): index configuration (language, etc.)
         index_fieds_definition (List[dict]): fields settings (boost, etc.)
+        max_workers (int, optional): maximum number of processes used to analyze \
+            documents. Defaults to 1.
 
     Returns:
         Index: lunr Index
     """
+    if max_workers > 1:
+        # text processing shared between processes, scores computed by lunr
+        return build_index(
+            input_documents_to_index=input_documents_to_index,
+            index_ref_id=index_ref_id,
+            index_configuration=index_configuration,
+            index_fieds_definition=index_fieds_definition,
+            max_workers=max_workers,
+        )
 
     idx: Index = lunr(
         ref=index_ref_id,
@@ -118,6 +183,520 @@ def generate_index_from_docs(
     return idx
 
 
+def is_local_index_outdated(args: argparse.Namespace) -> bool:
+    """Check if the local index has to be refreshed: it doesn't exist, it's older \
+        than the expiration or the search index downloaded from the website changed \
+        since it was built (refreshed in the background for example).
+
+    Args:
+        args (argparse.Namespace): arguments passed to the subcommand (local index \
+            file, expiration)
+
+    Returns:
+        bool: True if the local index has to be refreshed
+    """
+    if not args.local_index_file.exists() or is_file_older_than(
+        args.local_index_file, args.expiration_rotating_hours
+    ):
+        return True
+
+    # search index downloaded from the website
+    source_sha256 = read_local_file_metadata(
+        args.local_index_file.parent / "mkdocs_search_index.json"
+    ).get("sha256")
+    return (
+        source_sha256 is not None
+        and read_local_file_metadata(args.local_index_file).get("source_sha256")
+        != source_sha256
+    )
+
+
+def update_local_index(
+    args: argparse.Namespace,
+    local_source_index_file: Path,
+    local_metadata_file: Path,
+    local_binary_index_file: Path,
+    local_analysis_cache_file: Path,
+) -> tuple[ContentsMetadataReader, Index] | None:
+    """Download the website search index and build the local index from it, unless \
+        it's up to date. Should be called while holding the lock on the local index.
+
+    Every file is written aside then renamed, so that other processes never read a \
+        partial index.
+
+    Args:
+        args (argparse.Namespace): arguments passed to the subcommand
+        local_source_index_file (Path): path to the search index downloaded from \
+            the website
+        local_metadata_file (Path): path to the indexed contents metadata store
+        local_binary_index_file (Path): path to the binary local index
+        local_analysis_cache_file (Path): path to the documents analyses cache
+
+    Returns:
+        tuple[ContentsMetadataReader, Index] | None: contents metadata and index if \
+            it has been built, None if the existing local index is up to date
+    """
+    # another process may have refreshed the index while waiting for the lock
+    if not is_local_index_outdated(args):
+        logger.info(
+            f"Local index ({args.local_index_file}) has been updated by another "
+            "process."
+        )
+        return None
+
+    # if the local index doesn't exist or exists but it's outdated: download the
+    # index from website (or just revalidate it if it has already been downloaded)
+    with console.status(
+        "Téléchargement de l'index des contenus depuis le site...", spinner="earth"
+    ):
+        get_local_contents_listing = download_remote_file_to_local(
+            remote_url_to_download=args.remote_index_file,
+            local_file_path=local_source_index_file,
+            expiration_rotating_hours=args.expiration_rotating_hours,
+            compress_at_rest=True,
+            stale_while_revalidate=True,
+        )
+    if not isinstance(get_local_contents_listing, Path):
+        logger.error(
+            f"Le téléchargement du fichier distant {args.remote_index_file} "
+            f"ou la récupération du fichier local {local_source_index_file} a "
+            "échoué."
+        )
+        if isinstance(get_local_contents_listing, Exception):
+            logger.error(get_local_contents_listing)
+        sys.exit()
+    logger.info(
+        f"Fichier d'index de recherche du site : {local_source_index_file}, "
+        f"{convert_octets(local_source_index_file.stat().st_size)}"
+    )
+
+    # no need to build the local index again if the remote one did not change
+    source_sha256 = read_local_file_metadata(local_source_index_file).get("sha256")
+    if (
+        source_sha256
+        and local_metadata_file.exists()
+        and args.local_index_file.exists()
+        and read_local_file_metadata(args.local_index_file).get("source_sha256")
+        == source_sha256
+    ):
+        if is_file_older_than(local_source_index_file, args.expiration_rotating_hours):
+            logger.info(
+                f"Remote search index ({args.remote_index_file}) has not been "
+                "revalidated yet (in background or offline). Lets keep the local "
+                f"index ({args.local_index_file}) until it is."
+            )
+            return None
+
+        logger.info(
+            f"Remote search index ({args.remote_index_file}) did not change since "
+            f"the local index ({args.local_index_file}) was built. Lets keep it."
+        )
+        args.local_index_file.touch()
+        if local_binary_index_file.exists():
+            local_binary_index_file.touch()
+        return None
+
+    # filtre les contenus qui ne sont ni des articles, ni des revues de presse. Les
+    # documents sont lus au fil de l'indexation : seules leurs métadonnées (sans le
+    # texte) sont gardées pour les écrire ensuite.
+    contents_metadata_listing: list[MkdocsSearchDocument] = []
+
+    def iter_contents_listing() -> Iterator[MkdocsSearchDocument]:
+        for document in filter_content_listing(local_source_index_file):
+            contents_metadata_listing.append(
+                {
+                    "location": document.get("location"),
+                    "title": document.get("title"),
+                    "tags": document.get("tags"),
+                }
+            )
+            yield document
+
+    with console.status("Génère l'index de recherche local...", spinner="earth"):
+        index_settings = dict(
+            input_documents_to_index=iter_contents_listing(),
+            index_ref_id="location",
+            index_configuration={"lang": "fr"},
+            index_fieds_definition=[
+                dict(field_name="title", boost=10),
+                dict(field_name="tags", boost=5),
+                dict(field_name="text"),
+            ],
+        )
+        # build index from contents listing
+        if args.opt_incremental_index:
+            # only analyze documents added or modified since the previous build
+            idx = build_index_incrementally(
+                **index_settings,
+                analysis_cache_path=local_analysis_cache_file,
+                max_workers=args.index_workers,
+            )
+        else:
+            idx = generate_index_from_docs(
+                **index_settings, max_workers=args.index_workers
+            )
+
+    write_contents_metadata(
+        contents_listing=contents_metadata_listing, output_path=local_metadata_file
+    )
+
+    # export into a JSON file for next time
+    with atomic_write(args.local_index_file) as fd:
+        fd.write(orjson.dumps(idx.serialize()))
+
+    write_binary_index(
+        idx=idx,
+        output_path=local_binary_index_file,
+        doc_attributes=get_content_attributes,
+    )
+
+    # keep track of the downloaded file used to build the index
+    write_local_file_metadata(
+        local_file_path=args.local_index_file,
+        metadata={"source_sha256": source_sha256},
+    )
+
+    logger.info(
+        f"Local index generated into {args.local_index_file} "
+        f"({local_binary_index_file}) with contents metadata ({local_metadata_file})."
+    )
+
+    # search in the binary index, like next times
+    return ContentsMetadataReader(local_metadata_file), load_binary_index(
+        local_binary_index_file
+    )
+
+
+def load_local_index(
+    args: argparse.Namespace,
+) -> tuple[ContentsMetadataReader, Index]:
+    """Get the contents metadata and the local index, refreshing them if needed.
+
+    Args:
+        args (argparse.Namespace): arguments passed to the subcommand (remote and \
+            local index files, expiration, incremental build)
+
+    Returns:
+        tuple[ContentsMetadataReader, Index]: contents metadata and local index
+    """
+    args.local_index_file.parent.mkdir(parents=True, exist_ok=True)
+
+    # search index downloaded from the website
+    local_source_index_file = Path(
+        args.local_index_file.parent / "mkdocs_search_index.json"
+    )
+    # local metadata (title, tags, date, type) of the indexed contents
+    local_metadata_file = Path(
+        args.local_index_file.parent / "site_content_metadata.bin"
+    )
+    # local binary index file, written alongside the JSON one
+    local_binary_index_file = args.local_index_file.with_suffix(".bin")
+    # cache of documents analyses, used to rebuild the index incrementally
+    local_analysis_cache_file = Path(
+        args.local_index_file.parent / "site_search_analysis.json"
+    )
+
+    # check local file index
+    new_local_index = None
+    if is_local_index_outdated(args):
+        # only one process refreshes the index, the others wait and reuse it
+        with file_lock(args.local_index_file):
+            new_local_index = update_local_index(
+                args=args,
+                local_source_index_file=local_source_index_file,
+                local_metadata_file=local_metadata_file,
+                local_binary_index_file=local_binary_index_file,
+                local_analysis_cache_file=local_analysis_cache_file,
+            )
+
+    if new_local_index is not None:
+        return new_local_index
+
+    # load contents metadata, generated again from the website search index if the
+    # local index has been built by a previous version
+    try:
+        contents_metadata = ContentsMetadataReader(local_metadata_file)
+    except (OSError, ValueError) as err:
+        logger.warning(
+            f"Unable to load the contents metadata {local_metadata_file}, generate it "
+            f"again from {local_source_index_file}. Trace: {err}"
+        )
+        with file_lock(args.local_index_file):
+            write_contents_metadata(
+                contents_listing=filter_content_listing(local_source_index_file),
+                output_path=local_metadata_file,
+            )
+        contents_metadata = ContentsMetadataReader(local_metadata_file)
+
+    # load previously built index
+    logger.info(
+        f"Local index file ({args.local_index_file}) exists and is not "
+        f"older than {args.expiration_rotating_hours} hour(s). "
+        "Lets use it to perform search."
+    )
+    idx = None
+    if (
+        local_binary_index_file.exists()
+        and local_binary_index_file.stat().st_mtime
+        >= args.local_index_file.stat().st_mtime
+    ):
+        try:
+            idx = load_binary_index(local_binary_index_file)
+        except ValueError as err:
+            logger.warning(
+                f"Unable to load the binary index {local_binary_index_file}, "
+                f"fallback to JSON. Trace: {err}"
+            )
+
+    if idx is None:
+        with args.local_index_file.open("rb") as fd:
+            serialized_idx = orjson.loads(fd.read())
+        idx = Index.load(serialized_idx)
+        # write the binary index to use it next time
+        write_binary_index(
+            idx=idx,
+            output_path=local_binary_index_file,
+            doc_attributes=get_content_attributes,
+        )
+
+    return contents_metadata, idx
+
+
+def restrict_index(idx: BinaryIndex, args: argparse.Namespace) -> BinaryIndex:
+    """Restrict a binary index to the contents matching the type and dates filters.
+
+    Args:
+        idx (BinaryIndex): local binary index
+        args (argparse.Namespace): arguments passed to the subcommand (filters)
+
+    Returns:
+        BinaryIndex: restricted index
+    """
+    return idx.restrict(
+        doc_types=(
+            (CONTENT_TYPES.index(args.filter_type),) if args.filter_type else None
+        ),
+        # start date is excluded, end date included
+        date_min=(
+            args.filter_date_start.toordinal() + 1
+            if isinstance(args.filter_date_start, date)
+            else None
+        ),
+        date_max=(
+            args.filter_date_end.toordinal()
+            if isinstance(args.filter_date_end, date)
+            else None
+        ),
+    )
+
+
+def enrich_search_results(
+    search_results: Iterable[dict],
+    contents_metadata: ContentsMetadataReader,
+    args: argparse.Namespace,
+    apply_filters: bool = True,
+) -> tuple[list[dict], int]:
+    """Enrich and filter search results until the requested number is reached.
+
+    Args:
+        search_results (Iterable[dict]): search results (ref and score), sorted by \
+            score
+        contents_metadata (ContentsMetadataReader): contents metadata, used to \
+            enrich results with titles and tags
+        args (argparse.Namespace): arguments passed to the subcommand (filters and \
+            results number)
+        apply_filters (bool, optional): apply type and dates filters. Set it to \
+            False if results come from an index restricted with the same filters. \
+            Defaults to True.
+
+    Returns:
+        tuple[list[dict], int]: final results and count of results ignored by filters
+    """
+    results_limit: int | None = args.results_number if args.results_number > 0 else None
+
+    # résultats : enrichissement et filtre
+    count_ignored_results = 0
+    # ids of the pages already in results, computed at index time
+    seen_parent_ids: set = set()
+    final_results: list[dict] = []
+
+    for result in search_results:
+        # type et date pré-calculés lors de la génération de l'index
+        content_metadata = contents_metadata.get(result.get("ref")) or {}
+
+        # filter on content type
+        if (
+            apply_filters
+            and args.filter_type
+            and content_metadata.get("type") != args.filter_type
+        ):
+            logger.debug(
+                f"Résultat ignoré par le filtre {args.filter_type}: {result.get('ref')}"
+            )
+            count_ignored_results += 1
+            continue
+
+        # filtrer les contenus qui ne correspondent pas aux années sélectionnées
+        rezult_date = content_metadata.get("date")
+        if (
+            apply_filters
+            and isinstance(args.filter_date_start, date)
+            and not is_more_recent(
+                date_ref=args.filter_date_start, date_to_compare=rezult_date
+            )
+        ):
+            logger.info(
+                f"Résultat {result.get('ref')} ignoré car plus ancien "
+                f"({rezult_date}) que la date minimum {args.filter_date_start}"
+            )
+            count_ignored_results += 1
+            continue
+        elif (
+            apply_filters
+            and isinstance(args.filter_date_end, date)
+            and is_more_recent(
+                date_ref=args.filter_date_end, date_to_compare=rezult_date
+            )
+        ):
+            logger.info(
+                f"Résultat {result.get('ref')} ignoré car plus récent "
+                f"({rezult_date}) que la date maximum {args.filter_date_end}."
+            )
+            count_ignored_results += 1
+            continue
+
+        # results are sorted by score: the first section of a page is the best one
+        parent_id = content_metadata.get("parent_id", result.get("ref").split("#")[0])
+        if (
+            args.opt_merge_unique_url
+            and content_metadata.get("type") == "article"
+            and "#" in result.get("ref")
+            and parent_id in seen_parent_ids
+        ):
+            logger.info(
+                f"Résultat {result.get('ref')} ignoré car il s'agit d'une "
+                f"sous-partie ({result.get('ref').split('#')[1]}) d'un article déjà "
+                "présent dans les résultats."
+            )
+            count_ignored_results += 1
+            continue
+
+        seen_parent_ids.add(parent_id)
+
+        # crée un résultat de sortie
+        out_result = {
+            "type": (
+                "Article" if content_metadata.get("type") == "article" else "GeoRDP"
+            ),
+            "date": rezult_date,
+            "score": f"{result.get('score'):.3}",
+            "url": f"{defaults_settings.site_base_url}{result.get('ref')}",
+            "titre": content_metadata.get("title"),
+            "tags": content_metadata.get("tags"),
+        }
+
+        final_results.append(out_result)
+        if results_limit is not None and len(final_results) >= results_limit:
+            break
+
+    return final_results, count_ignored_results
+
+
+def search_contents(
+    idx: Index, contents_metadata: ContentsMetadataReader, args: argparse.Namespace
+) -> tuple[list[dict], int, int]:
+    """Perform the search in the index then enrich and filter results.
+
+    With a binary index, type and dates filters are applied to the documents \
+        attributes before scoring: filtered out contents are neither scored nor \
+        enriched, but they are counted in search results and as ignored results. \
+        Results are then sorted lazily and enriched only until the requested number \
+        of results is reached. If nothing matches, even without filters, the search \
+        is performed again with approximate terms: index terms starting with or \
+        close to (typos) the searched ones.
+
+    Args:
+        idx (Index): local index
+        contents_metadata (ContentsMetadataReader): contents metadata, used to \
+            enrich results with titles and tags
+        args (argparse.Namespace): arguments passed to the subcommand (search term \
+            and filters)
+
+    Returns:
+        tuple[list[dict], int, int]: final results, count of search results and \
+            count of results ignored by filters
+    """
+    is_restricted = False
+    count_filtered_results = 0
+    if isinstance(idx, BinaryIndex):
+        # best results are selected first, the next ones only if some are ignored
+        results_limit = args.results_number if args.results_number > 0 else None
+        restricted_idx = restrict_index(idx=idx, args=args)
+        is_restricted = restricted_idx is not idx
+        search_results, count_kept_results, count_search_results = (
+            restricted_idx.iter_search(args.search_term, k=results_limit)
+        )
+        if not count_search_results and args.opt_fuzzy:
+            logger.info(
+                f"Aucun résultat pour {args.search_term}, recherche approchante "
+                "(début de mot, fautes de frappe)."
+            )
+            search_results, count_kept_results, count_search_results = (
+                restricted_idx.iter_search(
+                    args.search_term, is_approximate=True, k=results_limit
+                )
+            )
+        # matching contents left out by the restricted index
+        count_filtered_results = count_search_results - count_kept_results
+    else:
+        search_results = idx.search(args.search_term)
+        count_search_results = len(search_results)
+
+    final_results, count_ignored_results = enrich_search_results(
+        search_results=search_results,
+        contents_metadata=contents_metadata,
+        args=args,
+        apply_filters=not is_restricted,
+    )
+
+    return (
+        final_results,
+        count_search_results,
+        count_ignored_results + count_filtered_results,
+    )
+
+
+def decode_search_response(search_response: dict) -> tuple[list[dict], int, int]:
+    """Get the results of a search performed by the search daemon or read from the \
+        query cache, where dates are serialized as ISO strings (null for the \
+        contents without date).
+
+    Args:
+        search_response (dict): search response, with results and counts
+
+    Returns:
+        tuple[list[dict], int, int]: final results, count of search results and \
+            count of results ignored by filters, as returned by search_contents
+    """
+    final_results = [
+        {
+            **rezult,
+            "date": (
+                date.fromisoformat(rezult.get("date"))
+                if isinstance(rezult.get("date"), str)
+                else None
+            ),
+        }
+        for rezult in search_response.get("results", [])
+    ]
+
+    return (
+        final_results,
+        search_response.get("count_search_results", 0),
+        search_response.get("count_ignored_results", 0),
+    )
+
+
 # ############################################################################
 # ########## CLI #################
 # ################################
@@ -140,9 +719,24 @@ def parser_search_content(
         help="Terme de recherche. Accepte les filtres sur les champs indexés : tags ou "
         "title. Exemple : 'ubuntu title:qgis'",
         metavar="search-term",
+        nargs="?",
         type=str,
     )
 
+    subparser.add_argument(
+        "--batch",
+        default=None,
+        dest="batch_file",
+        help="Fichier de requêtes à exécuter avec un seul chargement de l'index ('-' "
+        "pour l'entrée standard). Une requête par ligne : un terme de recherche ou un "
+        "objet JSON avec le terme (search_term) et les options à modifier (filter_type, "
+        "filter_date_start, filter_date_end, opt_merge_unique_url, opt_fuzzy, "
+        "results_number). "
+        "Les résultats sont écrits en JSON, une ligne par requête.",
+        metavar="FICHIER",
+        type=argparse.FileType(mode="r", encoding="UTF-8"),
+    )
+
     subparser.add_argument(
         "-r",
         "--remote-index-file",
@@ -240,6 +834,59 @@ def parser_search_content(
         "donc potentiellement donc différentes sections d'un même article.",
     )
 
+    subparser.add_argument(
+        "--no-fuzzy",
+        default=str2bool(getenv("GEOTRIBU_SEARCH_FUZZY", True)),
+        action="store_false",
+        dest="opt_fuzzy",
+        help="Désactive la recherche approchante (début de mot, fautes de frappe) "
+        "effectuée quand la recherche exacte ne donne aucun résultat.",
+    )
+
+    subparser.add_argument(
+        "--no-incremental",
+        default=str2bool(getenv("GEOTRIBU_CONTENUS_INDEX_INCREMENTAL", True)),
+        action="store_false",
+        dest="opt_incremental_index",
+        help="Désactive la reconstruction incrémentale de l'index local : tous les "
+        "contenus sont de nouveau analysés, et pas seulement les nouveaux ou modifiés.",
+    )
+
+    subparser.add_argument(
+        "--index-workers",
+        default=getenv(
+            "GEOTRIBU_CONTENUS_INDEX_WORKERS",
+            # frozen builds (PyInstaller): no processes pool by default
+            1 if getattr(sys, "frozen", False) else cpu_count() or 1,
+        ),
+        dest="index_workers",
+        help="Nombre maximal de processus utilisés pour analyser les contenus lors de "
+        "la génération de l'index local. Par défaut : nombre de processeurs (1 pour "
+        "l'exécutable autonome).",
+        metavar="GEOTRIBU_CONTENUS_INDEX_WORKERS",
+        type=int,
+    )
+
+    subparser.add_argument(
+        "--no-cache",
+        default=str2bool(getenv("GEOTRIBU_SEARCH_QUERY_CACHE", True)),
+        action="store_false",
+        dest="opt_query_cache",
+        help="Désactive le cache des résultats de recherche : la recherche est "
+        "toujours effectuée dans l'index.",
+    )
+
+    subparser.add_argument(
+        "-i",
+        "--interactive",
+        default=str2bool(getenv("GEOTRIBU_SEARCH_INTERACTIVE", False)),
+        action="store_true",
+        dest="opt_interactive",
+        help="Recherche interactive : les résultats sont mis à jour à chaque touche "
+        "tapée, tous les mots étant requis et le dernier pouvant être un début de mot. "
+        "Entrée ouvre le résultat sélectionné, Échap quitte.",
+    )
+
     subparser.add_argument(
         "--no-prompt",
         default=str2bool(getenv("GEOTRIBU_PROMPT_AFTER_SEARCH", True)),
@@ -258,118 +905,202 @@ def parser_search_content(
 # ################################
 
 
+def run_interactive(args: argparse.Namespace):
+    """Search contents as the user types then open the selected result.
+
+    Args:
+        args (argparse.Namespace): arguments passed to the subcommand
+    """
+    if not sys.stdin.isatty():
+        sys.exit("La recherche interactive nécessite un terminal.")
+
+    contents_metadata, idx = load_local_index(args)
+    if not isinstance(idx, BinaryIndex):
+        idx = load_binary_index(args.local_index_file.with_suffix(".bin"))
+    incremental_search = IncrementalSearch(restrict_index(idx=idx, args=args))
+
+    def search(text: str) -> tuple[list[dict], int]:
+        search_results, count_search_results = incremental_search.iter_search(text)
+        final_results, _ = enrich_search_results(
+            search_results=search_results,
+            contents_metadata=contents_metadata,
+            args=args,
+            apply_filters=False,
+        )
+        return final_results, count_search_results
+
+    def render(
+        text: str, final_results: list[dict], results_total: int, selected: int
+    ) -> Table:
+        table = format_output_result_search_content(
+            result=final_results,
+            search_term=text,
+            format_type="table",
+            count=args.results_number,
+            results_total=results_total,
+            search_filter_dates=(args.filter_date_start, args.filter_date_end),
+            search_filter_type=args.filter_type,
+        )
+        if final_results:
+            table.rows[selected].style = "reverse"
+        return table
+
+    search_term, result_to_open = run_interactive_search(
+        search=search,
+        render=render,
+        console=console,
+        initial_text=args.search_term or "",
+    )
+    if result_to_open is None:
+        return
+
+    # save into history
+    CliHistory().dump(
+        cmd_name=__name__.split(".")[-1],
+        results_to_dump=[result_to_open],
+        request_performed=search_term,
+    )
+
+    open_content(
+        content_uri=result_to_open.get("url"),
+        application=getenv("GEOTRIBU_OPEN_WITH", "shell"),
+    )
+
+
 def run(args: argparse.Namespace):
     """Run the sub command logic.
 
-    There are 2 files involved (names can vary):
+    There are several files involved (names can vary):
 
-    - `site_content_listing.json`: the downloaded file from the website which is \
-        just a listing of contents
+    - `mkdocs_search_index.json`: the search index downloaded from the website, \
+        revalidated with the remote server (ETag, Last-Modified) when outdated.
+    - `site_content_metadata.bin`: title, tags, date and type of the contents \
+        filtered out from the downloaded file, memory-mapped to enrich results.
     - `site_search_index.json` (= args.local_index_file): the file with the indexed \
-        contents with lunr built locally from the listing file.
+        contents with lunr built locally from the filtered contents.
+    - `site_search_index.bin`: the same index in a compact binary format, \
+        memory-mapped to perform the search without parsing the JSON.
+    - `site_search_analysis.json`: the text processing output of every document, \
+        used to only analyze new or modified documents when the index is rebuilt.
 
     Process:
 
     #. Check if the local index file exists and is up to date
     #. If not:
-        #. Download the website contents listing from remote
-        #. Generate a local index from the contents listing
-    #. Load the local index
+        #. Download (or revalidate) the website search index from remote
+        #. If it didn't change since the local index was built, just keep it
+        #. Else generate a local index from the contents listing, incrementally by \
+            default
+    #. Load the local index, from the binary file if it's up to date
     #. Perform the search
 
+    If a search daemon is running, the search is forwarded to it and its warm \
+        in-memory index is used instead. Results of a query already performed on the \
+        same index are read from the query cache (`query_cache` folder).
+
+    In batch mode, the local index is loaded once then every query of the batch file \
+        is performed against it. In interactive mode, it's loaded once then searched \
+        on each keystroke.
+
     Args:
         args (argparse.Namespace): arguments passed to the subcommand
     """
     logger.debug(f"Running {args.command} with {args}")
 
-    # local vars
-    history = CliHistory()
-    args.local_index_file.parent.mkdir(parents=True, exist_ok=True)
-
-    #  local contents listing file
-    local_listing_file = Path(
-        args.local_index_file.parent / "site_content_listing.json"
-    )
-
-    # check local file index
-    if not args.local_index_file.exists() or is_file_older_than(
-        args.local_index_file, args.expiration_rotating_hours
-    ):
-        # if the local index doesn't exist or exists but it's outdated: download the
-        # index from website
-        with console.status(
-            "Téléchargement de l'index des contenus depuis le site...", spinner="earth"
-        ):
-            get_local_contents_listing = download_remote_file_to_local(
-                remote_url_to_download=args.remote_index_file,
-                local_file_path=args.local_index_file,
-                expiration_rotating_hours=args.expiration_rotating_hours,
-            )
-        if not isinstance(get_local_contents_listing, Path):
-            logger.error(
-                f"Le téléchargement du fichier distant {args.remote_index_file} "
-                f"ou la récupération du fichier local {args.local_index_file} a échoué."
-            )
-            if isinstance(get_local_contents_listing, Exception):
-                logger.error(get_local_contents_listing)
-            sys.exit()
-        logger.info(
-            f"Fichier d'index de recherche local : {args.local_index_file}, "
-            f"{convert_octets(args.local_index_file.stat().st_size)}"
-        )
-
-        # filtre les contenus qui ne sont ni des articles, ni des revues de presse
-        contents_listing = tuple(filter_content_listing(args.local_index_file))
-        with local_listing_file.open(mode="wb") as fd:
-            fd.write(orjson.dumps(contents_listing))
+    if args.batch_file is not None:
+        contents_metadata, idx = load_local_index(args)
 
-        with console.status("Génère l'index de recherche local...", spinner="earth"):
-            # build index from contents listing
-            idx = generate_index_from_docs(
-                input_documents_to_index=tuple(contents_listing),
-                index_ref_id="location",
-                index_configuration={"lang": "fr"},
-                index_fieds_definition=[
-                    dict(field_name="title", boost=10),
-                    dict(field_name="tags", boost=5),
-                    dict(field_name="text"),
-                ],
+        def search_batch_query(query_args: argparse.Namespace) -> dict:
+            (
+                final_results,
+                count_search_results,
+                count_ignored_results,
+            ) = search_contents(
+                idx=idx, contents_metadata=contents_metadata, args=query_args
             )
+            return {
+                "results": final_results,
+                "count_search_results": count_search_results,
+                "count_ignored_results": count_ignored_results,
+            }
 
-        # save it as JSON file for next time
-        serialized_idx = idx.serialize()
-
-        # export into a JSON file
-        args.local_index_file.unlink(missing_ok=True)
+        if run_batch(
+            args=args,
+            search=search_batch_query,
+            query_args_names=search_content_batch_args_names,
+        ):
+            sys.exit(1)
+        return
 
-        with args.local_index_file.open(mode="wb") as fd:
-            # json.dump(serialized_idx, fd, separators=(",", ":"))
-            fd.write(orjson.dumps(serialized_idx))
+    if args.opt_interactive:
+        run_interactive(args)
+        return
 
-        logger.info(
-            f"Local index generated into {args.local_index_file} "
-            f"from contents listing ({local_listing_file})."
+    if not args.search_term:
+        sys.exit(
+            "Un terme de recherche ou un fichier de requêtes (--batch) est requis."
         )
-    else:
-        # load
-        with local_listing_file.open("rb") as fd:
-            contents_listing = orjson.loads(fd.read())
 
-        # load previously built index
-        logger.info(
-            f"Local index file ({args.local_index_file}) exists and is not "
-            f"older than {args.expiration_rotating_hours} hour(s). "
-            "Lets use it to perform search."
+    # local vars
+    history = CliHistory()
+
+    query_cache = QueryCache(cache_folder=args.local_index_file.parent / "query_cache")
+    query_filters = {
+        "filter_type": args.filter_type,
+        "filter_date_start": args.filter_date_start,
+        "filter_date_end": args.filter_date_end,
+        "opt_merge_unique_url": args.opt_merge_unique_url,
+        "opt_fuzzy": args.opt_fuzzy,
+        "results_number": args.results_number,
+    }
+
+    # perform the search: from the search daemon, the query cache or local files
+    search_response = query_search_daemon(
+        command="search-content", args=args, args_names=search_content_args_names
+    )
+    # the key depends on the local index file: results are the ones of the index as
+    # it is, even while it's revalidated
+    if search_response is None and args.opt_query_cache:
+        search_response = query_cache.get(
+            QueryCache.get_key(
+                index_file=args.local_index_file,
+                query=args.search_term,
+                filters=query_filters,
+            )
         )
-        with args.local_index_file.open("rb") as fd:
-            serialized_idx = orjson.loads(fd.read())
-        idx = Index.load(serialized_idx)
 
-    # recherche
-    with console.status(f"Recherche {args.search_term}...", spinner="earth"):
-        search_results: list[dict] = idx.search(args.search_term)
+    if search_response is not None:
+        (
+            final_results,
+            count_search_results,
+            count_ignored_results,
+        ) = decode_search_response(search_response)
+    else:
+        contents_metadata, idx = load_local_index(args)
+
+        # recherche
+        with console.status(f"Recherche {args.search_term}...", spinner="earth"):
+            (
+                final_results,
+                count_search_results,
+                count_ignored_results,
+            ) = search_contents(idx=idx, contents_metadata=contents_metadata, args=args)
+
+        if args.opt_query_cache:
+            query_cache.set(
+                key=QueryCache.get_key(
+                    index_file=args.local_index_file,
+                    query=args.search_term,
+                    filters=query_filters,
+                ),
+                value={
+                    "results": final_results,
+                    "count_search_results": count_search_results,
+                    "count_ignored_results": count_ignored_results,
+                },
+            )
 
-    if not len(search_results):
+    if not count_search_results:
         console.print(
             f":person_shrugging: Aucun contenu trouvé pour : {args.search_term}"
             "\nRéessayer en utilisant des paramètres de recherche moins stricts. "
@@ -377,95 +1108,6 @@ def run(args: argparse.Namespace):
         )
         sys.exit(0)
 
-    # résultats : enrichissement et filtre
-    count_ignored_results = 0
-    unique_ref: list = []
-    with console.status(
-        f"Enrichissement des {len(search_results)} résultats...", spinner="earth"
-    ):
-        final_results: list[dict] = []
-
-        for result in search_results:
-            # filter on content type
-            if args.filter_type == "article" and not result.get("ref").startswith(
-                "articles/"
-            ):
-                logger.debug(
-                    f"Résultat ignoré par le filtre {args.filter_type}: {result.get('ref')}"
-                )
-                count_ignored_results += 1
-                continue
-            elif args.filter_type == "rdp" and not result.get("ref").startswith("rdp/"):
-                logger.debug(
-                    f"Résultat ignoré par le filtre {args.filter_type}: {result.get('ref')}"
-                )
-                count_ignored_results += 1
-                continue
-            else:
-                pass
-
-            # filtrer les contenus qui ne correspondent pas aux années sélectionnées
-            rezult_date = get_date_from_content_location(result.get("ref"))
-            if isinstance(args.filter_date_start, date) and not is_more_recent(
-                date_ref=args.filter_date_start, date_to_compare=rezult_date
-            ):
-                logger.info(
-                    f"Résultat {result.get('ref')} ignoré car plus ancien "
-                    f"({rezult_date}) que la date minimum {args.filter_date_start}"
-                )
-                count_ignored_results += 1
-                continue
-            elif isinstance(args.filter_date_end, date) and is_more_recent(
-                date_ref=args.filter_date_end, date_to_compare=rezult_date
-            ):
-                logger.info(
-                    f"Résultat {result.get('ref')} ignoré car plus récent "
-                    f"({rezult_date}) que la date maximum {args.filter_date_end}."
-                )
-                count_ignored_results += 1
-                continue
-
-            if (
-                args.opt_merge_unique_url
-                and result.get("ref").startswith("articles/")
-                and "#" in result.get("ref")
-                and result.get("ref").split("#")[0] in unique_ref
-            ):
-                logger.info(
-                    f"Résultat {result.get('ref')} ignoré car il s'agit d'une "
-                    f"sous-partie ({result.get('ref').split('#')[1]}) d'un article déjà "
-                    "présent dans les résultats."
-                )
-                count_ignored_results += 1
-                continue
-
-            unique_ref.append(result.get("ref").split("#")[0])
-
-            # crée un résultat de sortie
-            out_result = {
-                "type": (
-                    "Article" if result.get("ref").startswith("articles/") else "GeoRDP"
-                ),
-                "date": rezult_date,
-                "score": f"{result.get('score'):.3}",
-                "url": f"{defaults_settings.site_base_url}{result.get('ref')}",
-            }
-
-            final_results.append(out_result)
-
-        final_urls = [rez.get("url") for rez in final_results]
-        matched_docs = {
-            f"{defaults_settings.site_base_url}{c.get('location')}": (
-                c.get("title"),
-                c.get("tags"),
-            )
-            for c in contents_listing
-            if f"{defaults_settings.site_base_url}{c.get('location')}" in final_urls
-        }
-
-        for rezult in final_results:
-            rezult["titre"], rezult["tags"] = matched_docs.get(rezult.get("url"))
-
     # formatage de la sortie
     if len(final_results):
         console.print(
@@ -474,6 +1116,7 @@ def run(args: argparse.Namespace):
                 search_term=args.search_term,
                 format_type=args.format_output,
                 count=args.results_number,
+                results_total=count_search_results,
                 search_filter_dates=(args.filter_date_start, args.filter_date_end),
                 search_filter_type=args.filter_type,
             )
@@ -481,7 +1124,7 @@ def run(args: argparse.Namespace):
     else:
         console.print(
             f":person_shrugging: Aucun contenu trouvé pour : {args.search_term} parmi "
-            f"les {len(search_results)} résultats de recherche. "
+            f"les {count_search_results} résultats de recherche. "
             f"{count_ignored_results} résultats ignorés par les filtres (type, dates)..."
         )
         sys.exit(0)
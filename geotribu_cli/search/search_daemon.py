@@ -0,0 +1,430 @@
+#! python3  # noqa: E265
+
+"""Search daemon: keeps contents and images indexes loaded in memory and answers
+the search-content and search-image subcommands over a local Unix socket.
+
+Opt-in: it runs only once started with the search-daemon subcommand. When its
+socket exists, search subcommands forward their search term and filters to it and
+fall back to the local files if it doesn't answer. Not available on systems without
+Unix sockets support (Windows).
+
+Protocol: one JSON object per line, a request then its response.
+"""
+
+# ############################################################################
+# ########## IMPORTS #############
+# ################################
+
+# standard library
+import argparse
+import logging
+import socket
+import socketserver
+import sys
+from collections.abc import Iterable
+from datetime import date
+from os import getenv, umask
+from pathlib import Path
+from threading import Thread
+from types import ModuleType
+
+# 3rd party
+import orjson
+
+# package
+from geotribu_cli.console import console
+from geotribu_cli.constants import GeotribuDefaults
+from geotribu_cli.utils.file_downloader import get_running_revalidations
+from geotribu_cli.utils.file_stats import is_file_older_than
+
+# ############################################################################
+# ########## GLOBALS #############
+# ################################
+
+logger = logging.getLogger(__name__)
+defaults_settings = GeotribuDefaults()
+
+# Unix sockets are not available on every platform
+IS_DAEMON_SUPPORTED: bool = hasattr(socket, "AF_UNIX")
+
+# arguments to convert back when decoding a request
+_PATH_ARGS: tuple[str, ...] = ("local_index_file",)
+_DATE_ARGS: tuple[str, ...] = ("filter_date_start", "filter_date_end")
+
+# ############################################################################
+# ########## FUNCTIONS ###########
+# ################################
+
+
+def get_daemon_socket_path() -> Path:
+    """Get the path to the daemon socket, from the environment variable \
+        GEOTRIBU_SEARCH_DAEMON_SOCKET or in the working folder.
+
+    Returns:
+        Path: path to the Unix socket
+    """
+    return Path(
+        getenv(
+            "GEOTRIBU_SEARCH_DAEMON_SOCKET",
+            defaults_settings.geotribu_working_folder.joinpath(
+                "search/search_daemon.sock"
+            ),
+        )
+    )
+
+
+def send_daemon_request(
+    request: dict, socket_path: Path | None = None, timeout: float = 120
+) -> dict | None:
+    """Send a request to the daemon and return its response.
+
+    Args:
+        request (dict): request to send
+        socket_path (Path | None, optional): path to the daemon socket. Defaults to \
+            None (get_daemon_socket_path()).
+        timeout (float, optional): timeout in seconds. Generous since the daemon may \
+            have to refresh an outdated index first. Defaults to 120.
+
+    Returns:
+        dict | None: response or None if no daemon answered
+    """
+    if not IS_DAEMON_SUPPORTED:
+        return None
+
+    if socket_path is None:
+        socket_path = get_daemon_socket_path()
+    if not socket_path.exists():
+        return None
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(timeout)
+            client.connect(str(socket_path))
+            client.sendall(orjson.dumps(request, default=str) + b"\n")
+            with client.makefile(mode="rb") as response_stream:
+                response = response_stream.readline()
+        return orjson.loads(response)
+    except (OSError, orjson.JSONDecodeError) as err:
+        logger.debug(f"Search daemon ({socket_path}) did not answer. Trace: {err}")
+        return None
+
+
+def query_search_daemon(
+    command: str, args: argparse.Namespace, args_names: Iterable[str]
+) -> dict | None:
+    """Forward a search to the daemon, if it's running.
+
+    Args:
+        command (str): search subcommand name (search-content or search-image)
+        args (argparse.Namespace): arguments passed to the subcommand
+        args_names (Iterable[str]): names of the arguments to forward
+
+    Returns:
+        dict | None: daemon response with results, or None if the search must be \
+            performed locally
+    """
+    response = send_daemon_request(
+        request={
+            "command": command,
+            "args": {arg_name: getattr(args, arg_name) for arg_name in args_names},
+        }
+    )
+    if response is None:
+        return None
+
+    if "error" in response:
+        logger.warning(
+            f"Le démon de recherche a renvoyé une erreur, la recherche est effectuée "
+            f"localement. Trace : {response.get('error')}"
+        )
+        return None
+
+    logger.info(f"Search performed by the search daemon ({get_daemon_socket_path()}).")
+    return response
+
+
+def get_search_module(command: str) -> ModuleType:
+    """Get the module of a search subcommand.
+
+    Args:
+        command (str): search subcommand name (search-content or search-image)
+
+    Raises:
+        ValueError: if the command is not a search subcommand
+
+    Returns:
+        ModuleType: search subcommand module
+    """
+    # imported here since search subcommands import this module
+    if command == "search-content":
+        from geotribu_cli.search import search_content
+
+        return search_content
+    elif command == "search-image":
+        from geotribu_cli.search import search_image
+
+        return search_image
+
+    raise ValueError(f"Unknown search command: {command}")
+
+
+def decode_request_args(request_args: dict) -> argparse.Namespace:
+    """Convert arguments received from a client back into a namespace.
+
+    Args:
+        request_args (dict): arguments as serialized by the client
+
+    Returns:
+        argparse.Namespace: arguments as the search subcommands expect them
+    """
+    decoded_args = dict(request_args)
+    for arg_name in _PATH_ARGS:
+        if decoded_args.get(arg_name):
+            decoded_args[arg_name] = Path(decoded_args.get(arg_name))
+    for arg_name in _DATE_ARGS:
+        if decoded_args.get(arg_name):
+            decoded_args[arg_name] = date.fromisoformat(decoded_args.get(arg_name))
+
+    return argparse.Namespace(**decoded_args)
+
+
+# ############################################################################
+# ########## CLASSES #############
+# ################################
+
+
+class SearchIndexes:
+    """Indexes loaded in memory, reloaded when their local file changes or expires."""
+
+    def __init__(self):
+        """Class initialization."""
+        # (command, local index file) -> (file modification time, loaded index)
+        self._loaded: dict[tuple[str, str], tuple[float, tuple]] = {}
+
+    def get(self, command: str, args: argparse.Namespace) -> tuple:
+        """Get a loaded index, (re)loading it if needed.
+
+        Args:
+            command (str): search subcommand name
+            args (argparse.Namespace): search arguments
+
+        Returns:
+            tuple: loaded index, as returned by load_local_index of the subcommand
+        """
+        key = (command, str(args.local_index_file))
+        loaded = self._loaded.get(key)
+        if (
+            loaded is None
+            or not args.local_index_file.exists()
+            or args.local_index_file.stat().st_mtime != loaded[0]
+            or (
+                is_file_older_than(
+                    args.local_index_file, args.expiration_rotating_hours
+                )
+                # stale index kept until the background revalidation of its files ends
+                and not any(
+                    local_file_path.parent == args.local_index_file.parent
+                    for local_file_path in get_running_revalidations()
+                )
+            )
+        ):
+            if loaded is not None:
+                # release the memory mappings before the files are written again
+                del self._loaded[key]
+                for store in loaded[1]:
+                    if hasattr(store, "close"):
+                        store.close()
+            logger.info(f"Loading {command} index: {args.local_index_file}")
+            index = get_search_module(command).load_local_index(args)
+            self._loaded[key] = (args.local_index_file.stat().st_mtime, index)
+
+        return self._loaded[key][1]
+
+    def search(self, command: str, args: argparse.Namespace) -> dict:
+        """Perform a search like the corresponding subcommand does.
+
+        Args:
+            command (str): search subcommand name
+            args (argparse.Namespace): search arguments
+
+        Returns:
+            dict: response with results and counts
+        """
+        search_module = get_search_module(command)
+        if command == "search-content":
+            contents_metadata, idx = self.get(command, args)
+            (
+                final_results,
+                count_search_results,
+                count_ignored_results,
+            ) = search_module.search_contents(
+                idx=idx, contents_metadata=contents_metadata, args=args
+            )
+            return {
+                "results": final_results,
+                "count_search_results": count_search_results,
+                "count_ignored_results": count_ignored_results,
+            }
+
+        idx, images_catalog = self.get(command, args)
+        final_results, count_search_results = search_module.search_images(
+            idx=idx, images_catalog=images_catalog, args=args
+        )
+        return {"results": final_results, "count_search_results": count_search_results}
+
+
+class SearchRequestHandler(socketserver.StreamRequestHandler):
+    """Answer one JSON request per connection."""
+
+    def handle(self):
+        """Read the request, perform it and write the response."""
+        try:
+            request = orjson.loads(self.rfile.readline())
+            command = request.get("command")
+            if command == "ping":
+                response = {"status": "ok"}
+            elif command == "stop":
+                response = {"status": "stopping"}
+                # shutdown waits for the serving loop, which is running this handler
+                Thread(target=self.server.shutdown, daemon=True).start()
+            else:
+                response = self.server.indexes.search(
+                    command=command, args=decode_request_args(request.get("args", {}))
+                )
+        # the daemon must survive any failure, including sys.exit() calls
+        except (Exception, SystemExit) as err:
+            logger.error(f"Search daemon failed to answer a request. Trace: {err}")
+            response = {"error": str(err)}
+
+        self.wfile.write(orjson.dumps(response) + b"\n")
+
+
+if IS_DAEMON_SUPPORTED:
+
+    class SearchDaemonServer(socketserver.UnixStreamServer):
+        """Unix socket server holding the indexes. Requests are handled one at a \
+        time: searches take milliseconds once indexes are loaded."""
+
+        def __init__(self, socket_path: Path):
+            """Class initialization.
+
+            Args:
+                socket_path (Path): path to the Unix socket to listen on
+            """
+            self.indexes = SearchIndexes()
+            super().__init__(str(socket_path), SearchRequestHandler)
+
+        def server_bind(self):
+            """Create the socket file accessible to the current user only, right \
+            from its creation: requests can make the daemon load any local file."""
+            previous_umask = umask(0o077)
+            try:
+                super().server_bind()
+            finally:
+                umask(previous_umask)
+
+
+# ############################################################################
+# ########## CLI #################
+# ################################
+
+
+def parser_search_daemon(
+    subparser: argparse.ArgumentParser,
+) -> argparse.ArgumentParser:
+    """Set the argument parser for search-daemon subcommand.
+
+    Args:
+        subparser (argparse.ArgumentParser): parser to set up
+
+    Returns:
+        argparse.ArgumentParser: parser ready to use
+    """
+    subparser.add_argument(
+        "-s",
+        "--socket",
+        default=get_daemon_socket_path(),
+        dest="socket_path",
+        help="Emplacement du socket Unix du démon.",
+        metavar="GEOTRIBU_SEARCH_DAEMON_SOCKET",
+        type=Path,
+    )
+
+    subparser.add_argument(
+        "--stop",
+        action="store_true",
+        default=False,
+        dest="opt_stop",
+        help="Arrête le démon de recherche en cours d'exécution.",
+    )
+
+    subparser.set_defaults(func=run)
+
+    return subparser
+
+
+# ############################################################################
+# ########## MAIN ################
+# ################################
+
+
+def run(args: argparse.Namespace):
+    """Run the sub command logic.
+
+    Start the search daemon, preloading contents and images indexes with default \
+        settings, or stop the running one.
+
+    Args:
+        args (argparse.Namespace): arguments passed to the subcommand
+    """
+    logger.debug(f"Running {args.command} with {args}")
+
+    if not IS_DAEMON_SUPPORTED:
+        logger.critical(
+            "Le démon de recherche nécessite les sockets Unix, non disponibles sur "
+            f"ce système ({sys.platform})."
+        )
+        sys.exit(1)
+
+    # stop
+    if args.opt_stop:
+        if send_daemon_request({"command": "stop"}, socket_path=args.socket_path):
+            console.print(f"Démon de recherche arrêté ({args.socket_path}).")
+        else:
+            console.print(f"Aucun démon de recherche ne répond sur {args.socket_path}.")
+        sys.exit(0)
+
+    # only one daemon per socket
+    if args.socket_path.exists():
+        if send_daemon_request({"command": "ping"}, socket_path=args.socket_path):
+            logger.error(f"Un démon de recherche tourne déjà sur {args.socket_path}.")
+            sys.exit(1)
+        # remains of a daemon which has not been stopped properly
+        args.socket_path.unlink()
+    args.socket_path.parent.mkdir(parents=True, exist_ok=True)
+
+    # default settings, as used by the search subcommands
+    default_args = {
+        "search-content": get_search_module("search-content").parser_search_content(
+            argparse.ArgumentParser()
+        ),
+        "search-image": get_search_module("search-image").parser_search_image(
+            argparse.ArgumentParser()
+        ),
+    }
+
+    with SearchDaemonServer(socket_path=args.socket_path) as server:
+        # preload indexes
+        for command, search_parser in default_args.items():
+            try:
+                server.indexes.get(command, search_parser.parse_args([""]))
+            except (Exception, SystemExit) as err:
+                logger.error(f"Unable to preload {command} index. Trace: {err}")
+
+        console.print(f"Démon de recherche à l'écoute sur {args.socket_path}.")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            logger.info("Search daemon interrupted.")
+        finally:
+            args.socket_path.unlink(missing_ok=True)
@@ -8,6 +8,7 @@
 import argparse
 import logging
 import sys
+from collections.abc import Mapping, Sequence
 from os import getenv
 from pathlib import Path
 
@@ -21,8 +22,24 @@ from geotribu_cli.cli_results_rich_formatters import format_output_result_search
 from geotribu_cli.console import console
 from geotribu_cli.constants import GeotribuDefaults
 from geotribu_cli.history import CliHistory
+from geotribu_cli.search.binary_index import (
+    BinaryIndex,
+    load_binary_index,
+    write_binary_index,
+)
+from geotribu_cli.search.images_catalog import (
+    UNKNOWN_DIMENSIONS,
+    ImagesCatalogReader,
+    write_images_catalog,
+)
+from geotribu_cli.search.mdl_search import ImageDimensionsFilter
+from geotribu_cli.search.query_cache import QueryCache
+from geotribu_cli.search.search_batch import run_batch
+from geotribu_cli.search.search_daemon import query_search_daemon
 from geotribu_cli.subcommands.open_result import open_content
+from geotribu_cli.utils.file_compression import read_local_file
 from geotribu_cli.utils.file_downloader import download_remote_file_to_local
+from geotribu_cli.utils.file_stats import is_file_older_than
 from geotribu_cli.utils.formatters import convert_octets
 from geotribu_cli.utils.str2bool import str2bool
 
@@ -33,6 +50,283 @@ from geotribu_cli.utils.str2bool import str2bool
 logger = logging.getLogger(__name__)
 defaults_settings = GeotribuDefaults()
 
+# arguments forwarded to the search daemon
+search_image_args_names: tuple[str, ...] = (
+    "search_term",
+    "remote_index_file",
+    "local_index_file",
+    "expiration_rotating_hours",
+    "filter_type",
+    "filter_min_width",
+    "filter_max_width",
+    "filter_min_height",
+    "filter_max_height",
+    "filter_min_ratio",
+    "filter_max_ratio",
+    "results_number",
+)
+# arguments which can be set by each query of a batch
+search_image_batch_args_names: tuple[str, ...] = (
+    "filter_type",
+    "filter_min_width",
+    "filter_max_width",
+    "filter_min_height",
+    "filter_max_height",
+    "filter_min_ratio",
+    "filter_max_ratio",
+    "results_number",
+)
+
+# ############################################################################
+# ########## FUNCTIONS ###########
+# ################################
+
+
+def load_local_index(
+    args: argparse.Namespace,
+) -> tuple[Index, Mapping[str, tuple[int, int]]]:
+    """Get the local images index and catalog, downloading the index if needed.
+
+    The downloaded JSON file is only parsed to write the binary index and the images \
+        catalog alongside it: while they are up to date, both are memory-mapped \
+        instead.
+
+    Args:
+        args (argparse.Namespace): arguments passed to the subcommand (remote and \
+            local index files, expiration)
+
+    Returns:
+        tuple[Index, Mapping[str, tuple[int, int]]]: lunr index and images \
+            dimensions by path
+    """
+    args.local_index_file.parent.mkdir(parents=True, exist_ok=True)
+
+    with console.status("Téléchargement de la liste des images...", spinner="earth"):
+        # get local search index
+        get_or_update_local_search_index = download_remote_file_to_local(
+            remote_url_to_download=args.remote_index_file,
+            local_file_path=args.local_index_file,
+            expiration_rotating_hours=args.expiration_rotating_hours,
+            compress_at_rest=True,
+            stale_while_revalidate=True,
+        )
+    if not isinstance(get_or_update_local_search_index, Path):
+        logger.error(
+            f"Le téléchargement du fichier distant {args.remote_index_file} "
+            f"ou la récupération du fichier local {args.local_index_file} a échoué."
+        )
+        if isinstance(get_or_update_local_search_index, Exception):
+            logger.error(get_or_update_local_search_index)
+        sys.exit()
+    logger.info(
+        f"Local index file: {args.local_index_file}, "
+        f"{convert_octets(args.local_index_file.stat().st_size)}"
+    )
+
+    # load the local index file
+    if not args.local_index_file.exists():
+        logger.error(f"{args.local_index_file.resolve()} does not exist")
+        sys.exit(f"{args.local_index_file.resolve()} does not exist")
+
+    # binary index and images catalog written alongside the downloaded index
+    local_binary_index_file = args.local_index_file.with_suffix(".bin")
+    local_images_catalog_file = args.local_index_file.with_name(
+        f"{args.local_index_file.stem}_images.bin"
+    )
+    index_mtime = args.local_index_file.stat().st_mtime
+
+    idx: Index | None = None
+    images_catalog: ImagesCatalogReader | None = None
+    if (
+        local_binary_index_file.exists()
+        and local_binary_index_file.stat().st_mtime >= index_mtime
+    ):
+        try:
+            idx = load_binary_index(local_binary_index_file)
+        except ValueError as err:
+            logger.warning(
+                f"Unable to load the binary index {local_binary_index_file}, "
+                f"fallback to JSON. Trace: {err}"
+            )
+    if (
+        local_images_catalog_file.exists()
+        and local_images_catalog_file.stat().st_mtime >= index_mtime
+    ):
+        try:
+            images_catalog = ImagesCatalogReader(local_images_catalog_file)
+        except ValueError as err:
+            logger.warning(
+                f"Unable to load the images catalog {local_images_catalog_file}, "
+                f"generate it again from JSON. Trace: {err}"
+            )
+
+    if idx is not None and images_catalog is not None:
+        return idx, images_catalog
+
+    # loads it
+    serialized_idx = orjson.loads(read_local_file(args.local_index_file))
+
+    if images_catalog is None:
+        write_images_catalog(
+            images=serialized_idx.get("images") or {},
+            output_path=local_images_catalog_file,
+        )
+        images_catalog = ImagesCatalogReader(local_images_catalog_file)
+
+    if idx is None:
+        # charge l'index sérialisé
+        idx = Index.load(serialized_idx.get("index"))
+        # write the binary index to use it next time
+        write_binary_index(idx=idx, output_path=local_binary_index_file)
+
+    return idx, images_catalog
+
+
+def get_dimensions_filter(args: argparse.Namespace) -> ImageDimensionsFilter:
+    """Get the dimensions ranges passed to the subcommand.
+
+    Args:
+        args (argparse.Namespace): arguments passed to the subcommand
+
+    Returns:
+        ImageDimensionsFilter: accepted dimensions, empty if no range is set
+    """
+    return ImageDimensionsFilter(
+        min_width=getattr(args, "filter_min_width", None),
+        max_width=getattr(args, "filter_max_width", None),
+        min_height=getattr(args, "filter_min_height", None),
+        max_height=getattr(args, "filter_max_height", None),
+        min_ratio=getattr(args, "filter_min_ratio", None),
+        max_ratio=getattr(args, "filter_max_ratio", None),
+    )
+
+
+def find_images_by_dimensions(
+    images_catalog: Mapping[str, Sequence[int]],
+    dimensions_filter: ImageDimensionsFilter,
+) -> list[str]:
+    """List the images within dimensions ranges.
+
+    Args:
+        images_catalog (Mapping[str, Sequence[int]]): images dimensions by path
+        dimensions_filter (ImageDimensionsFilter): accepted dimensions
+
+    Returns:
+        list[str]: paths of the matching images, sorted
+    """
+    if isinstance(images_catalog, ImagesCatalogReader):
+        return [
+            images_catalog.paths[position].decode("utf-8")
+            for position in images_catalog.find_by_dimensions(dimensions_filter)
+        ]
+
+    return sorted(
+        path
+        for path, dimensions in images_catalog.items()
+        if dimensions_filter.match(*(dimensions or UNKNOWN_DIMENSIONS))
+    )
+
+
+def search_images(
+    idx: Index,
+    images_catalog: Mapping[str, Sequence[int]],
+    args: argparse.Namespace,
+) -> tuple[list[dict], int]:
+    """Perform the search in the images index then enrich and filter results.
+
+    With a binary index, the query is compiled once and reused by the next searches \
+        of the same index, then results are sorted lazily. Results are enriched only \
+        until the requested number of results is reached. Images out of the \
+        dimensions ranges are found in the sorted indexes of the images catalog and \
+        skipped before scoring. Without search term, the images within the \
+        dimensions ranges are listed by path.
+
+    Args:
+        idx (Index): images index
+        images_catalog (Mapping[str, Sequence[int]]): images dimensions by path
+        args (argparse.Namespace): arguments passed to the subcommand (search term \
+            and filters)
+
+    Returns:
+        tuple[list[dict], int]: final results and count of search results
+    """
+    results_limit: int | None = args.results_number if args.results_number > 0 else None
+    dimensions_filter = get_dimensions_filter(args)
+
+    if not args.search_term:
+        # only dimensions filters: list the matching images
+        matching_paths = find_images_by_dimensions(
+            images_catalog=images_catalog, dimensions_filter=dimensions_filter
+        )
+        search_results = ({"ref": path, "score": 0.0} for path in matching_paths)
+        count_search_results = len(matching_paths)
+    elif isinstance(idx, BinaryIndex):
+        if not dimensions_filter.is_empty() and isinstance(
+            images_catalog, ImagesCatalogReader
+        ):
+            # images out of the ranges are skipped before scoring
+            accepted_refs = {
+                images_catalog.paths[position]
+                for position in images_catalog.find_by_dimensions(dimensions_filter)
+            }
+            doc_refs = idx.reader.doc_refs
+            idx = BinaryIndex(
+                idx.reader,
+                doc_filter=lambda doc_id: doc_refs[doc_id] in accepted_refs,
+                query_plans=idx.query_plans,
+            )
+        search_results, count_search_results, _ = idx.iter_search(args.search_term)
+    else:
+        search_results = idx.search(args.search_term)
+        count_search_results = len(search_results)
+
+    # résultats : enrichissement et filtre
+    final_results = []
+
+    for result in search_results:
+        # filter on image type
+        if args.filter_type == "logo" and not result.get("ref").startswith(
+            "logos-icones/"
+        ):
+            logger.debug(
+                f"Résultat ignoré par le filtre {args.filter_type}: {result.get('ref')}"
+            )
+            continue
+        elif args.filter_type == "geoicone" and not result.get("ref").startswith(
+            "internal/icons-rdp-news/"
+        ):
+            logger.debug(
+                f"Résultat ignoré par le filtre {args.filter_type}: {result.get('ref')}"
+            )
+            continue
+        else:
+            pass
+
+        mapped_img = images_catalog.get(result.get("ref")) or UNKNOWN_DIMENSIONS
+        if not dimensions_filter.match(*mapped_img):
+            logger.debug(
+                f"Résultat ignoré par le filtre sur les dimensions: {result.get('ref')}"
+            )
+            continue
+
+        # crée un résultat de sortie
+        out_result = {
+            "nom": result.get("ref").split("/")[-1],
+            "dimensions": f"{mapped_img[0]}x{mapped_img[1]}",
+            "score": f"{result.get('score'):.3}",
+            "cdn_path": f"{result.get('ref')}",
+            "url": f"{defaults_settings.cdn_base_url}"
+            f"{defaults_settings.cdn_base_path}/"
+            f"{result.get('ref')}",
+        }
+
+        final_results.append(out_result)
+        if results_limit is not None and len(final_results) >= results_limit:
+            break
+
+    return final_results, count_search_results
+
+
 # ############################################################################
 # ########## CLI #################
 # ################################
@@ -52,6 +346,21 @@ def parser_search_image(subparser: argparse.ArgumentParser) -> argparse.Argument
         help="Terme de recherche.",
         type=str,
         metavar="search-term",
+        nargs="?",
+    )
+
+    subparser.add_argument(
+        "--batch",
+        default=None,
+        dest="batch_file",
+        help="Fichier de requêtes à exécuter avec un seul chargement de l'index ('-' "
+        "pour l'entrée standard). Une requête par ligne : un terme de recherche ou un "
+        "objet JSON avec le terme (search_term) et les options à modifier (filter_type, "
+        "filter_min_width, filter_max_width, filter_min_height, filter_max_height, "
+        "filter_min_ratio, filter_max_ratio, results_number). Les résultats sont écrits "
+        "en JSON, une ligne par requête.",
+        metavar="FICHIER",
+        type=argparse.FileType(mode="r", encoding="UTF-8"),
     )
 
     subparser.add_argument(
@@ -82,6 +391,61 @@ def parser_search_image(subparser: argparse.ArgumentParser) -> argparse.Argument
         metavar="GEOTRIBU_IMAGES_DEFAULT_TYPE",
     )
 
+    subparser.add_argument(
+        "-minw",
+        "--min-width",
+        default=None,
+        dest="filter_min_width",
+        help="Largeur minimum des images, en pixels.",
+        type=int,
+    )
+
+    subparser.add_argument(
+        "-maxw",
+        "--max-width",
+        default=None,
+        dest="filter_max_width",
+        help="Largeur maximum des images, en pixels.",
+        type=int,
+    )
+
+    subparser.add_argument(
+        "-minh",
+        "--min-height",
+        default=None,
+        dest="filter_min_height",
+        help="Hauteur minimum des images, en pixels.",
+        type=int,
+    )
+
+    subparser.add_argument(
+        "-maxh",
+        "--max-height",
+        default=None,
+        dest="filter_max_height",
+        help="Hauteur maximum des images, en pixels.",
+        type=int,
+    )
+
+    subparser.add_argument(
+        "-minr",
+        "--min-ratio",
+        default=None,
+        dest="filter_min_ratio",
+        help="Ratio largeur / hauteur minimum des images. Exemple : 1 pour des images "
+        "carrées ou plus larges que hautes.",
+        type=float,
+    )
+
+    subparser.add_argument(
+        "-maxr",
+        "--max-ratio",
+        default=None,
+        dest="filter_max_ratio",
+        help="Ratio largeur / hauteur maximum des images.",
+        type=float,
+    )
+
     subparser.add_argument(
         "-n",
         "--results-number",
@@ -115,6 +479,15 @@ def parser_search_image(subparser: argparse.ArgumentParser) -> argparse.Argument
         metavar="GEOTRIBU_RESULTATS_FORMAT",
     )
 
+    subparser.add_argument(
+        "--no-cache",
+        default=str2bool(getenv("GEOTRIBU_SEARCH_QUERY_CACHE", True)),
+        action="store_false",
+        dest="opt_query_cache",
+        help="Désactive le cache des résultats de recherche : la recherche est "
+        "toujours effectuée dans l'index.",
+    )
+
     subparser.add_argument(
         "--no-prompt",
         default=str2bool(getenv("GEOTRIBU_PROMPT_AFTER_SEARCH", True)),
@@ -139,94 +512,112 @@ def run(args: argparse.Namespace):
     Perform a search on images stored on the Geotribu pseudo-CDN \
         (<https://cdn.geotribu.fr/>).
 
+    The downloaded index (`cdn_search_index.json` = args.local_index_file) is \
+        converted once into a binary index (`cdn_search_index.bin`) and an images \
+        catalog (`cdn_search_index_images.bin`) with the dimensions of every image, \
+        both memory-mapped by the next searches instead of parsing the JSON file.
+
+    If a search daemon is running, the search is forwarded to it and its warm \
+        in-memory index is used instead. Results of a query already performed on the \
+        same index are read from the query cache (`query_cache` folder).
+
+    In batch mode, the local index is loaded once then every query of the batch file \
+        is performed against it.
+
     Args:
         args (argparse.Namespace): arguments passed to the subcommand
     """
     logger.debug(f"Running {args.command} with {args}")
 
-    # local vars
-    history = CliHistory()
-
-    args.local_index_file.parent.mkdir(parents=True, exist_ok=True)
+    if args.batch_file is not None:
+        idx, images_catalog = load_local_index(args)
 
-    with console.status("Téléchargement de la liste des images...", spinner="earth"):
-        # get local search index
-        get_or_update_local_search_index = download_remote_file_to_local(
-            remote_url_to_download=args.remote_index_file,
-            local_file_path=args.local_index_file,
-            expiration_rotating_hours=args.expiration_rotating_hours,
-        )
-    if not isinstance(get_or_update_local_search_index, Path):
-        logger.error(
-            f"Le téléchargement du fichier distant {args.remote_index_file} "
-            f"ou la récupération du fichier local {args.local_index_file} a échoué."
+        def search_batch_query(query_args: argparse.Namespace) -> dict:
+            final_results, count_search_results = search_images(
+                idx=idx, images_catalog=images_catalog, args=query_args
+            )
+            return {
+                "results": final_results,
+                "count_search_results": count_search_results,
+            }
+
+        if run_batch(
+            args=args,
+            search=search_batch_query,
+            query_args_names=search_image_batch_args_names,
+        ):
+            sys.exit(1)
+        return
+
+    dimensions_filter = get_dimensions_filter(args)
+    if not args.search_term and dimensions_filter.is_empty():
+        sys.exit(
+            "Un terme de recherche, un filtre sur les dimensions ou un fichier de "
+            "requêtes (--batch) est requis."
         )
-        if isinstance(get_or_update_local_search_index, Exception):
-            logger.error(get_or_update_local_search_index)
-        sys.exit()
-    logger.info(
-        f"Local index file: {args.local_index_file}, "
-        f"{convert_octets(args.local_index_file.stat().st_size)}"
+    # without search term, the request is described by the dimensions filters
+    request_label = args.search_term or " ".join(
+        f"{field.replace('_', '-')}={value}"
+        for field, value in vars(dimensions_filter).items()
+        if value is not None
     )
 
-    # load the local index file
-    if not args.local_index_file.exists():
-        logger.error(f"{args.local_index_file.resolve()} does not exist")
-        sys.exit(f"{args.local_index_file.resolve()} does not exist")
-    # loads it
-    with args.local_index_file.open("rb") as fd:
-        serialized_idx = orjson.loads(fd.read())
-
-    # charge l'index sérialisé
-    idx = Index.load(serialized_idx.get("index"))
-    images_dict = serialized_idx.get("images")
+    # local vars
+    history = CliHistory()
 
-    # recherche
-    with console.status(f"Recherche {args.search_term}...", spinner="earth"):
-        search_results: list[dict] = idx.search(args.search_term)
+    query_cache = QueryCache(cache_folder=args.local_index_file.parent / "query_cache")
+    query_filters = {
+        arg_name: getattr(args, arg_name) for arg_name in search_image_batch_args_names
+    }
 
-    if not len(search_results):
-        console.print(
-            f":person_shrugging: Aucune image trouvée pour : {args.search_term}"
+    # perform the search: from the search daemon, the query cache or local files
+    search_response = query_search_daemon(
+        command="search-image", args=args, args_names=search_image_args_names
+    )
+    if (
+        search_response is None
+        and args.opt_query_cache
+        and args.local_index_file.exists()
+        and not is_file_older_than(
+            args.local_index_file, args.expiration_rotating_hours
+        )
+    ):
+        search_response = query_cache.get(
+            QueryCache.get_key(
+                index_file=args.local_index_file,
+                query=args.search_term or "",
+                filters=query_filters,
+            )
         )
-        sys.exit(0)
 
-    # résultats : enrichissement et filtre
-    final_results = []
+    if search_response is not None:
+        final_results = search_response.get("results", [])
+        count_search_results = search_response.get("count_search_results", 0)
+    else:
+        idx, images_catalog = load_local_index(args)
 
-    for result in search_results:
-        # filter on image type
-        if args.filter_type == "logo" and not result.get("ref").startswith(
-            "logos-icones/"
-        ):
-            logger.debug(
-                f"Résultat ignoré par le filtre {args.filter_type}: {result.get('ref')}"
-            )
-            continue
-        elif args.filter_type == "geoicone" and not result.get("ref").startswith(
-            "internal/icons-rdp-news/"
-        ):
-            logger.debug(
-                f"Résultat ignoré par le filtre {args.filter_type}: {result.get('ref')}"
+        # recherche
+        with console.status(f"Recherche {request_label}...", spinner="earth"):
+            final_results, count_search_results = search_images(
+                idx=idx, images_catalog=images_catalog, args=args
             )
-            continue
-        else:
-            pass
-
-        mapped_img = images_dict.get(result.get("ref"))
 
-        # crée un résultat de sortie
-        out_result = {
-            "nom": result.get("ref").split("/")[-1],
-            "dimensions": f"{mapped_img[0]}x{mapped_img[1]}",
-            "score": f"{result.get('score'):.3}",
-            "cdn_path": f"{result.get('ref')}",
-            "url": f"{defaults_settings.cdn_base_url}"
-            f"{defaults_settings.cdn_base_path}/"
-            f"{result.get('ref')}",
-        }
+        if args.opt_query_cache:
+            query_cache.set(
+                key=QueryCache.get_key(
+                    index_file=args.local_index_file,
+                    query=args.search_term or "",
+                    filters=query_filters,
+                ),
+                value={
+                    "results": final_results,
+                    "count_search_results": count_search_results,
+                },
+            )
 
-        final_results.append(out_result)
+    if not count_search_results:
+        console.print(f":person_shrugging: Aucune image trouvée pour : {request_label}")
+        sys.exit(0)
 
     # formatage de la sortie
     if len(final_results):
@@ -235,21 +626,20 @@ def run(args: argparse.Namespace):
                 result=final_results,
                 format_type=args.format_output,
                 count=args.results_number,
+                results_total=count_search_results,
                 search_term=args.search_term,
                 search_filter_type=args.filter_type,
             )
         )
     else:
-        console.print(
-            f":person_shrugging: Aucune image trouvée pour : {args.search_term}"
-        )
+        console.print(f":person_shrugging: Aucune image trouvée pour : {request_label}")
         sys.exit(0)
 
     # save into history
     history.dump(
         cmd_name=__name__.split(".")[-1],
         results_to_dump=final_results,
-        request_performed=args.search_term,
+        request_performed=request_label,
     )
 
     # prompt to open a result
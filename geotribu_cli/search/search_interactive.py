@@ -0,0 +1,385 @@
+#! python3  # noqa: E265
+
+"""Search-as-you-type: refine search results on each keystroke.
+
+Every word of the query is required. The words already typed are compiled once (and
+cached with the other query plans) while the word being typed also matches the index
+terms it starts with. A keystroke usually refines the previous query, so its results
+are a subset of the previous ones: they are used as candidates and the other
+documents are skipped before scoring. The range of index terms starting with the
+typed word is also searched within the range of the previous prefix.
+"""
+
+# ############################################################################
+# ########## IMPORTS #############
+# ################################
+
+# standard library
+import logging
+import re
+import time
+from collections.abc import Callable, Iterator
+
+# 3rd party
+from lunr.exceptions import QueryParseError
+from lunr.query import QueryPresence
+from rich.console import Console, Group, RenderableType
+from rich.live import Live
+from rich.text import Text
+
+# package
+from geotribu_cli.search.binary_index import APPROXIMATE_PREFIX_MIN_LENGTH, BinaryIndex
+from geotribu_cli.search.mdl_search import CompiledClause, QueryPlan
+from geotribu_cli.utils.keyboard import (
+    KEY_BACKSPACE,
+    KEY_DELETE_LINE,
+    KEY_DELETE_WORD,
+    KEY_DOWN,
+    KEY_ENTER,
+    KEY_ESCAPE,
+    KEY_UP,
+    KeyboardReader,
+)
+
+# ############################################################################
+# ########## GLOBALS #############
+# ################################
+
+logger = logging.getLogger(__name__)
+
+# plain word, optionally restricted to a field (title:qgis), matched as a prefix
+_PREFIX_WORD_PATTERN = re.compile(r"(?:(?P<field>\w+):)?(?P<term>[^\s:*~^+\-]+)")
+# previous queries kept to reuse their results
+INCREMENTAL_SEARCH_HISTORY_SIZE: int = 32
+# keys typed within this delay are applied at once before searching, in seconds
+DEBOUNCE_DELAY: float = 0.03
+
+# ############################################################################
+# ########## FUNCTIONS ###########
+# ################################
+
+
+def is_refinement(previous_plan: QueryPlan, query_plan: QueryPlan) -> bool:
+    """Check if the results of a query are a subset of the results of another one.
+
+    Both queries are compared clause by clause: required clauses must match fewer \
+        terms, prohibited ones more terms and further clauses can only remove results.
+
+    Args:
+        previous_plan (QueryPlan): query whose results would be reused
+        query_plan (QueryPlan): new query
+
+    Returns:
+        bool: True if every result of the new query is a result of the previous one
+    """
+    if len(query_plan.clauses) < len(previous_plan.clauses):
+        return False
+    # optional clauses only widen the results when there is no required one
+    if not previous_plan.is_negated and not any(
+        clause.presence == QueryPresence.REQUIRED for clause in previous_plan.clauses
+    ):
+        return False
+
+    for previous_clause, clause in zip(previous_plan.clauses, query_plan.clauses):
+        if (clause.fields, clause.presence) != (
+            previous_clause.fields,
+            previous_clause.presence,
+        ):
+            return False
+        if clause.presence == QueryPresence.REQUIRED:
+            if not clause.has_unmatched_required_term and not set(
+                clause.term_positions
+            ).issubset(previous_clause.term_positions):
+                return False
+        elif clause.presence == QueryPresence.PROHIBITED:
+            if not set(clause.term_positions).issuperset(
+                previous_clause.term_positions
+            ):
+                return False
+
+    return True
+
+
+def edit_text(text: str, key: str) -> str:
+    """Apply a typed key to the text being typed.
+
+    Args:
+        text (str): text being typed
+        key (str): key, as returned by KeyboardReader.read_key
+
+    Returns:
+        str: edited text, unchanged if the key doesn't edit text
+    """
+    if key == KEY_BACKSPACE:
+        return text[:-1]
+    elif key == KEY_DELETE_WORD:
+        text = text.rstrip()
+        return text[: text.rfind(" ") + 1]
+    elif key == KEY_DELETE_LINE:
+        return ""
+    elif len(key) == 1 and key.isprintable():
+        return text + key
+    return text
+
+
+# ############################################################################
+# ########## CLASSES #############
+# ################################
+
+
+class IncrementalSearch:
+    """Search session reusing the work done for the previous keystrokes."""
+
+    def __init__(self, index: BinaryIndex):
+        """Class initialization.
+
+        Args:
+            index (BinaryIndex): index to search, possibly restricted
+        """
+        self.index = index
+        self.fields: tuple[str, ...] = tuple(index.fields)
+        # UTF-8 prefix -> range of the index terms starting with it
+        self._prefix_range: tuple[bytes, int, int] | None = None
+        # previous queries and their scores, most recent last
+        self._history: list[tuple[QueryPlan, dict[int, float]]] = []
+
+    def _get_word_query(self, word: str) -> str:
+        """Get the lunr query of a word already typed: it's required unless it has \
+            an explicit presence or the pipeline removes it (stop word).
+
+        Args:
+            word (str): typed word
+
+        Returns:
+            str: lunr query
+        """
+        if word.startswith(("+", "-")):
+            return word
+        match = _PREFIX_WORD_PATTERN.fullmatch(word)
+        if match and not self.index.pipeline.run_string(
+            match.group("term").lower(), {"fields": self.fields}
+        ):
+            return word
+        return f"+{word}"
+
+    def _compile_prefix_clause(self, field: str | None, term: str) -> CompiledClause:
+        """Compile the word being typed: it matches the index terms starting with \
+            it as well as its exact form processed by the pipeline.
+
+        Args:
+            field (str | None): field to search in, None for all of them
+            term (str): typed term
+
+        Returns:
+            CompiledClause: required clause
+        """
+        fields = (field,) if field else self.fields
+        reader = self.index.reader
+
+        term_positions = {
+            term_position: None
+            for processed_term in self.index.pipeline.run_string(
+                term, {"fields": fields}
+            )
+            if (term_position := reader.find_term(processed_term)) is not None
+        }
+
+        # terms starting with a longer prefix are within the range of the shorter one
+        encoded = term.encode("utf-8")
+        low, high = 0, None
+        if self._prefix_range is not None and encoded.startswith(self._prefix_range[0]):
+            low, high = self._prefix_range[1:]
+        start, end = reader.prefix_range(encoded, low=low, high=high)
+        self._prefix_range = (encoded, start, end)
+        term_positions.update(dict.fromkeys(range(start, end)))
+
+        return CompiledClause(
+            fields=fields,
+            presence=QueryPresence.REQUIRED,
+            boost=1,
+            term_positions=tuple(term_positions),
+            has_unmatched_required_term=not term_positions,
+        )
+
+    def compile_query(self, text: str) -> QueryPlan:
+        """Compile the typed text into a query where every word is required and the \
+            last one, if still being typed, is also a prefix.
+
+        Args:
+            text (str): typed text, using lunr syntax
+
+        Raises:
+            QueryParseError: if the query syntax is invalid
+
+        Returns:
+            QueryPlan: compiled query
+        """
+        words = text.split()
+        prefix_match = None
+        if words and not text[-1].isspace():
+            prefix_match = _PREFIX_WORD_PATTERN.fullmatch(words[-1])
+            if (
+                prefix_match is None
+                or len(prefix_match.group("term")) < APPROXIMATE_PREFIX_MIN_LENGTH
+                or prefix_match.group("field") not in (None, *self.fields)
+            ):
+                prefix_match = None
+            else:
+                words = words[:-1]
+
+        query_plan = self.index.compile_query(
+            " ".join(self._get_word_query(word) for word in words)
+        )
+        if prefix_match is None:
+            return query_plan
+
+        return QueryPlan(
+            query_string=text,
+            clauses=(
+                *query_plan.clauses,
+                self._compile_prefix_clause(
+                    field=prefix_match.group("field"),
+                    term=prefix_match.group("term").lower(),
+                ),
+            ),
+        )
+
+    def query_scores(self, query_plan: QueryPlan) -> dict[int, float]:
+        """Score the documents matching a query, from the results of a previous \
+            query if the new one refines it.
+
+        Args:
+            query_plan (QueryPlan): compiled query
+
+        Returns:
+            dict[int, float]: score by document id, in lunr's results order
+        """
+        index = self.index
+        for position in range(len(self._history) - 1, -1, -1):
+            previous_plan, previous_scores = self._history[position]
+            if (previous_plan.clauses, previous_plan.is_negated) == (
+                query_plan.clauses,
+                query_plan.is_negated,
+            ):
+                # same query, typically after a backspace
+                self._history.append(self._history.pop(position))
+                return previous_scores
+            if is_refinement(previous_plan, query_plan):
+                # checking candidates costs more than it saves when most documents
+                # are candidates
+                if len(previous_scores) > len(index.reader.doc_refs) // 2:
+                    break
+                # scores only depend on the query: candidates get the same ones
+                index = BinaryIndex(
+                    index.reader,
+                    doc_filter=previous_scores.__contains__,
+                    query_plans=index.query_plans,
+                )
+                break
+
+        scores = index.query_scores(query_plan)
+        self._history.append((query_plan, scores))
+        del self._history[:-INCREMENTAL_SEARCH_HISTORY_SIZE]
+        return scores
+
+    def iter_search(self, text: str) -> tuple[Iterator[dict], int]:
+        """Search the typed text.
+
+        Args:
+            text (str): typed text, using lunr syntax
+
+        Raises:
+            QueryParseError: if the query syntax is invalid
+
+        Returns:
+            tuple[Iterator[dict], int]: results (ref and score) by decreasing score \
+                and total number of matching documents
+        """
+        scores = self.query_scores(self.compile_query(text))
+        return self.index.iter_ranked(scores), len(scores)
+
+
+# ############################################################################
+# ########## MAIN ################
+# ################################
+
+
+def run_interactive_search(
+    search: Callable[[str], tuple[list[dict], int]],
+    render: Callable[[str, list[dict], int, int], RenderableType],
+    console: Console,
+    initial_text: str = "",
+) -> tuple[str, dict | None]:
+    """Search as the user types, until a result is selected or the search is left.
+
+    Keystrokes typed in a burst are applied together before searching, and \
+        moving the selection only renders the results again.
+
+    Args:
+        search (Callable[[str], tuple[list[dict], int]]): function returning the \
+            results to display and the total number of results of a text
+        render (Callable[[str, list[dict], int, int], RenderableType]): function \
+            rendering the text, the results, their total and the selected one
+        console (Console): console to render to
+        initial_text (str, optional): text to start with. Defaults to "".
+
+    Returns:
+        tuple[str, dict | None]: typed text and selected result, None if the search \
+            has been left
+    """
+    text = initial_text
+    results: list[dict] = []
+    results_total = 0
+    selected = 0
+    status = ""
+
+    def refresh_results():
+        nonlocal results, results_total, selected, status
+        start = time.perf_counter()
+        try:
+            results, results_total = search(text) if text.strip() else ([], 0)
+            status = f"{(time.perf_counter() - start) * 1000:.0f} ms"
+        except QueryParseError as err:
+            # keep previous results while the query is being written
+            logger.debug(f"Invalid query {text}. Trace: {err}")
+            status = f"requête invalide : {err}"
+        selected = min(selected, max(len(results) - 1, 0))
+
+    def display() -> RenderableType:
+        return Group(
+            Text.assemble(("Recherche : ", "bold"), text, ("▏", "blink")),
+            Text(
+                f"{results_total} résultat(s) - {status} - ↑/↓ : sélection, "
+                "Entrée : ouvrir, Échap : quitter",
+                style="bright_black",
+            ),
+            render(text, results, results_total, selected),
+        )
+
+    refresh_results()
+    with (
+        KeyboardReader() as keyboard,
+        Live(display(), console=console, auto_refresh=False, transient=True) as live,
+    ):
+        while True:
+            is_text_modified = False
+            key = keyboard.read_key()
+            while key is not None:
+                if key == KEY_ESCAPE:
+                    return text, None
+                elif key == KEY_ENTER:
+                    return text, results[selected] if results else None
+                elif key == KEY_UP:
+                    selected = max(selected - 1, 0)
+                elif key == KEY_DOWN:
+                    selected = min(selected + 1, max(len(results) - 1, 0))
+                else:
+                    edited_text = edit_text(text=text, key=key)
+                    is_text_modified |= edited_text != text
+                    text = edited_text
+                # debounce: wait for the next keys typed in the same burst
+                key = keyboard.read_key(timeout=DEBOUNCE_DELAY)
+
+            if is_text_modified:
+                refresh_results()
+            live.update(display(), refresh=True)
@@ -22,6 +22,7 @@ from requests import Session
 from geotribu_cli.__about__ import __title_clean__, __version__
 from geotribu_cli.comments.mdl_comment import Comment
 from geotribu_cli.constants import GeotribuDefaults
+from geotribu_cli.utils.http_client import get_http_session, is_offline_mode
 
 # ############################################################################
 # ########## GLOBALS #############
@@ -117,6 +118,13 @@ class ExtendedMastodonClient(Mastodon):
         if debug_requests is None:
             debug_requests = getenv("GEOTRIBU_LOGS_LEVEL", "") == "DEBUG"
 
+        # without a session passed, the shared one is retrieved on each request
+        # rather than here, so that the client can be built in offline mode
+        self._use_shared_session = session is None
+        if is_offline_mode():
+            # the server version can't be retrieved
+            version_check_mode = "none"
+
         # instanciate subclass
         super().__init__(
             client_id=client_id,
@@ -135,6 +143,30 @@ class ExtendedMastodonClient(Mastodon):
             lang=lang,
         )
 
+    @property
+    def session(self) -> Session:
+        """HTTP session used for requests: the one passed at instanciation or the \
+            shared one.
+
+        Raises:
+            OfflineModeError: if the shared session is used in offline mode
+
+        Returns:
+            Session: HTTP session
+        """
+        if self._use_shared_session:
+            return get_http_session()
+        return self._session
+
+    @session.setter
+    def session(self, value: Session):
+        """Set the HTTP session, as done by the parent class at instanciation.
+
+        Args:
+            value (Session): HTTP session
+        """
+        self._session = value
+
     @classmethod
     def full_account_with_instance(
         cls, account: dict, default_instance: str = "mapstodon.space"
@@ -0,0 +1,368 @@
+#! python3  # noqa: E265
+
+# ############################################################################
+# ########## IMPORTS #############
+# ################################
+
+# standard library
+import argparse
+import json
+import logging
+import shutil
+import sys
+import xml.etree.ElementTree as ET
+from dataclasses import asdict
+from datetime import datetime
+from os import getenv
+from pathlib import Path
+
+# 3rd party
+from rich import print
+from rich.table import Table
+
+# package
+from geotribu_cli.__about__ import __title__, __version__
+from geotribu_cli.constants import GeotribuDefaults
+from geotribu_cli.rss.rss_reader import parser_latest_content
+from geotribu_cli.search.search_daemon import get_search_module
+from geotribu_cli.utils.cache_store import CacheStore, get_cache_store
+from geotribu_cli.utils.file_compression import open_local_file
+from geotribu_cli.utils.file_downloader import download_remote_file_to_local
+from geotribu_cli.utils.formatters import convert_octets, url_content_source
+
+# ############################################################################
+# ########## GLOBALS #############
+# ################################
+
+logger = logging.getLogger(__name__)
+defaults_settings = GeotribuDefaults()
+
+# folders of the working folder written by previous versions, no longer used
+OBSOLETE_FOLDERS: tuple[str, ...] = ("remote",)
+
+# ############################################################################
+# ########## FUNCTIONS ###########
+# ################################
+
+
+def get_folder_size(folder: Path) -> int:
+    """Get the size of the files of a folder, recursively.
+
+    Args:
+        folder (Path): folder
+
+    Returns:
+        int: size in bytes
+    """
+    size = 0
+    for file_path in folder.rglob("*"):
+        try:
+            if file_path.is_file():
+                size += file_path.stat().st_size
+        except FileNotFoundError:
+            # removed by another process meanwhile
+            continue
+    return size
+
+
+def inspect_cache(store: CacheStore, format_output: str = "table") -> Table | dict:
+    """Describe the cache store entries and cached folders, and the size of the \
+        working folder.
+
+    Args:
+        store (CacheStore): cache store
+        format_output (str, optional): output format (table or json). Defaults to \
+            "table".
+
+    Returns:
+        Table | dict: formatted description ready to print
+    """
+    entries = sorted(
+        store.read_manifest().values(),
+        key=lambda entry: entry.last_access,
+        reverse=True,
+    )
+    cached_folders = store.read_cached_folders()
+    store_size = store.get_size({entry.url: entry for entry in entries}) + sum(
+        cached_folder.size for cached_folder in cached_folders
+    )
+    folders_sizes = {
+        folder.name: get_folder_size(folder)
+        for folder in sorted(defaults_settings.geotribu_working_folder.glob("*"))
+        if folder.is_dir()
+    }
+
+    if format_output != "table":
+        return {
+            "store": {
+                "folder": str(store.cache_folder),
+                "size": store_size,
+                "max_size": store.max_size,
+                "entries": [asdict(entry) for entry in entries],
+                "cached_folders": [
+                    asdict(cached_folder) for cached_folder in cached_folders
+                ],
+            },
+            "folders": folders_sizes,
+        }
+
+    table = Table(
+        title=f"Cache ({store.cache_folder}) : {len(entries)} entrée(s) et "
+        f"{len(cached_folders)} dossier(s), "
+        f"{convert_octets(store_size)} sur {convert_octets(store.max_size)} au maximum",
+        show_lines=True,
+        highlight=True,
+        caption=f"{__title__} {__version__} - dossier de travail "
+        f"{defaults_settings.geotribu_working_folder} : "
+        + ", ".join(
+            f"{name} {convert_octets(size)}"
+            + (" (obsolète)" if name in OBSOLETE_FOLDERS else "")
+            for name, size in folders_sizes.items()
+        ),
+    )
+
+    # columns
+    table.add_column(header="URL ou dossier", justify="left", style="default")
+    table.add_column(header="Taille", justify="right", style="magenta")
+    table.add_column(header="Téléchargé", justify="center", style="bright_black")
+    table.add_column(header="Dernier accès", justify="center", style="bright_black")
+
+    for entry in entries:
+        table.add_row(
+            f"[link={entry.url}]{entry.url}[/link]",
+            convert_octets(entry.size),
+            f"{datetime.fromtimestamp(entry.fetched):%d/%m/%Y %H:%M}",
+            f"{datetime.fromtimestamp(entry.last_access):%d/%m/%Y %H:%M}",
+        )
+    for cached_folder in cached_folders:
+        table.add_row(
+            f"[link={cached_folder.path.as_uri()}]{cached_folder.path}[/link]",
+            convert_octets(cached_folder.size),
+            "-",
+            f"{datetime.fromtimestamp(cached_folder.last_access):%d/%m/%Y %H:%M}",
+        )
+
+    return table
+
+
+def prune_cache(
+    store: CacheStore, max_size: int | None = None, remove_all: bool = False
+) -> tuple[int, int]:
+    """Evict the least recently used entries and cached folders of the cache store \
+        and remove the obsolete folders of the working folder.
+
+    Args:
+        store (CacheStore): cache store
+        max_size (int | None, optional): size to fit in, in bytes. Defaults to None \
+            (maximum size of the store).
+        remove_all (bool, optional): remove every entry and cached folder. Defaults \
+            to False.
+
+    Returns:
+        tuple[int, int]: number of removed entries and folders, and freed size in \
+            bytes
+    """
+    size_before = store.get_total_size()
+    if remove_all:
+        removed_entries = store.clear()
+    else:
+        removed_entries = store.evict(max_size=max_size)
+    freed_size = size_before - store.get_total_size()
+
+    for folder_name in OBSOLETE_FOLDERS:
+        folder = defaults_settings.geotribu_working_folder / folder_name
+        if folder.is_dir():
+            freed_size += get_folder_size(folder)
+            shutil.rmtree(folder, ignore_errors=True)
+            logger.info(f"Dossier obsolète supprimé : {folder}")
+
+    return len(removed_entries), freed_size
+
+
+def warm_cache(store: CacheStore, contents_number: int = 10) -> dict[str, bool]:
+    """Download what the reading and search subcommands need, so they answer right \
+        away and work offline: RSS feed, contents and images indexes and the latest \
+        contents.
+
+    Args:
+        store (CacheStore): cache store, for the contents
+        contents_number (int, optional): number of latest contents to store. \
+            Defaults to 10.
+
+    Returns:
+        dict[str, bool]: success of each step, by description
+    """
+    steps: dict[str, bool] = {}
+
+    # RSS feed, with the default settings of read-latest
+    rss_args = parser_latest_content(argparse.ArgumentParser()).parse_args([])
+    try:
+        download_remote_file_to_local(
+            remote_url_to_download=rss_args.remote_index_file,
+            local_file_path=rss_args.local_index_file,
+            expiration_rotating_hours=rss_args.expiration_rotating_hours,
+            compress_at_rest=True,
+        )
+        steps["Flux RSS"] = True
+    except Exception as err:
+        logger.error(f"Unable to download the RSS feed. Trace: {err}")
+        steps["Flux RSS"] = False
+
+    # indexes, with the default settings of the search subcommands
+    for command, label in (
+        ("search-content", "Index des contenus"),
+        ("search-image", "Index des images"),
+    ):
+        search_module = get_search_module(command)
+        search_parser = getattr(search_module, f"parser_{command.replace('-', '_')}")
+        try:
+            search_module.load_local_index(
+                search_parser(argparse.ArgumentParser()).parse_args([""])
+            )
+            steps[label] = True
+        except (Exception, SystemExit) as err:
+            logger.error(f"Unable to prepare the {command} index. Trace: {err}")
+            steps[label] = False
+
+    # latest contents, as opened by the open subcommand
+    if contents_number > 0 and steps["Flux RSS"]:
+        with open_local_file(rss_args.local_index_file) as fd:
+            links = [
+                link.text
+                for link in ET.parse(fd).findall(".//item/link")
+                if link.text and link.text.startswith(defaults_settings.site_base_url)
+            ]
+        for link in links[:contents_number]:
+            try:
+                store.fetch(
+                    remote_url=url_content_source(in_url=link, mode="raw"),
+                    content_type="text/plain; charset=utf-8",
+                )
+                steps[link] = True
+            except Exception as err:
+                logger.error(f"Unable to download {link}. Trace: {err}")
+                steps[link] = False
+
+    return steps
+
+
+# ############################################################################
+# ########## CLI #################
+# ################################
+
+
+def parser_cache(
+    subparser: argparse.ArgumentParser,
+) -> argparse.ArgumentParser:
+    """Set the argument parser for subcommand.
+
+    Args:
+        subparser (argparse.ArgumentParser): parser to set up
+
+    Returns:
+        argparse.ArgumentParser: parser ready to use
+    """
+    subparser.add_argument(
+        "action",
+        choices=["inspect", "prune", "warm"],
+        default="inspect",
+        help="Action à effectuer : lister le contenu du cache (inspect), libérer de "
+        "la place en retirant les entrées et dossiers les moins récemment utilisés "
+        "(prune) ou "
+        "télécharger à l'avance les index et les derniers contenus (warm). Valeur "
+        "par défaut : inspect.",
+        nargs="?",
+    )
+
+    subparser.add_argument(
+        "--max-size",
+        default=None,
+        dest="max_size",
+        help="Avec prune : taille maximale (en Mo) à laquelle réduire le cache. Par "
+        "défaut, celle de la variable d'environnement GEOTRIBU_CACHE_MAX_SIZE.",
+        type=float,
+    )
+
+    subparser.add_argument(
+        "--all",
+        action="store_true",
+        default=False,
+        dest="opt_remove_all",
+        help="Avec prune : vider entièrement le cache.",
+    )
+
+    subparser.add_argument(
+        "-n",
+        "--contents-number",
+        default=10,
+        dest="contents_number",
+        help="Avec warm : nombre de derniers contenus à télécharger. Valeur par "
+        "défaut : 10.",
+        type=int,
+    )
+
+    subparser.add_argument(
+        "-o",
+        "--format-output",
+        choices=[
+            "json",
+            "table",
+        ],
+        default=getenv("GEOTRIBU_RESULTATS_FORMAT", "table"),
+        help="Format de sortie de inspect.",
+        dest="format_output",
+        metavar="GEOTRIBU_RESULTATS_FORMAT",
+    )
+
+    subparser.set_defaults(func=run)
+
+    return subparser
+
+
+# ############################################################################
+# ########## MAIN ################
+# ################################
+
+
+def run(args: argparse.Namespace):
+    """Run the sub command logic.
+
+    Inspect, prune or warm the local cache.
+
+    Args:
+        args (argparse.Namespace): arguments passed to the subcommand
+    """
+    logger.debug(f"Running {args.command} with {args}")
+
+    store = get_cache_store()
+
+    if args.action == "prune":
+        removed_count, freed_size = prune_cache(
+            store=store,
+            max_size=(
+                None if args.max_size is None else int(args.max_size * 1024 * 1024)
+            ),
+            remove_all=args.opt_remove_all,
+        )
+        print(
+            f":broom: {removed_count} entrée(s) retirée(s) du cache, "
+            f"{convert_octets(freed_size)} libéré(s)."
+        )
+    elif args.action == "warm":
+        steps = warm_cache(store=store, contents_number=args.contents_number)
+        for description, success in steps.items():
+            print(f"{':white_check_mark:' if success else ':x:'} {description}")
+        if not all(steps.values()):
+            sys.exit(1)
+    elif args.format_output == "json":
+        # written as is: rich would render the dict repr and interpret brackets
+        sys.stdout.write(
+            json.dumps(
+                inspect_cache(store=store, format_output=args.format_output),
+                indent=4,
+                default=str,
+            )
+            + "\n"
+        )
+    else:
+        print(inspect_cache(store=store, format_output=args.format_output))
@@ -19,12 +19,8 @@ from rich.markdown import Markdown
 from geotribu_cli.console import console
 from geotribu_cli.constants import GeotribuDefaults
 from geotribu_cli.history import CliHistory
-from geotribu_cli.utils.file_downloader import download_remote_file_to_local
-from geotribu_cli.utils.formatters import (
-    url_add_utm,
-    url_content_name,
-    url_content_source,
-)
+from geotribu_cli.utils.cache_store import get_cache_store
+from geotribu_cli.utils.formatters import url_add_utm, url_content_source
 from geotribu_cli.utils.start_uri import open_uri
 
 # ############################################################################
@@ -52,11 +48,8 @@ def open_content(content_uri: str, application: str = "shell"):
     if application == "shell" and content_uri.startswith(
         defaults_settings.site_base_url
     ):
-        local_file_path = download_remote_file_to_local(
-            remote_url_to_download=url_content_source(in_url=content_uri, mode="raw"),
-            local_file_path=defaults_settings.geotribu_working_folder.joinpath(
-                f"remote/{url_content_name(url_content_source(content_uri, mode='raw'))}"
-            ),
+        local_file_path = get_cache_store().fetch(
+            remote_url=url_content_source(in_url=content_uri, mode="raw"),
             content_type="text/plain; charset=utf-8",
         )
 
@@ -12,14 +12,12 @@ Author: Julien M. (https://github.com/guts)
 
 # Standard library
 import argparse
-import json
 import logging
 import sys
 from os import getenv
 from pathlib import Path
 from sys import platform as opersys
 from urllib.parse import urlsplit, urlunsplit
-from urllib.request import Request, urlopen
 
 # 3rd party library
 from packaging.version import Version
@@ -36,6 +34,8 @@ from geotribu_cli.__about__ import __version__ as actual_version
 from geotribu_cli.console import console
 from geotribu_cli.constants import GeotribuDefaults
 from geotribu_cli.utils.file_downloader import download_remote_file_to_local
+from geotribu_cli.utils.http_client import get_http_session
+from geotribu_cli.utils.retry_policy import get_retry_policy
 from geotribu_cli.utils.str2bool import str2bool
 
 # #############################################################################
@@ -105,16 +105,20 @@ def get_latest_release(api_repo_url: str) -> dict:
         )
         headers["Authorization"] = f"Bearer {getenv('GITHUB_TOKEN')}"
 
-    request = Request(url=request_url, headers=headers)
+    def fetch_release(timeout: tuple[float, float]) -> dict:
+        with get_http_session().get(
+            url=request_url, headers=headers, timeout=timeout
+        ) as response:
+            response.raise_for_status()
+            return response.json()
 
     try:
-        with urlopen(request) as response:
-            if response.status == 200:
-                release_info = json.loads(response.read())
-        return release_info
+        return get_retry_policy().call(
+            fetch_release, description=f"Récupération de {request_url}"
+        )
     except Exception as err:
         logger.error(err)
-        if "rate limit exceeded" in err:
+        if "rate limit exceeded" in str(err):
             logger.error(
                 "Rate limit of GitHub API exeeded. Try again later (generally "
                 "in 15 minutes) or set GITHUB_TOKEN as environment variable with a "
@@ -0,0 +1,189 @@
+#! python3  # noqa: E265
+
+"""
+Atomic writes and inter-process locks for the files of the working folder.
+
+Several CLI processes can run at the same time (a cron job and an interactive user
+for example). Files are written into a temporary file then published with an atomic
+rename, so a reader never gets a half-written file, and a lock per resource makes
+sure only one process refreshes it while the others wait and reuse the result.
+"""
+
+# #############################################################################
+# ########## Libraries #############
+# ##################################
+
+# Standard library
+import logging
+import os
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from sys import platform as opersys
+from tempfile import NamedTemporaryFile
+from time import monotonic, sleep
+from typing import IO
+
+if opersys == "win32":
+    import msvcrt
+else:
+    import fcntl
+
+# #############################################################################
+# ########## Globals ###############
+# ##################################
+
+# logs
+logger = logging.getLogger(__name__)
+
+# permissions of the written files, like files created by open() with the umask of
+# the process (temporary files are only readable by their owner)
+_umask = os.umask(0o022)
+os.umask(_umask)
+FILE_MODE: int = 0o666 & ~_umask
+
+# #############################################################################
+# ########## Functions #############
+# ##################################
+
+
+def get_lock_path(resource_path: Path) -> Path:
+    """Get the path to the lock file of a resource.
+
+    Args:
+        resource_path (Path): path to the locked resource
+
+    Returns:
+        Path: path to the lock file (same folder, suffixed with .lock)
+    """
+    return resource_path.with_name(f"{resource_path.name}.lock")
+
+
+def _try_lock(fd: IO) -> bool:
+    """Try to get an exclusive lock on an open file, without blocking.
+
+    Args:
+        fd (IO): open lock file
+
+    Returns:
+        bool: True if the lock has been acquired
+    """
+    try:
+        if opersys == "win32":
+            msvcrt.locking(fd.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            fcntl.flock(fd.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return False
+    return True
+
+
+def _unlock(fd: IO):
+    """Release the lock on an open file.
+
+    Args:
+        fd (IO): open lock file
+    """
+    if opersys == "win32":
+        fd.seek(0)
+        msvcrt.locking(fd.fileno(), msvcrt.LK_UNLCK, 1)
+    else:
+        fcntl.flock(fd.fileno(), fcntl.LOCK_UN)
+
+
+@contextmanager
+def file_lock(
+    resource_path: Path, timeout: float = 600, poll_interval: float = 0.1
+) -> Iterator[Path]:
+    """Exclusive lock on a resource, shared between processes.
+
+    Once acquired, callers should check again if the resource still needs to be \
+    refreshed: another process may have done it while waiting for the lock.
+
+    Args:
+        resource_path (Path): path to the resource to lock
+        timeout (float, optional): maximum time to wait for the lock, in seconds. \
+            Defaults to 600.
+        poll_interval (float, optional): time between two attempts, in seconds. \
+            Defaults to 0.1.
+
+    Raises:
+        TimeoutError: if the lock can't be acquired before the timeout
+
+    Yields:
+        Iterator[Path]: path to the lock file
+    """
+    lock_path = get_lock_path(resource_path)
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+
+    with lock_path.open(mode="a+b") as fd:
+        deadline = monotonic() + timeout
+        is_waiting_logged = False
+        while not _try_lock(fd):
+            if monotonic() > deadline:
+                raise TimeoutError(
+                    f"Impossible d'obtenir le verrou {lock_path} après {timeout} "
+                    "secondes."
+                )
+            if not is_waiting_logged:
+                logger.info(
+                    f"{resource_path} est en cours de mise à jour par un autre "
+                    "processus. Attente..."
+                )
+                is_waiting_logged = True
+            sleep(poll_interval)
+
+        try:
+            yield lock_path
+        finally:
+            _unlock(fd)
+
+
+@contextmanager
+def atomic_write(output_path: Path, mode: str = "wb") -> Iterator[IO]:
+    """Write a file through a temporary file in the same folder, renamed to the \
+    output path only once everything has been written. The file gets the \
+    permissions of a file created by open(), according to the umask.
+
+    Args:
+        output_path (Path): path to the file to write
+        mode (str, optional): opening mode, "wb" or "w". Defaults to "wb".
+
+    Yields:
+        Iterator[IO]: file object to write into
+    """
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    with NamedTemporaryFile(
+        mode=mode,
+        dir=output_path.parent,
+        prefix=f".{output_path.name}.",
+        suffix=".tmp",
+        delete=False,
+        **({} if "b" in mode else {"encoding": "UTF-8"}),
+    ) as tmp_file:
+        tmp_path = Path(tmp_file.name)
+        try:
+            yield tmp_file
+            tmp_file.flush()
+            os.fsync(tmp_file.fileno())
+            os.chmod(tmp_path, FILE_MODE)
+        except BaseException:
+            tmp_file.close()
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+    try:
+        os.replace(tmp_path, output_path)
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+# #############################################################################
+# ##### Stand alone program ########
+# ##################################
+
+if __name__ == "__main__":
+    """Standalone execution."""
+    pass
@@ -0,0 +1,543 @@
+#! python3  # noqa: E265
+
+"""Content-addressed store of the remote files kept in the working folder.
+
+Each downloaded file is stored once, named after the SHA-256 of its content, in
+objects/. A manifest maps every remote URL to its object with the HTTP validators
+(ETag, Last-Modified) used to revalidate it, its size and its last access.
+
+The other folders of the working folder holding downloaded files and the files built
+from them (search indexes, feeds, comments...) are managed by the store as a whole:
+each one counts in its size like an entry, last used when one of its files was last
+written. The store is bounded: once larger than its maximum size, the least recently
+used entries and folders are evicted, and objects which are no longer referenced are
+removed. Evicted folders are downloaded and built again when needed.
+"""
+
+# ############################################################################
+# ########## IMPORTS #############
+# ################################
+
+# standard library
+import hashlib
+import logging
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass
+from os import getenv
+from pathlib import Path
+from time import time
+
+# 3rd party
+import orjson
+from requests.exceptions import RequestException
+
+# package
+from geotribu_cli.__about__ import __title_clean__, __version__
+from geotribu_cli.constants import GeotribuDefaults
+from geotribu_cli.utils.atomic_files import atomic_write, file_lock
+from geotribu_cli.utils.file_downloader import (
+    get_local_file_metadata_path,
+    read_local_file_metadata,
+    remove_partial_file,
+    request_remote_file,
+)
+from geotribu_cli.utils.http_client import OfflineModeError, is_offline_mode
+from geotribu_cli.utils.retry_policy import RetryPolicy, get_retry_policy
+
+# ############################################################################
+# ########## GLOBALS #############
+# ################################
+
+logger = logging.getLogger(__name__)
+defaults_settings = GeotribuDefaults()
+
+CACHE_MANIFEST_FORMAT_VERSION: int = 1
+# default maximum size of the store, including the cached folders, in Mo
+DEFAULT_CACHE_MAX_SIZE: int = 500
+# folders of the working folder holding downloaded files and files built from them
+CACHED_FOLDERS: tuple[str, ...] = ("comments", "img", "rss", "search", "templates")
+# minimum delay between two updates of the last access of an entry, in seconds: a
+# cache hit doesn't rewrite the manifest if the entry has been used recently
+CACHE_ACCESS_TIME_RESOLUTION: int = 60
+
+# ############################################################################
+# ########## CLASSES #############
+# ################################
+
+
+@dataclass
+class CacheEntry:
+    """Remote file stored in the cache.
+
+    Attributes:
+        url (str): remote URL
+        sha256 (str): SHA-256 of the content, naming the stored object
+        size (int): size of the content, in bytes
+        etag (str | None): ETag returned by the server
+        last_modified (str | None): Last-Modified returned by the server
+        fetched (float): last download or revalidation, as a timestamp
+        last_access (float): last use, as a timestamp
+    """
+
+    url: str
+    sha256: str
+    size: int
+    etag: str | None = None
+    last_modified: str | None = None
+    fetched: float = 0
+    last_access: float = 0
+
+
+@dataclass
+class CachedFolder:
+    """Folder of the working folder managed by the store as a whole.
+
+    Attributes:
+        path (Path): folder path
+        size (int): size of its files, in bytes
+        last_access (float): last modification of its files, as a timestamp
+    """
+
+    path: Path
+    size: int
+    last_access: float
+
+
+class CacheStore:
+    """Content-addressed store of remote files with a size-bounded LRU eviction."""
+
+    def __init__(
+        self,
+        cache_folder: Path,
+        max_size: int | None = None,
+        cached_folders: Iterable[Path] = (),
+    ):
+        """Class initialization.
+
+        Args:
+            cache_folder (Path): folder of the store
+            max_size (int | None, optional): maximum size of the stored objects and \
+                of the cached folders, in bytes. Defaults to None \
+                (get_cache_max_size()).
+            cached_folders (Iterable[Path], optional): folders managed by the store \
+                as a whole. Defaults to ().
+        """
+        self.cache_folder = cache_folder
+        self.max_size = get_cache_max_size() if max_size is None else max_size
+        self.cached_folders = tuple(cached_folders)
+        self.objects_folder = cache_folder / "objects"
+        # downloads in progress, named after their URL, to be resumed if interrupted
+        self.incoming_folder = cache_folder / "incoming"
+        self.manifest_path = cache_folder / "manifest.json"
+
+    def get_object_path(self, sha256: str) -> Path:
+        """Get the path to a stored object.
+
+        Args:
+            sha256 (str): SHA-256 of the content
+
+        Returns:
+            Path: path to the object, in a subfolder named after its first 2 characters
+        """
+        return self.objects_folder / sha256[:2] / sha256
+
+    def read_manifest(self) -> dict[str, CacheEntry]:
+        """Read the entries of the store.
+
+        Returns:
+            dict[str, CacheEntry]: entries by URL. Empty if the manifest doesn't \
+                exist or is invalid.
+        """
+        try:
+            with self.manifest_path.open(mode="rb") as fd:
+                manifest = orjson.loads(fd.read())
+        except FileNotFoundError:
+            return {}
+        except (OSError, orjson.JSONDecodeError) as err:
+            logger.warning(f"Unable to read cache manifest {self.manifest_path}: {err}")
+            return {}
+
+        if manifest.get("version") != CACHE_MANIFEST_FORMAT_VERSION:
+            logger.warning(
+                f"Cache manifest {self.manifest_path} has been written with format "
+                f"version {manifest.get('version')}: it's ignored."
+            )
+            return {}
+
+        entries = {}
+        for entry in manifest.get("entries", []):
+            try:
+                entries[entry["url"]] = CacheEntry(**entry)
+            except (KeyError, TypeError) as err:
+                logger.debug(f"Invalid cache entry {entry}: {err}")
+        return entries
+
+    def write_manifest(self, entries: dict[str, CacheEntry]):
+        """Write the entries of the store. Should be called while holding the lock \
+            on the manifest.
+
+        Args:
+            entries (dict[str, CacheEntry]): entries by URL
+        """
+        self.cache_folder.mkdir(parents=True, exist_ok=True)
+        with atomic_write(self.manifest_path) as fd:
+            fd.write(
+                orjson.dumps(
+                    {
+                        "version": CACHE_MANIFEST_FORMAT_VERSION,
+                        "entries": [asdict(entry) for entry in entries.values()],
+                    }
+                )
+            )
+
+    def get_size(self, entries: dict[str, CacheEntry] | None = None) -> int:
+        """Get the size of the stored objects, each one counted once even if \
+            several URLs share it.
+
+        Args:
+            entries (dict[str, CacheEntry] | None, optional): entries by URL. \
+                Defaults to None (read from the manifest).
+
+        Returns:
+            int: size in bytes
+        """
+        if entries is None:
+            entries = self.read_manifest()
+        return sum({entry.sha256: entry.size for entry in entries.values()}.values())
+
+    def read_cached_folders(self) -> list[CachedFolder]:
+        """Measure the cached folders. Lock files are ignored: they're never removed.
+
+        Returns:
+            list[CachedFolder]: cached folders with files to evict
+        """
+        cached_folders = []
+        for folder in self.cached_folders:
+            if not folder.is_dir():
+                continue
+            size = last_access = 0
+            for file_path in folder.rglob("*"):
+                if file_path.suffix == ".lock":
+                    continue
+                try:
+                    file_stat = file_path.stat()
+                except FileNotFoundError:
+                    # removed by another process meanwhile
+                    continue
+                if file_path.is_file():
+                    size += file_stat.st_size
+                    last_access = max(last_access, file_stat.st_mtime)
+            if not last_access:
+                # no files, or only lock files
+                continue
+            cached_folders.append(
+                CachedFolder(path=folder, size=size, last_access=last_access)
+            )
+        return cached_folders
+
+    def get_total_size(self) -> int:
+        """Get the size of the stored objects and of the cached folders.
+
+        Returns:
+            int: size in bytes
+        """
+        return self.get_size() + sum(
+            cached_folder.size for cached_folder in self.read_cached_folders()
+        )
+
+    def remove_cached_folder(self, folder: Path):
+        """Remove the files of a cached folder, except the lock files which may be \
+            held by other processes.
+
+        Args:
+            folder (Path): cached folder
+        """
+        for file_path in sorted(folder.rglob("*"), reverse=True):
+            try:
+                if file_path.is_dir():
+                    file_path.rmdir()
+                elif file_path.suffix != ".lock":
+                    file_path.unlink()
+            except OSError as err:
+                # in use, not empty because of a lock file or removed meanwhile
+                logger.debug(f"Unable to remove {file_path} from the cache: {err}")
+        logger.debug(f"Cached folder emptied: {folder}")
+
+    def _update_entry(self, entry: CacheEntry):
+        """Add or replace an entry in the manifest.
+
+        Args:
+            entry (CacheEntry): entry to store
+        """
+        with file_lock(self.manifest_path):
+            entries = self.read_manifest()
+            entries[entry.url] = entry
+            self.write_manifest(entries)
+
+    def fetch(
+        self,
+        remote_url: str,
+        expiration_rotating_hours: int = 24,
+        user_agent: str = f"{__title_clean__}/{__version__}",
+        content_type: str | None = None,
+        retry_policy: RetryPolicy | None = None,
+    ) -> Path:
+        """Get the local copy of a remote file, downloading it or revalidating it \
+            against the server if it's missing or outdated.
+
+        Like download_remote_file_to_local, an outdated copy is used as is in \
+        offline mode or if the download fails. Entries beyond the maximum size of \
+        the store are evicted after each download.
+
+        Args:
+            remote_url (str): remote URL of the file
+            expiration_rotating_hours (int, optional): number in hours to consider \
+                the local copy outdated. Defaults to 24.
+            user_agent (str, optional): user agent to use to perform the request. \
+                Defaults to f"{__title_clean__}/{__version__}".
+            content_type (str | None, optional): HTTP content-type. Defaults to None.
+            retry_policy (RetryPolicy | None, optional): timeouts and retries. \
+                Defaults to None (policy set by the environment variables).
+
+        Raises:
+            OfflineModeError: in offline mode, if the file has never been downloaded
+            RequestException: if the file has never been downloaded and the download \
+                failed
+
+        Returns:
+            Path: path to the stored object, to be read only
+        """
+        entry = self.read_manifest().get(remote_url)
+        object_path = self.get_object_path(entry.sha256) if entry else None
+        if object_path is None or not object_path.exists():
+            entry = object_path = None
+
+        if object_path is not None and (
+            is_offline_mode()
+            or time() - entry.fetched < expiration_rotating_hours * 3600
+        ):
+            logger.info(f"{remote_url} lu depuis le cache : {object_path}")
+            if time() - entry.last_access >= CACHE_ACCESS_TIME_RESOLUTION:
+                entry.last_access = time()
+                self._update_entry(entry)
+            return object_path
+
+        if is_offline_mode():
+            raise OfflineModeError(
+                f"Mode hors-ligne : {remote_url} n'a encore jamais été téléchargé. "
+                "Relancer la commande sans l'option --offline (ou GEOTRIBU_OFFLINE)."
+            )
+
+        headers = {"User-Agent": user_agent}
+        if content_type:
+            headers["Accept"] = content_type
+        if entry is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+
+        incoming_path = (
+            self.incoming_folder
+            / hashlib.sha256(remote_url.encode("utf-8")).hexdigest()
+        )
+        self.incoming_folder.mkdir(parents=True, exist_ok=True)
+        with file_lock(incoming_path):
+            # another process may have downloaded it while this one waited for the lock
+            locked_entry = self.read_manifest().get(remote_url)
+            if (
+                locked_entry is not None
+                and locked_entry.fetched > (entry.fetched if entry else 0)
+                and self.get_object_path(locked_entry.sha256).exists()
+            ):
+                logger.info(
+                    f"{remote_url} téléchargé entre-temps par un autre processus."
+                )
+                return self.get_object_path(locked_entry.sha256)
+
+            try:
+                is_modified = (retry_policy or get_retry_policy()).call(
+                    lambda timeout: request_remote_file(
+                        remote_url=remote_url,
+                        local_file_path=incoming_path,
+                        headers=headers,
+                        timeout=timeout,
+                    ),
+                    description=f"Téléchargement de {remote_url}",
+                )
+            except RequestException as error:
+                if object_path is None:
+                    logger.error(f"Downloading {remote_url} failed. Trace: {error}")
+                    raise error
+                logger.warning(
+                    f"Le fichier distant {remote_url} n'a pas pu être téléchargé : la "
+                    f"copie locale ({object_path}), périmée, est utilisée. "
+                    f"Trace : {error}"
+                )
+                entry.last_access = time()
+                self._update_entry(entry)
+                return object_path
+
+            if not is_modified:
+                logger.info(f"{remote_url} n'a pas été modifié : {object_path}")
+                entry.fetched = entry.last_access = time()
+                self._update_entry(entry)
+                return object_path
+
+            # the downloader hashes the content while writing it
+            metadata = read_local_file_metadata(incoming_path)
+            object_path = self.get_object_path(metadata["sha256"])
+            object_path.parent.mkdir(parents=True, exist_ok=True)
+            entry = CacheEntry(
+                url=remote_url,
+                sha256=metadata["sha256"],
+                size=incoming_path.stat().st_size,
+                etag=metadata.get("etag"),
+                last_modified=metadata.get("last_modified"),
+                fetched=time(),
+                last_access=time(),
+            )
+            # stored and referenced at once: never evicted as an orphan meanwhile
+            with file_lock(self.manifest_path):
+                # same name, same content: replacing an existing object is harmless
+                incoming_path.replace(object_path)
+                entries = self.read_manifest()
+                entries[remote_url] = entry
+                self.write_manifest(entries)
+            get_local_file_metadata_path(incoming_path).unlink(missing_ok=True)
+
+        logger.info(f"{remote_url} stocké dans le cache : {object_path}")
+        self.evict(keep=remote_url)
+        return object_path
+
+    def evict(
+        self, max_size: int | None = None, keep: str | None = None
+    ) -> list[CacheEntry | CachedFolder]:
+        """Remove the least recently used entries and cached folders until the store \
+            fits in its maximum size, then the objects which are no longer referenced.
+
+        Args:
+            max_size (int | None, optional): maximum size, in bytes. Defaults to \
+                None (maximum size of the store).
+            keep (str | None, optional): URL of an entry to keep anyway, e.g. the one \
+                being returned. Defaults to None.
+
+        Returns:
+            list[CacheEntry | CachedFolder]: evicted entries and folders
+        """
+        if max_size is None:
+            max_size = self.max_size
+
+        evicted: list[CacheEntry | CachedFolder] = []
+        with file_lock(self.manifest_path):
+            entries = self.read_manifest()
+            cached_folders = self.read_cached_folders()
+            folders_size = sum(cached_folder.size for cached_folder in cached_folders)
+            size = self.get_size(entries) + folders_size
+            for candidate in sorted(
+                (*entries.values(), *cached_folders),
+                key=lambda candidate: candidate.last_access,
+            ):
+                if size <= max_size:
+                    break
+                if isinstance(candidate, CachedFolder):
+                    self.remove_cached_folder(candidate.path)
+                    folders_size -= candidate.size
+                else:
+                    if candidate.url == keep:
+                        continue
+                    del entries[candidate.url]
+                evicted.append(candidate)
+                size = self.get_size(entries) + folders_size
+
+            if any(isinstance(candidate, CacheEntry) for candidate in evicted):
+                self.write_manifest(entries)
+            removed_size = self.remove_orphans(entries)
+
+        if evicted:
+            logger.info(
+                f"{len(evicted)} entrée(s) retirée(s) du cache ({removed_size} octets "
+                "d'objets orphelins)."
+            )
+        return evicted
+
+    def remove_orphans(self, entries: dict[str, CacheEntry]) -> int:
+        """Remove the objects which are not referenced by any entry. Should be \
+            called while holding the lock on the manifest.
+
+        Args:
+            entries (dict[str, CacheEntry]): entries by URL
+
+        Returns:
+            int: size of the removed objects, in bytes
+        """
+        referenced = {entry.sha256 for entry in entries.values()}
+        removed_size = 0
+        for object_path in self.objects_folder.glob("*/*"):
+            if object_path.name in referenced:
+                continue
+            try:
+                removed_size += object_path.stat().st_size
+                object_path.unlink()
+            except FileNotFoundError:
+                continue
+            logger.debug(f"Orphan cache object removed: {object_path}")
+        return removed_size
+
+    def clear(self) -> list[CacheEntry | CachedFolder]:
+        """Remove every entry of the store, the cached folders and the interrupted \
+            downloads.
+
+        Returns:
+            list[CacheEntry | CachedFolder]: removed entries and folders
+        """
+        with file_lock(self.manifest_path):
+            entries = self.read_manifest()
+            cached_folders = self.read_cached_folders()
+            self.write_manifest({})
+            self.remove_orphans({})
+            for cached_folder in cached_folders:
+                self.remove_cached_folder(cached_folder.path)
+
+        for incoming_path in self.incoming_folder.glob("*.part"):
+            remove_partial_file(incoming_path)
+        return [*entries.values(), *cached_folders]
+
+
+# ############################################################################
+# ########## FUNCTIONS ###########
+# ################################
+
+
+def get_cache_max_size() -> int:
+    """Get the maximum size of the cache store from the environment variable \
+    GEOTRIBU_CACHE_MAX_SIZE, in Mo.
+
+    Returns:
+        int: maximum size, in bytes
+    """
+    max_size = getenv("GEOTRIBU_CACHE_MAX_SIZE", DEFAULT_CACHE_MAX_SIZE)
+    try:
+        max_size = float(max_size)
+    except (TypeError, ValueError):
+        logger.warning(
+            f"Invalid value for GEOTRIBU_CACHE_MAX_SIZE: {max_size}. "
+            f"Default value is used: {DEFAULT_CACHE_MAX_SIZE}."
+        )
+        max_size = DEFAULT_CACHE_MAX_SIZE
+
+    return int(max(max_size, 0) * 1024 * 1024)
+
+
+def get_cache_store() -> CacheStore:
+    """Get the cache store of the working folder.
+
+    Returns:
+        CacheStore: store in the cache subfolder of the working folder, managing its \
+            cached folders
+    """
+    working_folder = defaults_settings.geotribu_working_folder
+    return CacheStore(
+        cache_folder=working_folder / "cache",
+        cached_folders=(working_folder / name for name in CACHED_FOLDERS),
+    )
@@ -15,12 +15,15 @@ import logging
 import xml.etree.ElementTree as ET
 from decimal import Decimal
 from pathlib import Path
-from urllib import request
 
 # 3rd party
 import imagesize
 from PIL import ImageFile
 
+# package
+from geotribu_cli.utils.http_client import get_http_session
+from geotribu_cli.utils.retry_policy import get_retry_policy
+
 # #############################################################################
 # ########## Globals ###############
 # ##################################
@@ -73,16 +76,20 @@ def get_image_dimensions_by_url(url: str) -> tuple[int, int] | None:
 
     :return Tuple[int, int]: dimensions tuple (width,height)
     """
-    with request.urlopen(url) as file:
-        parser = ImageFile.Parser()
-        while True:
-            data = file.read(1024)
-            if not data:
-                break
-            parser.feed(data)
-            if parser.image:
-                return parser.image.size
-        return None
+
+    def read_image_size(timeout: tuple[float, float]) -> tuple[int, int] | None:
+        with get_http_session().get(url=url, stream=True, timeout=timeout) as response:
+            response.raise_for_status()
+            parser = ImageFile.Parser()
+            for data in response.iter_content(chunk_size=1024):
+                parser.feed(data)
+                if parser.image:
+                    return parser.image.size
+            return None
+
+    return get_retry_policy().call(
+        read_image_size, description=f"Lecture des dimensions de {url}"
+    )
 
 
 def get_svg_size(image_filepath: Path) -> tuple[int, int]:
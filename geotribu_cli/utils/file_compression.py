@@ -0,0 +1,177 @@
+#! python3  # noqa: E265
+
+"""Compression of the files kept in the local cache.
+
+Downloaded files can be stored compressed on disk (gzip or zstd) to reduce their
+footprint. Readers don't need to know how a file has been stored: the compression is
+detected from the first bytes of the file, which JSON, XML or Markdown never start
+with, and the content is decompressed on the fly.
+"""
+
+# ############################################################################
+# ########## IMPORTS #############
+# ################################
+
+# standard library
+import gzip
+import logging
+from collections.abc import Iterator
+from contextlib import contextmanager
+from os import getenv
+from pathlib import Path
+from typing import IO, BinaryIO
+
+# 3rd party
+try:
+    from compression import zstd  # Python 3.14+
+
+    ZSTD_INSTALLED = True
+except ImportError:
+    try:
+        import zstandard as zstd
+
+        ZSTD_INSTALLED = True
+    except ImportError:
+        ZSTD_INSTALLED = False
+
+# ############################################################################
+# ########## GLOBALS #############
+# ################################
+
+# logs
+logger = logging.getLogger(__name__)
+
+COMPRESSION_GZIP: str = "gzip"
+COMPRESSION_ZSTD: str = "zstd"
+# first bytes of the compressed files
+COMPRESSION_MAGIC_NUMBERS: dict[str, bytes] = {
+    COMPRESSION_GZIP: b"\x1f\x8b",
+    COMPRESSION_ZSTD: b"\x28\xb5\x2f\xfd",
+}
+
+# ############################################################################
+# ########## FUNCTIONS ###########
+# ################################
+
+
+def get_cache_compression() -> str | None:
+    """Get the compression to use for the cached files, from the environment \
+    variable GEOTRIBU_CACHE_COMPRESSION.
+
+    zstd requires Python 3.14 or the zstandard package: gzip is used instead if it's \
+    not available.
+
+    Returns:
+        str | None: COMPRESSION_GZIP, COMPRESSION_ZSTD or None to store files as is
+    """
+    compression = getenv("GEOTRIBU_CACHE_COMPRESSION", "").strip().lower()
+    if compression in ("", "none", "false", "0"):
+        return None
+
+    if compression not in COMPRESSION_MAGIC_NUMBERS:
+        logger.warning(
+            f"Invalid value for GEOTRIBU_CACHE_COMPRESSION: {compression}. "
+            f"Accepted values: none, {', '.join(COMPRESSION_MAGIC_NUMBERS)}. "
+            "Files are stored uncompressed."
+        )
+        return None
+
+    if compression == COMPRESSION_ZSTD and not ZSTD_INSTALLED:
+        logger.warning(
+            "zstd compression requires Python 3.14 or the zstandard package. "
+            "gzip is used instead."
+        )
+        return COMPRESSION_GZIP
+
+    return compression
+
+
+def detect_file_compression(file_path: Path) -> str | None:
+    """Detect the compression of a file from its first bytes.
+
+    Args:
+        file_path (Path): path to the file
+
+    Returns:
+        str | None: COMPRESSION_GZIP, COMPRESSION_ZSTD or None if not compressed
+    """
+    with file_path.open(mode="rb") as fd:
+        header = fd.read(4)
+
+    for compression, magic_number in COMPRESSION_MAGIC_NUMBERS.items():
+        if header.startswith(magic_number):
+            return compression
+    return None
+
+
+def open_local_file(
+    file_path: Path, mode: str = "rb", encoding: str | None = None
+) -> IO:
+    """Open a local file for reading, decompressing it on the fly if it has been \
+    stored compressed.
+
+    Args:
+        file_path (Path): path to the file
+        mode (str, optional): "rb" for bytes or "r"/"rt" for text. Defaults to "rb".
+        encoding (str | None, optional): text encoding. Defaults to None.
+
+    Raises:
+        ModuleNotFoundError: if the file is zstd-compressed but zstd is not available
+
+    Returns:
+        IO: file object, to be closed by the caller
+    """
+    compression = detect_file_compression(file_path)
+    if compression is None:
+        return file_path.open(mode=mode, encoding=encoding)
+
+    read_mode = "rb" if "b" in mode else "rt"
+    if compression == COMPRESSION_GZIP:
+        return gzip.open(file_path, mode=read_mode, encoding=encoding)
+
+    if not ZSTD_INSTALLED:
+        raise ModuleNotFoundError(
+            f"{file_path} is compressed with zstd, which requires Python 3.14 or the "
+            "zstandard package."
+        )
+    return zstd.open(file_path, mode=read_mode, encoding=encoding)
+
+
+def read_local_file(file_path: Path) -> bytes:
+    """Read the whole content of a local file, decompressed if needed.
+
+    Args:
+        file_path (Path): path to the file
+
+    Returns:
+        bytes: file content
+    """
+    with open_local_file(file_path) as fd:
+        return fd.read()
+
+
+@contextmanager
+def compressed_writer(fd: BinaryIO, compression: str | None) -> Iterator[BinaryIO]:
+    """Wrap a binary file object to compress what is written into it. The wrapped \
+    file object is left open.
+
+    Args:
+        fd (BinaryIO): file object to write into
+        compression (str | None): COMPRESSION_GZIP, COMPRESSION_ZSTD or None to \
+            write as is
+
+    Yields:
+        Iterator[BinaryIO]: file object compressing on write
+    """
+    if compression is None:
+        yield fd
+    elif compression == COMPRESSION_GZIP:
+        # no name nor modification time: same content, same bytes
+        with gzip.GzipFile(filename="", mode="wb", fileobj=fd, mtime=0) as writer:
+            yield writer
+    elif zstd.__name__ == "zstandard":
+        with zstd.ZstdCompressor().stream_writer(fd, closefd=False) as writer:
+            yield writer
+    else:
+        with zstd.ZstdFile(fd, mode="wb") as writer:
+            yield writer
@@ -6,19 +6,36 @@
 # ################################
 
 # standard library
+import atexit
+import hashlib
 import logging
+import shutil
+import warnings
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from functools import lru_cache
 from pathlib import Path
-from urllib.error import HTTPError
+from threading import Thread
+from time import monotonic
 
 # 3rd party
-from requests import Session
+import orjson
+from requests import Response
 from requests.exceptions import ConnectionError, HTTPError
 from requests.utils import requote_uri
 
 # package
 from geotribu_cli.__about__ import __title_clean__, __version__
+from geotribu_cli.utils.atomic_files import atomic_write, file_lock
+from geotribu_cli.utils.file_compression import compressed_writer, get_cache_compression
 from geotribu_cli.utils.file_stats import is_file_older_than
-from geotribu_cli.utils.proxies import get_proxy_settings
+from geotribu_cli.utils.http_client import (
+    OfflineModeError,
+    get_http_session,
+    is_offline_mode,
+)
+from geotribu_cli.utils.retry_policy import RetryPolicy, get_retry_policy
 
 # ############################################################################
 # ########## GLOBALS #############
@@ -27,23 +44,609 @@ from geotribu_cli.utils.proxies import get_proxy_settings
 # logs
 logger = logging.getLogger(__name__)
 
+# remote URL, local path, expiration in hours
+DownloadSpec = tuple[str, Path, int]
+
+# chunk size used to download files, in bytes, adapted to the file size
+DOWNLOAD_CHUNK_SIZE_MIN: int = 64 * 1024
+DOWNLOAD_CHUNK_SIZE_MAX: int = 1024 * 1024
+# expected number of chunks for a file of known size
+_DOWNLOAD_CHUNKS_TARGET: int = 32
+
+# maximum time to wait for the background revalidations at exit, in seconds
+BACKGROUND_REVALIDATION_EXIT_TIMEOUT: float = 5
+# local file path -> thread revalidating it
+_BACKGROUND_REVALIDATIONS: dict[Path, Thread] = {}
+
 # ############################################################################
 # ########## FUNCTIONS ###########
 # ################################
 
 
+def get_local_file_metadata_path(local_file_path: Path) -> Path:
+    """Get the path to the metadata sidecar file of a downloaded file.
+
+    Args:
+        local_file_path (Path): local path to the downloaded file
+
+    Returns:
+        Path: path to the sidecar file (same folder, suffixed with .meta.json)
+    """
+    return local_file_path.with_name(f"{local_file_path.name}.meta.json")
+
+
+def read_local_file_metadata(local_file_path: Path) -> dict:
+    """Read the metadata (remote URL, HTTP validators, hash...) stored alongside a \
+        local file.
+
+    Args:
+        local_file_path (Path): local path to the file
+
+    Returns:
+        dict: metadata. Empty if the sidecar file does not exist or is invalid.
+    """
+    metadata_path = get_local_file_metadata_path(local_file_path)
+    if not metadata_path.is_file():
+        return {}
+
+    try:
+        with metadata_path.open(mode="rb") as fd:
+            metadata = orjson.loads(fd.read())
+    except orjson.JSONDecodeError as err:
+        logger.debug(f"Invalid metadata file {metadata_path}. Trace: {err}")
+        return {}
+
+    return metadata if isinstance(metadata, dict) else {}
+
+
+def write_local_file_metadata(local_file_path: Path, metadata: dict) -> Path:
+    """Write the metadata of a local file into its sidecar file.
+
+    Args:
+        local_file_path (Path): local path to the file
+        metadata (dict): metadata to store
+
+    Returns:
+        Path: path to the sidecar file
+    """
+    metadata_path = get_local_file_metadata_path(local_file_path)
+    with atomic_write(metadata_path) as fd:
+        fd.write(orjson.dumps(metadata))
+    return metadata_path
+
+
+def get_download_chunk_size(content_length: int | None) -> int:
+    """Get the size of the chunks to read while downloading a file: larger files \
+        are read by larger chunks, to limit the number of read and write calls.
+
+    Args:
+        content_length (int | None): size of the file to download, in bytes, None if \
+            unknown
+
+    Returns:
+        int: chunk size, in bytes
+    """
+    if not content_length:
+        return DOWNLOAD_CHUNK_SIZE_MIN * 4
+
+    return min(
+        max(content_length // _DOWNLOAD_CHUNKS_TARGET, DOWNLOAD_CHUNK_SIZE_MIN),
+        DOWNLOAD_CHUNK_SIZE_MAX,
+    )
+
+
+def is_local_file_up_to_date(
+    local_file_path: Path, expiration_rotating_hours: int = 24
+) -> bool:
+    """Check if a local file exists and is not outdated.
+
+    Args:
+        local_file_path (Path): local path to the file
+        expiration_rotating_hours (int, optional): number in hours to consider the \
+            local file outdated. Defaults to 24.
+
+    Returns:
+        bool: True if the file doesn't need to be downloaded again
+    """
+    if not local_file_path.exists():
+        return False
+
+    if is_file_older_than(
+        local_file_path=local_file_path,
+        expiration_rotating_hours=expiration_rotating_hours,
+    ):
+        logger.info(
+            f"Le fichier local ({local_file_path}) est périmé: "
+            f"il a été mis à jour il y a plus de {expiration_rotating_hours} heures."
+            "Il a besoin d'être revalidé auprès du serveur."
+        )
+        return False
+
+    logger.info(
+        f"Le fichier local ({local_file_path}) est à jour par rapport au délai "
+        f"d'expiration spécifié ({expiration_rotating_hours}). Pas besoin de le retélécharger.",
+    )
+    return True
+
+
+def get_partial_file_path(local_file_path: Path) -> Path:
+    """Get the path to the partial file where a download is written until it's \
+        complete.
+
+    Args:
+        local_file_path (Path): local path to the downloaded file
+
+    Returns:
+        Path: path to the partial file (same folder, suffixed with .part)
+    """
+    return local_file_path.with_name(f"{local_file_path.name}.part")
+
+
+def remove_partial_file(partial_file_path: Path):
+    """Remove a partial download and its metadata.
+
+    Args:
+        partial_file_path (Path): path to the partial file
+    """
+    partial_file_path.unlink(missing_ok=True)
+    get_local_file_metadata_path(partial_file_path).unlink(missing_ok=True)
+
+
+def get_resume_headers(partial_file_path: Path, remote_url: str) -> dict[str, str]:
+    """Get the headers to request the rest of a partial download. The partial file \
+        is removed if it can't be resumed.
+
+    Args:
+        partial_file_path (Path): path to the partial file
+        remote_url (str): remote URL of the file being downloaded
+
+    Returns:
+        dict[str, str]: Range and If-Range headers, empty if the download has to \
+            start from the beginning
+    """
+    if not partial_file_path.exists():
+        return {}
+
+    partial_metadata = read_local_file_metadata(partial_file_path)
+    validator = partial_metadata.get("etag") or partial_metadata.get("last_modified")
+    partial_size = partial_file_path.stat().st_size
+    if partial_metadata.get("url") != remote_url or not validator or not partial_size:
+        logger.debug(f"Partial download {partial_file_path} can't be resumed.")
+        remove_partial_file(partial_file_path)
+        return {}
+
+    return {
+        "Range": f"bytes={partial_size}-",
+        # the rest is sent only if the remote file did not change meanwhile
+        "If-Range": validator,
+        # byte ranges of a compressed transfer can't be appended to decoded bytes
+        "Accept-Encoding": "identity",
+    }
+
+
+def is_range_response_valid(response: Response, range_header: str) -> bool:
+    """Check if the response to a range request can be used to resume a download: \
+        either the requested range or the whole file if it changed meanwhile.
+
+    Args:
+        response (Response): response to the range request
+        range_header (str): requested range, as sent in the Range header
+
+    Returns:
+        bool: False if the partial download doesn't match the remote file anymore
+    """
+    if response.status_code == 416 or (
+        response.status_code == 206
+        and not response.headers.get("Content-Range", "").startswith(
+            range_header.replace("=", " ")
+        )
+    ):
+        logger.debug(
+            f"Partial download of {response.url} can't be resumed: HTTP "
+            f"{response.status_code} {response.headers.get('Content-Range', '')}."
+        )
+        return False
+    return True
+
+
+def is_response_resumable(response: Response) -> bool:
+    """Check if the download of a response body could be resumed if interrupted: \
+        the server doesn't refuse ranges, the body is not encoded and there is a \
+        strong validator to check the file did not change.
+
+    Args:
+        response (Response): response being downloaded
+
+    Returns:
+        bool: True if an interrupted download can be resumed
+    """
+    etag = response.headers.get("ETag", "")
+    return (
+        response.headers.get("Accept-Ranges", "").lower() != "none"
+        and response.headers.get("Content-Encoding", "identity") == "identity"
+        and bool(
+            (etag and not etag.startswith("W/"))
+            or response.headers.get("Last-Modified")
+        )
+    )
+
+
+def write_response_to_partial_file(
+    response: Response,
+    partial_file_path: Path,
+    remote_url: str,
+    chunk_size: int,
+) -> str:
+    """Write a response body into the partial file, appended to what has already \
+        been downloaded if it's the requested range.
+
+    Validators are stored alongside the partial file before writing, so an \
+    interrupted download is resumed by the next attempt. Partial files which can't \
+    be resumed are removed on failure.
+
+    Args:
+        response (Response): response to a full (200) or range (206) request
+        partial_file_path (Path): path to the partial file
+        remote_url (str): remote URL of the file being downloaded
+        chunk_size (int): size of each chunk to read and write in bytes
+
+    Returns:
+        str: SHA-256 of the whole downloaded content, in hexadecimal
+    """
+    content_hash = hashlib.sha256()
+    is_resumed = response.status_code == 206
+    if is_resumed:
+        # hash of the whole content: start with what has already been downloaded
+        with partial_file_path.open(mode="rb") as fd:
+            while chunk := fd.read(DOWNLOAD_CHUNK_SIZE_MAX):
+                content_hash.update(chunk)
+        logger.info(
+            f"Reprise du téléchargement de {remote_url} à partir de "
+            f"{partial_file_path.stat().st_size} octets."
+        )
+
+    is_resumable = is_resumed or is_response_resumable(response)
+    if is_resumable and not is_resumed:
+        write_local_file_metadata(
+            local_file_path=partial_file_path,
+            metadata={
+                "url": remote_url,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+            },
+        )
+    elif not is_resumable:
+        get_local_file_metadata_path(partial_file_path).unlink(missing_ok=True)
+
+    try:
+        with partial_file_path.open(mode="ab" if is_resumed else "wb") as partial_file:
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                if chunk:
+                    partial_file.write(chunk)
+                    content_hash.update(chunk)
+    except BaseException:
+        if not is_resumable:
+            remove_partial_file(partial_file_path)
+        raise
+
+    return content_hash.hexdigest()
+
+
+def finalize_partial_file(
+    partial_file_path: Path, local_file_path: Path, compression: str | None
+):
+    """Replace the local file with a complete download.
+
+    Args:
+        partial_file_path (Path): path to the complete partial file
+        local_file_path (Path): local path to the file
+        compression (str | None): compression to store the local file with, None to \
+            store it as is
+    """
+    if compression is None:
+        # atomic within the same folder: readers never get a partial file
+        partial_file_path.replace(local_file_path)
+    else:
+        with (
+            partial_file_path.open(mode="rb") as partial_file,
+            atomic_write(local_file_path) as buffile,
+            compressed_writer(buffile, compression=compression) as out_file,
+        ):
+            shutil.copyfileobj(partial_file, out_file, DOWNLOAD_CHUNK_SIZE_MAX)
+    remove_partial_file(partial_file_path)
+
+
+def request_remote_file(
+    remote_url: str,
+    local_file_path: Path,
+    headers: dict[str, str],
+    timeout: tuple[float, float],
+    chunk_size: int | None = None,
+    compress_at_rest: bool = False,
+) -> bool:
+    """Perform one attempt to download a remote file into the local file, resuming \
+        a previous partial download if possible.
+
+    Args:
+        remote_url (str): remote URL of the file to download
+        local_file_path (Path): local path to the file
+        headers (dict[str, str]): request headers, including the conditional ones
+        timeout (tuple[float, float]): connect and read timeouts, in seconds
+        chunk_size (int | None, optional): size of each chunk to read and write in \
+            bytes. Defaults to None (adapted to the size of the remote file).
+        compress_at_rest (bool, optional): store the local file compressed, if \
+            enabled by GEOTRIBU_CACHE_COMPRESSION. Defaults to False.
+
+    Raises:
+        RequestException: if the request or the transfer failed
+
+    Returns:
+        bool: False if the remote file has not been modified (HTTP 304)
+    """
+    partial_file_path = get_partial_file_path(local_file_path)
+
+    # a partial download is resumed, then started over if it can't be
+    for resume_headers in (get_resume_headers(partial_file_path, remote_url), {}):
+        with get_http_session().get(
+            url=requote_uri(remote_url),
+            headers={**headers, **resume_headers},
+            stream=True,
+            timeout=timeout,
+        ) as req:
+            if req.status_code == 304:
+                remove_partial_file(partial_file_path)
+                return False
+
+            if resume_headers and not is_range_response_valid(
+                response=req, range_header=resume_headers["Range"]
+            ):
+                remove_partial_file(partial_file_path)
+                continue
+
+            req.raise_for_status()
+
+            if chunk_size is None:
+                content_length = req.headers.get("Content-Length", "")
+                chunk_size = get_download_chunk_size(
+                    int(content_length) if content_length.isdigit() else None
+                )
+            compression = get_cache_compression() if compress_at_rest else None
+            logger.debug(
+                f"Downloading {remote_url}: HTTP {req.status_code}, transfer encoding "
+                f"{req.headers.get('Content-Encoding', 'identity')}, chunks of "
+                f"{chunk_size} bytes, stored with compression {compression}."
+            )
+
+            # hash of the decoded content, whatever the compression at rest
+            content_sha256 = write_response_to_partial_file(
+                response=req,
+                partial_file_path=partial_file_path,
+                remote_url=remote_url,
+                chunk_size=chunk_size,
+            )
+            finalize_partial_file(
+                partial_file_path=partial_file_path,
+                local_file_path=local_file_path,
+                compression=compression,
+            )
+
+            write_local_file_metadata(
+                local_file_path=local_file_path,
+                metadata={
+                    "url": remote_url,
+                    "etag": req.headers.get("ETag"),
+                    "last_modified": req.headers.get("Last-Modified"),
+                    "sha256": content_sha256,
+                },
+            )
+            break
+
+    return True
+
+
+def revalidate_local_file(
+    remote_url_to_download: str,
+    local_file_path: Path,
+    expiration_rotating_hours: int = 24,
+    user_agent: str = f"{__title_clean__}/{__version__}",
+    content_type: str | None = None,
+    chunk_size: int | None = None,
+    retry_policy: RetryPolicy | None = None,
+    compress_at_rest: bool = False,
+) -> Path:
+    """Download the remote file, or just revalidate the outdated local file against \
+        the server.
+
+    Args are the same as download_remote_file_to_local.
+
+    Raises:
+        RequestException: if the download failed after the attempts allowed by the \
+            retry policy
+
+    Returns:
+        Path: path to the local file
+    """
+    # only one process refreshes the file, the others wait and reuse the result
+    with file_lock(local_file_path):
+        if local_file_path.exists() and not is_file_older_than(
+            local_file_path=local_file_path,
+            expiration_rotating_hours=expiration_rotating_hours,
+        ):
+            logger.info(
+                f"Le fichier local ({local_file_path}) a été mis à jour par un autre "
+                "processus."
+            )
+            return local_file_path
+
+        local_metadata = (
+            read_local_file_metadata(local_file_path)
+            if local_file_path.exists()
+            else {}
+        )
+
+        # headers
+        headers = {"User-Agent": user_agent}
+        if content_type:
+            headers["Accept"] = content_type
+
+        # conditional request, only if validators match the same remote URL
+        if local_metadata.get("url") == remote_url_to_download:
+            if local_metadata.get("etag"):
+                headers["If-None-Match"] = local_metadata.get("etag")
+            if local_metadata.get("last_modified"):
+                headers["If-Modified-Since"] = local_metadata.get("last_modified")
+
+        is_modified = (retry_policy or get_retry_policy()).call(
+            lambda timeout: request_remote_file(
+                remote_url=remote_url_to_download,
+                local_file_path=local_file_path,
+                headers=headers,
+                timeout=timeout,
+                chunk_size=chunk_size,
+                compress_at_rest=compress_at_rest,
+            ),
+            description=f"Téléchargement de {remote_url_to_download}",
+        )
+
+        if not is_modified:
+            logger.info(
+                f"Le fichier distant {remote_url_to_download} n'a pas été "
+                f"modifié : le fichier local {local_file_path} est conservé."
+            )
+            local_file_path.touch(exist_ok=True)
+            return local_file_path
+
+        logger.info(
+            f"Le téléchargement du fichier distant {remote_url_to_download} dans "
+            f"{local_file_path} a réussi. "
+        )
+
+    return local_file_path
+
+
+def _revalidate_local_file_in_background(**download_kwargs):
+    """Revalidate an outdated local file, logging the failure instead of raising.
+
+    Args:
+        download_kwargs: arguments of revalidate_local_file
+    """
+    try:
+        revalidate_local_file(**download_kwargs)
+    except Exception as error:
+        logger.info(
+            f"La mise à jour en arrière-plan de {download_kwargs['local_file_path']} "
+            f"a échoué : le fichier local est conservé. Trace : {error}"
+        )
+
+
+@lru_cache(maxsize=1)
+def _register_background_revalidations_exit_wait():
+    """Wait for the background revalidations at exit, registered once."""
+    # session created first so that it's closed after the revalidations at exit
+    get_http_session()
+    atexit.register(wait_for_background_revalidations)
+
+
+def get_running_revalidations() -> list[Path]:
+    """List the local files being revalidated in the background, forgetting the \
+    ended revalidations.
+
+    Returns:
+        list[Path]: local file paths
+    """
+    for local_file_path, thread in tuple(_BACKGROUND_REVALIDATIONS.items()):
+        if not thread.is_alive():
+            del _BACKGROUND_REVALIDATIONS[local_file_path]
+
+    return list(_BACKGROUND_REVALIDATIONS)
+
+
+def start_background_revalidation(**download_kwargs) -> Thread:
+    """Revalidate an outdated local file in a background thread, unless it's already \
+    being revalidated.
+
+    The thread doesn't prevent the process from exiting: at exit, it's waited for \
+    BACKGROUND_REVALIDATION_EXIT_TIMEOUT seconds at most, then the revalidation is \
+    left to the next invocation, which resumes the partial download if any.
+
+    Args:
+        download_kwargs: arguments of revalidate_local_file
+
+    Returns:
+        Thread: started thread, or the one already revalidating the local file
+    """
+    _register_background_revalidations_exit_wait()
+
+    local_file_path = download_kwargs["local_file_path"]
+    if local_file_path in get_running_revalidations():
+        return _BACKGROUND_REVALIDATIONS[local_file_path]
+
+    thread = Thread(
+        target=_revalidate_local_file_in_background,
+        kwargs=download_kwargs,
+        name=f"GeotribuRevalidation-{local_file_path.name}",
+        daemon=True,
+    )
+    _BACKGROUND_REVALIDATIONS[local_file_path] = thread
+    thread.start()
+    return thread
+
+
+def wait_for_background_revalidations(
+    timeout: float | None = BACKGROUND_REVALIDATION_EXIT_TIMEOUT,
+):
+    """Wait for the background revalidations to end.
+
+    Args:
+        timeout (float | None, optional): maximum time to wait for all of them, in \
+            seconds. Defaults to BACKGROUND_REVALIDATION_EXIT_TIMEOUT. None to wait \
+            until they end.
+    """
+    deadline = None if timeout is None else monotonic() + timeout
+    for thread in tuple(_BACKGROUND_REVALIDATIONS.values()):
+        thread.join(None if deadline is None else max(deadline - monotonic(), 0))
+        if thread.is_alive():
+            logger.info(
+                f"Mise à jour en arrière-plan interrompue ({thread.name}) : elle "
+                "reprendra au prochain lancement."
+            )
+
+
 def download_remote_file_to_local(
     remote_url_to_download: str,
     local_file_path: Path,
     expiration_rotating_hours: int = 24,
     user_agent: str = f"{__title_clean__}/{__version__}",
     content_type: str | None = None,
-    chunk_size: int = 8192,
-    timeout=(800, 800),
+    chunk_size: int | None = None,
+    timeout: tuple[float, float] | float | None = None,
+    retry_policy: RetryPolicy | None = None,
+    compress_at_rest: bool = False,
+    stale_while_revalidate: bool = False,
 ) -> Path:
     """Check if the local index file exists. If not, download the search index from \
         remote URL. If it does exist, check if it has been modified.
 
+    When the local file is outdated, the HTTP validators (ETag, Last-Modified) stored
+    in its metadata sidecar file are sent to the server: if the remote file has not
+    been modified (HTTP 304), the local file is just touched to be fresh again.
+
+    The transfer is compressed when the server supports one of the encodings \
+    advertised by the HTTP session (gzip, deflate, and br or zstd if the brotli or \
+    zstandard packages are installed) and decoded while streaming. With \
+    compress_at_rest, the local file is stored compressed as set by the environment \
+    variable GEOTRIBU_CACHE_COMPRESSION: it must then be read with \
+    geotribu_cli.utils.file_compression.open_local_file.
+
+    The file is downloaded into a .part file, which replaces the local file once \
+    complete. If the download is interrupted, the next attempt requests only the \
+    missing bytes (HTTP Range), provided the remote file did not change (If-Range). \
+    Attempts are bounded and retried according to the retry policy.
+
+    An outdated local file is never removed: it's used as is if the download fails, \
+    in offline mode, and right away with stale_while_revalidate while it's \
+    revalidated in the background.
+
     Args:
         remote_url_to_download (str): remote URL of the file to download
         local_file_path (Path): local path to the file
@@ -52,75 +655,141 @@ def download_remote_file_to_local(
         user_agent (str, optional): user agent to use to perform the request. Defaults \
             to f"{__title_clean__}/{__version__}".
         content_type (str): HTTP content-type.
-        chunk_size (int): size of each chunk to read and write in bytes. Defaults to \
-            8192.
-        timeout (tuple, optional): custom timeout (request, response). Defaults to \
-            (800, 800).
+        chunk_size (int | None): size of each chunk to read and write in bytes. \
+            Defaults to None (adapted to the size of the remote file).
+        timeout (tuple[float, float] | float | None, optional): deprecated, use \
+            retry_policy instead. Custom timeout (connect, read), replacing the ones \
+            of the retry policy. Defaults to None.
+        retry_policy (RetryPolicy | None, optional): timeouts and retries. Defaults \
+            to None (policy set by the environment variables, see get_retry_policy).
+        compress_at_rest (bool, optional): store the local file compressed, if \
+            enabled by GEOTRIBU_CACHE_COMPRESSION. Defaults to False.
+        stale_while_revalidate (bool, optional): return an outdated local file \
+            without waiting for its revalidation. Defaults to False.
+
+    Raises:
+        OfflineModeError: in offline mode, if the file has never been downloaded
+        RequestException: if the file has never been downloaded and the download \
+            failed
 
     Returns:
         Path: path to the local file (should be the same as local_file_path)
     """
-    if local_file_path.exists():
-        if is_file_older_than(
-            local_file_path=local_file_path,
-            expiration_rotating_hours=expiration_rotating_hours,
-        ):
-            logger.info(
-                f"Le fichier local ({local_file_path}) est périmé: "
-                f"il a été mis à jour il y a plus de {expiration_rotating_hours} heures."
-                "Il a besoin d'être de nouveau téléchargé."
+    if timeout is not None:
+        warnings.warn(
+            "The timeout argument is deprecated, use retry_policy instead.",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        connect_timeout, read_timeout = (
+            timeout if isinstance(timeout, tuple) else (timeout, timeout)
+        )
+        retry_policy = replace(
+            retry_policy or get_retry_policy(),
+            connect_timeout=connect_timeout,
+            read_timeout=read_timeout,
+        )
+
+    if is_local_file_up_to_date(local_file_path, expiration_rotating_hours):
+        return local_file_path
+
+    download_kwargs = dict(
+        remote_url_to_download=remote_url_to_download,
+        local_file_path=local_file_path,
+        expiration_rotating_hours=expiration_rotating_hours,
+        user_agent=user_agent,
+        content_type=content_type,
+        chunk_size=chunk_size,
+        retry_policy=retry_policy,
+        compress_at_rest=compress_at_rest,
+    )
+
+    if is_offline_mode():
+        if not local_file_path.exists():
+            raise OfflineModeError(
+                f"Mode hors-ligne : {remote_url_to_download} n'a encore jamais été "
+                f"téléchargé ({local_file_path}). Relancer la commande sans l'option "
+                "--offline (ou GEOTRIBU_OFFLINE)."
             )
-            local_file_path.unlink(missing_ok=True)
+        logger.info(
+            f"Mode hors-ligne : le fichier local ({local_file_path}) est utilisé "
+            "bien que périmé."
+        )
+        return local_file_path
+
+    if local_file_path.exists() and stale_while_revalidate:
+        logger.info(
+            f"Le fichier local ({local_file_path}) est utilisé bien que périmé : "
+            "il est mis à jour en arrière-plan."
+        )
+        start_background_revalidation(**download_kwargs)
+        return local_file_path
+
+    try:
+        return revalidate_local_file(**download_kwargs)
+    except Exception as error:
+        if isinstance(error, HTTPError):
+            cause = "HTTPError"
+        elif isinstance(error, ConnectionError):
+            cause = "ConnectionError"
         else:
-            logger.info(
-                f"Le fichier local ({local_file_path}) est à jour par rapport au délai "
-                f"d'expiration spécifié ({expiration_rotating_hours}). Pas besoin de le retélécharger.",
+            cause = "Unknown error"
+
+        if not local_file_path.exists():
+            logger.error(
+                f"Downloading {remote_url_to_download} to {local_file_path} failed. "
+                f"Cause: {cause}. Trace: {error}"
             )
-            return local_file_path
+            raise error
 
-    # make sure parents folder exist
-    local_file_path.parent.mkdir(parents=True, exist_ok=True)
+        logger.warning(
+            f"Le fichier distant {remote_url_to_download} n'a pas pu être téléchargé "
+            f"({cause}) : le fichier local ({local_file_path}), périmé, est utilisé. "
+            f"Trace : {error}"
+        )
+        return local_file_path
 
-    # headers
-    headers = {"User-Agent": user_agent}
-    if content_type:
-        headers["Accept"] = content_type
 
-    try:
-        with Session() as dl_session:
-            dl_session.proxies.update(get_proxy_settings())
-            dl_session.headers.update(headers)
-
-            with dl_session.get(
-                url=requote_uri(remote_url_to_download), stream=True, timeout=timeout
-            ) as req:
-                req.raise_for_status()
-
-                with local_file_path.open(mode="wb") as buffile:
-                    for chunk in req.iter_content(chunk_size=chunk_size):
-                        if chunk:
-                            buffile.write(chunk)
-            logger.info(
-                f"Le téléchargement du fichier distant {remote_url_to_download} dans "
-                f"{local_file_path} a réussi. "
+def download_remote_files_to_local(
+    files_to_download: Iterable[DownloadSpec],
+    max_workers: int = 4,
+    compress_at_rest: bool = False,
+) -> list[Path | Exception]:
+    """Download several remote files at once, using a bounded pool of threads.
+
+    Each file goes through download_remote_file_to_local, so local files which are \
+        still fresh are not downloaded again.
+
+    Args:
+        files_to_download (Iterable[DownloadSpec]): (remote URL, local path, \
+            expiration in hours) of each file to download
+        max_workers (int, optional): maximum number of concurrent downloads. \
+            Defaults to 4.
+        compress_at_rest (bool, optional): store the local files compressed, if \
+            enabled by GEOTRIBU_CACHE_COMPRESSION. Defaults to False.
+
+    Returns:
+        list[Path | Exception]: for each file, in the same order, the local path or \
+            the exception raised while downloading it
+    """
+    files_to_download = tuple(files_to_download)
+    if not files_to_download:
+        return []
+
+    def _download(download_spec: DownloadSpec) -> Path | Exception:
+        remote_url, local_file_path, expiration_rotating_hours = download_spec
+        try:
+            return download_remote_file_to_local(
+                remote_url_to_download=remote_url,
+                local_file_path=local_file_path,
+                expiration_rotating_hours=expiration_rotating_hours,
+                compress_at_rest=compress_at_rest,
             )
-    except HTTPError as error:
-        logger.error(
-            f"Downloading {remote_url_to_download} to {local_file_path} failed. "
-            f"Cause: HTTPError. Trace: {error}"
-        )
-        raise error
-    except ConnectionError as error:
-        logger.error(
-            f"Downloading {remote_url_to_download} to {local_file_path} failed. "
-            f"Cause: ConnectionError. Trace: {error}"
-        )
-        raise error
-    except Exception as error:
-        logger.error(
-            f"Downloading {remote_url_to_download} to {local_file_path} failed. "
-            f"Cause: Unknown error. Trace: {error}"
-        )
-        raise error
+        except Exception as error:
+            return error
 
-    return local_file_path
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(max_workers, len(files_to_download))),
+        thread_name_prefix="GeotribuDownloader",
+    ) as executor:
+        return list(executor.map(_download, files_to_download))
@@ -0,0 +1,136 @@
+#! python3  # noqa: E265
+
+"""
+Process-wide HTTP session, shared by every network call of the CLI.
+
+Connections are kept alive and pooled per host, so successive requests to the same
+server (geotribu.fr, cdn.geotribu.fr, comments.geotribu.fr...) don't pay again for
+the TCP and TLS handshakes.
+
+In offline mode, the session is never handed out: cached copies are used instead.
+"""
+
+# #############################################################################
+# ########## Libraries #############
+# ##################################
+
+# Standard library
+import atexit
+import logging
+from functools import lru_cache
+from os import getenv
+
+# 3rd party
+from requests import Session
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ConnectionError
+
+# package
+from geotribu_cli.__about__ import __title_clean__, __version__
+from geotribu_cli.utils.proxies import get_proxy_settings
+from geotribu_cli.utils.str2bool import str2bool
+
+# #############################################################################
+# ########## Globals ###############
+# ##################################
+
+# logs
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE: int = 10
+
+# #############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+class OfflineModeError(ConnectionError):
+    """Raised when a network request is attempted in offline mode."""
+
+
+# #############################################################################
+# ########## Functions #############
+# ##################################
+
+
+def get_pool_size() -> int:
+    """Get the maximum number of connections to keep alive per host, from the \
+    environment variable GEOTRIBU_HTTP_POOL_SIZE.
+
+    Returns:
+        int: pool size, at least 1
+    """
+    pool_size = getenv("GEOTRIBU_HTTP_POOL_SIZE", DEFAULT_POOL_SIZE)
+    try:
+        pool_size = int(pool_size)
+    except (TypeError, ValueError):
+        logger.warning(
+            f"Invalid value for GEOTRIBU_HTTP_POOL_SIZE: {pool_size}. "
+            f"Default value is used: {DEFAULT_POOL_SIZE}."
+        )
+        return DEFAULT_POOL_SIZE
+
+    return max(pool_size, 1)
+
+
+def is_offline_mode() -> bool:
+    """Check if the network must not be used, from the environment variable \
+    GEOTRIBU_OFFLINE (also set by the --offline option of the CLI).
+
+    Returns:
+        bool: True in offline mode
+    """
+    return bool(str2bool(getenv("GEOTRIBU_OFFLINE", False)))
+
+
+def get_http_session() -> Session:
+    """Get the HTTP session shared by the whole process.
+
+    It's created on first call with the proxy settings, the default user-agent and \
+    a pool of keep-alive connections per host. It's closed at exit.
+
+    Raises:
+        OfflineModeError: in offline mode
+
+    Returns:
+        Session: shared requests session
+    """
+    if is_offline_mode():
+        raise OfflineModeError(
+            "Mode hors-ligne : aucune requête réseau n'est effectuée. Désactiver "
+            "l'option --offline (ou GEOTRIBU_OFFLINE) pour télécharger les fichiers "
+            "manquants."
+        )
+
+    return _create_http_session()
+
+
+@lru_cache
+def _create_http_session() -> Session:
+    """Create the HTTP session shared by the whole process, once.
+
+    Returns:
+        Session: shared requests session
+    """
+    pool_size = get_pool_size()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+
+    session = Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.proxies.update(get_proxy_settings())
+    session.headers.update({"User-Agent": f"{__title_clean__}/{__version__}"})
+
+    atexit.register(session.close)
+    logger.debug(f"Shared HTTP session created with a pool size of {pool_size}.")
+
+    return session
+
+
+# #############################################################################
+# ##### Stand alone program ########
+# ##################################
+
+if __name__ == "__main__":
+    """Standalone execution."""
+    pass
@@ -0,0 +1,299 @@
+#! python3  # noqa: E265
+
+"""Read large JSON files incrementally."""
+
+# ############################################################################
+# ########## IMPORTS #############
+# ################################
+
+# standard library
+import json
+import logging
+import re
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any, TextIO
+
+# package
+from geotribu_cli.utils.file_compression import open_local_file
+
+# ############################################################################
+# ########## GLOBALS #############
+# ################################
+
+# logs
+logger = logging.getLogger(__name__)
+
+_WHITESPACES: str = " \t\n\r"
+# characters which may follow a complete value
+_DELIMITERS: str = _WHITESPACES + ",:]}"
+# end of a string, escape sequence, structural character or end of a literal
+_STRING_SPECIALS = re.compile(r'["\\]')
+_STRUCTURE_CHARS = re.compile(r'["\[\]{}]')
+_LITERAL_END = re.compile(r"[\s,:\]}]")
+
+# ############################################################################
+# ########## CLASSES #############
+# ################################
+
+
+class _JsonValueScanner:
+    """Find where a JSON value ends, from the text pieces it spans. Pieces are \
+        scanned once, from where the previous one stopped, without decoding."""
+
+    def __init__(self, first_char: str):
+        """Class initialization.
+
+        Args:
+            first_char (str): first character of the value
+        """
+        # depth of nested arrays and objects, 0 for a string or a literal
+        self.depth = 0
+        self.is_literal = first_char not in '"[{'
+        self.is_in_string = False
+        # an escape sequence is split between two pieces
+        self.is_escape_pending = False
+
+    def feed(self, piece: str, start: int = 0) -> int | None:
+        """Scan the next piece of the value.
+
+        Args:
+            piece (str): text following the previous piece
+            start (int, optional): position of the value in the first piece. \
+                Defaults to 0.
+
+        Returns:
+            int | None: position after the end of the value in this piece, None if \
+                it continues in the next one
+        """
+        position = start
+        if self.is_escape_pending:
+            self.is_escape_pending = False
+            position += 1
+
+        if self.is_literal:
+            match = _LITERAL_END.search(piece, position)
+            return None if match is None else match.start()
+
+        while True:
+            if self.is_in_string:
+                match = _STRING_SPECIALS.search(piece, position)
+                if match is None:
+                    return None
+                if match.group() == "\\":
+                    if match.end() == len(piece):
+                        self.is_escape_pending = True
+                        return None
+                    position = match.end() + 1
+                    continue
+                self.is_in_string = False
+                position = match.end()
+                if self.depth == 0:
+                    return position
+                continue
+
+            match = _STRUCTURE_CHARS.search(piece, position)
+            if match is None:
+                return None
+            position = match.end()
+            char = match.group()
+            if char == '"':
+                self.is_in_string = True
+            elif char in "[{":
+                self.depth += 1
+            else:
+                self.depth -= 1
+                if self.depth == 0:
+                    return position
+
+
+class _JsonChunksReader:
+    """Decode JSON values one by one from a text stream read by chunks."""
+
+    def __init__(self, stream: TextIO, chunk_size: int):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.position = 0
+        self.is_exhausted = False
+
+    def read_chunk(self) -> bool:
+        """Append the next chunk of the stream to the buffer, dropping what has \
+            already been decoded.
+
+        Returns:
+            bool: False if the end of the stream has been reached
+        """
+        if self.is_exhausted:
+            return False
+
+        chunk = self.stream.read(self.chunk_size)
+        if not chunk:
+            self.is_exhausted = True
+            return False
+
+        self.buffer = self.buffer[self.position :] + chunk
+        self.position = 0
+        return True
+
+    def next_char(self) -> str:
+        """Consume and return the next character which is not a whitespace.
+
+        Raises:
+            ValueError: if the end of the stream has been reached
+
+        Returns:
+            str: character
+        """
+        while True:
+            while self.position < len(self.buffer):
+                char = self.buffer[self.position]
+                self.position += 1
+                if char not in _WHITESPACES:
+                    return char
+            if not self.read_chunk():
+                raise ValueError("Unexpected end of JSON data.")
+
+    def expect(self, expected_char: str):
+        """Consume the next character which is not a whitespace, checking it.
+
+        Args:
+            expected_char (str): expected character
+
+        Raises:
+            ValueError: if it's another character
+        """
+        char = self.next_char()
+        if char != expected_char:
+            raise ValueError(
+                f"Expecting '{expected_char}' but got '{char}' in JSON data."
+            )
+
+    def peek_char(self) -> str:
+        """Return the next character which is not a whitespace, without consuming it.
+
+        Returns:
+            str: character
+        """
+        char = self.next_char()
+        self.position -= 1
+        return char
+
+    def decode_value(self) -> Any:
+        """Decode the next JSON value, reading more chunks until it's complete.
+
+        Most values fit in the buffer and are decoded right away. Otherwise, the \
+            end of the value is searched first, scanning each chunk once, so that a \
+            value spanning many chunks is decoded once and not again on each chunk.
+
+        Raises:
+            ValueError: if the value is invalid
+
+        Returns:
+            Any: decoded value
+        """
+        first_char = self.peek_char()
+        try:
+            value, end = self.decoder.raw_decode(self.buffer, self.position)
+            # a literal (number, true...) may continue in the next chunk
+            if first_char in '"[{' or (
+                end < len(self.buffer) and self.buffer[end] in _DELIMITERS
+            ):
+                self.position = end
+                return value
+        except json.JSONDecodeError:
+            # incomplete or invalid: checked once its end is found
+            pass
+
+        scanner = _JsonValueScanner(first_char)
+        end = scanner.feed(self.buffer, self.position)
+        if end is None:
+            # the value continues in the next chunks: gather them, then join once
+            pieces = [self.buffer[self.position :]]
+            length = len(pieces[0])
+            while end is None:
+                chunk = "" if self.is_exhausted else self.stream.read(self.chunk_size)
+                if not chunk:
+                    self.is_exhausted = True
+                    if not scanner.is_literal:
+                        raise ValueError("Unexpected end of JSON data.")
+                    # a literal (number, true...) may end with the stream
+                    end = 0
+                    break
+                pieces.append(chunk)
+                end = scanner.feed(chunk)
+                if end is None:
+                    length += len(chunk)
+            end += length
+            self.buffer = "".join(pieces)
+            self.position = 0
+
+        try:
+            value, value_end = self.decoder.raw_decode(self.buffer, self.position)
+        except json.JSONDecodeError as err:
+            raise ValueError(f"Invalid JSON data. Trace: {err}") from err
+        if value_end != end:
+            raise ValueError(
+                f"Invalid JSON data: unexpected '{self.buffer[value_end]}' after a "
+                "value."
+            )
+
+        self.position = end
+        return value
+
+
+# ############################################################################
+# ########## FUNCTIONS ###########
+# ################################
+
+
+def iter_json_array_items(
+    json_filepath: Path, array_key: str, chunk_size: int = 64 * 1024
+) -> Iterator[Any]:
+    """Yield the items of an array stored under a key of a JSON object, one by one.
+
+    The file is read by chunks: only the current chunk and the decoded item are held \
+        in memory, instead of the whole file and all its objects. Other keys of the \
+        object placed before the array are decoded then dropped.
+
+    Args:
+        json_filepath (Path): path to the JSON file
+        array_key (str): key of the array in the root object
+        chunk_size (int, optional): number of characters read at once. Defaults to \
+            64 * 1024.
+
+    Raises:
+        ValueError: if the file is not a JSON object with an array under this key
+
+    Yields:
+        Any: decoded item
+    """
+    with open_local_file(json_filepath, mode="rt", encoding="UTF-8") as stream:
+        reader = _JsonChunksReader(stream=stream, chunk_size=chunk_size)
+        reader.expect("{")
+        if reader.peek_char() == "}":
+            raise ValueError(f"No '{array_key}' key in {json_filepath}.")
+
+        while True:
+            key = reader.decode_value()
+            reader.expect(":")
+            if key == array_key:
+                break
+            reader.decode_value()
+            if reader.next_char() != ",":
+                raise ValueError(f"No '{array_key}' key in {json_filepath}.")
+
+        reader.expect("[")
+        if reader.peek_char() == "]":
+            return
+
+        while True:
+            yield reader.decode_value()
+            separator = reader.next_char()
+            if separator == "]":
+                return
+            elif separator != ",":
+                raise ValueError(
+                    f"Expecting ',' or ']' but got '{separator}' in {json_filepath}."
+                )
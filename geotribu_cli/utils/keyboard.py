@@ -0,0 +1,156 @@
+#! python3  # noqa: E265
+
+"""Read the keys typed in the terminal one by one, without waiting for Enter."""
+
+# ############################################################################
+# ########## IMPORTS #############
+# ################################
+
+# standard library
+import codecs
+import logging
+import os
+import sys
+import time
+
+# ############################################################################
+# ########## GLOBALS #############
+# ################################
+
+# logs
+logger = logging.getLogger(__name__)
+
+KEY_BACKSPACE: str = "backspace"
+KEY_DOWN: str = "down"
+KEY_ENTER: str = "enter"
+KEY_ESCAPE: str = "escape"
+KEY_UP: str = "up"
+KEY_DELETE_WORD: str = "delete_word"
+KEY_DELETE_LINE: str = "delete_line"
+
+# characters and escape sequences of the special keys
+_SPECIAL_KEYS: dict[str, str] = {
+    "\r": KEY_ENTER,
+    "\n": KEY_ENTER,
+    "\x7f": KEY_BACKSPACE,
+    "\x08": KEY_BACKSPACE,
+    "\x17": KEY_DELETE_WORD,
+    "\x15": KEY_DELETE_LINE,
+    "\x1b": KEY_ESCAPE,
+    "\x1b[A": KEY_UP,
+    "\x1bOA": KEY_UP,
+    "\x1b[B": KEY_DOWN,
+    "\x1bOB": KEY_DOWN,
+    # Windows console: arrows are prefixed by \x00 or \xe0
+    "\x00H": KEY_UP,
+    "\xe0H": KEY_UP,
+    "\x00P": KEY_DOWN,
+    "\xe0P": KEY_DOWN,
+}
+# delay to wait for the end of an escape sequence, in seconds
+_ESCAPE_SEQUENCE_DELAY: float = 0.02
+
+# ############################################################################
+# ########## CLASSES #############
+# ################################
+
+
+class KeyboardReader:
+    """Context manager switching the terminal to unbuffered input (cbreak mode) \
+        and reading keys one by one. Ctrl+C still raises KeyboardInterrupt.
+
+    Special keys are returned as the KEY_* constants, other ones as the typed \
+        character.
+    """
+
+    def __init__(self):
+        self._is_windows = sys.platform == "win32"
+        self._fd: int | None = None
+        self._terminal_settings: list | None = None
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._pending: str = ""
+
+    def __enter__(self) -> "KeyboardReader":
+        if not self._is_windows:
+            import termios
+            import tty
+
+            self._fd = sys.stdin.fileno()
+            self._terminal_settings = termios.tcgetattr(self._fd)
+            tty.setcbreak(self._fd)
+        return self
+
+    def __exit__(self, *exc):
+        if self._terminal_settings is not None:
+            import termios
+
+            termios.tcsetattr(self._fd, termios.TCSADRAIN, self._terminal_settings)
+            self._terminal_settings = None
+
+    def _read_char(self, timeout: float | None) -> str | None:
+        """Read the next typed character.
+
+        Args:
+            timeout (float | None): maximum time to wait, in seconds. None to wait \
+                until a key is typed.
+
+        Returns:
+            str | None: character or None if nothing has been typed in time
+        """
+        if self._pending:
+            char, self._pending = self._pending[0], self._pending[1:]
+            return char
+
+        if self._is_windows:
+            import msvcrt
+
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while not msvcrt.kbhit():
+                if deadline is not None and time.monotonic() >= deadline:
+                    return None
+                time.sleep(0.005)
+            return msvcrt.getwch()
+
+        import select
+
+        while True:
+            readable, _, _ = select.select([self._fd], [], [], timeout)
+            if not readable:
+                return None
+            chars = self._decoder.decode(os.read(self._fd, 1024))
+            if chars:
+                self._pending = chars[1:]
+                return chars[0]
+            # incomplete multibyte character: keep reading
+
+    def read_key(self, timeout: float | None = None) -> str | None:
+        """Read the next typed key.
+
+        Args:
+            timeout (float | None, optional): maximum time to wait, in seconds. \
+                Defaults to None (wait until a key is typed).
+
+        Returns:
+            str | None: KEY_* constant for special keys, typed character for other \
+                ones, None if nothing has been typed in time
+        """
+        char = self._read_char(timeout)
+        if char is None:
+            return None
+
+        # on Windows, "à" is also the prefix of arrows, followed by the arrow code
+        if char == "\x1b" or (self._is_windows and char in ("\x00", "\xe0")):
+            sequence = char
+            while len(sequence) < 3 and (
+                sequence == "\x1b" or sequence not in _SPECIAL_KEYS
+            ):
+                next_char = self._read_char(_ESCAPE_SEQUENCE_DELAY)
+                if next_char is None:
+                    break
+                sequence += next_char
+            if sequence == "\xe0":
+                return sequence
+            # unknown sequences are ignored
+            return _SPECIAL_KEYS.get(sequence, "")
+
+        return _SPECIAL_KEYS.get(char, char)
@@ -0,0 +1,236 @@
+#! python3  # noqa: E265
+
+"""
+Retry policy shared by every network call of the CLI.
+
+Each attempt is bounded by connect and read timeouts, and retries by a total deadline,
+so that an unresponsive server can't block the CLI. Transient failures
+(connection errors, timeouts, interrupted transfers, some HTTP statuses) are retried
+after an exponential backoff with jitter, so concurrent clients don't retry at once.
+"""
+
+# #############################################################################
+# ########## Libraries #############
+# ##################################
+
+# Standard library
+import logging
+import random
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from os import getenv
+from time import monotonic, sleep
+from typing import TypeVar
+
+# 3rd party
+from requests.exceptions import (
+    ChunkedEncodingError,
+    ConnectionError,
+    HTTPError,
+    RequestException,
+    Timeout,
+)
+
+# package
+from geotribu_cli.utils.http_client import OfflineModeError
+
+# #############################################################################
+# ########## Globals ###############
+# ##################################
+
+# logs
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# #############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """How network calls are bounded and retried.
+
+    Attributes:
+        max_attempts (int): maximum number of attempts, including the first one
+        connect_timeout (float): maximum time to establish a connection, in seconds
+        read_timeout (float): maximum time to wait for data from the server between \
+            two bytes received, in seconds
+        retry_statuses (frozenset[int]): HTTP statuses worth retrying
+        backoff_factor (float): delay before the first retry, doubled for each next \
+            one, in seconds
+        backoff_max (float): maximum delay between two attempts, in seconds
+        jitter (float): part of each delay which is randomized, between 0 and 1
+        deadline (float | None): duration after which no new attempt is made, \
+            also bounding the timeouts of the attempts, in seconds. A transfer still \
+            receiving data is not interrupted. None for no limit.
+    """
+
+    max_attempts: int = 3
+    connect_timeout: float = 10
+    read_timeout: float = 30
+    retry_statuses: frozenset[int] = field(
+        default=frozenset((408, 425, 429, 500, 502, 503, 504))
+    )
+    backoff_factor: float = 0.5
+    backoff_max: float = 10
+    jitter: float = 0.5
+    deadline: float | None = 120
+
+    def is_retryable(self, error: Exception) -> bool:
+        """Check if a failed attempt is worth retrying.
+
+        Args:
+            error (Exception): error raised by the attempt
+
+        Returns:
+            bool: True for transient network errors and retryable HTTP statuses
+        """
+        if isinstance(error, OfflineModeError):
+            return False
+        if isinstance(error, HTTPError):
+            return (
+                error.response is not None
+                and error.response.status_code in self.retry_statuses
+            )
+        return isinstance(error, (ConnectionError, Timeout, ChunkedEncodingError))
+
+    def get_delay(self, attempt: int, error: Exception | None = None) -> float:
+        """Get the delay to wait before the next attempt.
+
+        Args:
+            attempt (int): number of the attempt which failed, starting at 1
+            error (Exception | None, optional): error raised by the attempt. Its \
+                Retry-After header, if any, is honored up to backoff_max. Defaults \
+                to None.
+
+        Returns:
+            float: delay, in seconds
+        """
+        response = getattr(error, "response", None)
+        # a response is falsy when its status is an error
+        retry_after = (
+            response.headers.get("Retry-After", "") if response is not None else ""
+        )
+        if retry_after.isdigit():
+            return min(float(retry_after), self.backoff_max)
+
+        delay = min(self.backoff_factor * 2 ** (attempt - 1), self.backoff_max)
+        return delay * (1 - self.jitter) + random.uniform(0, delay * self.jitter)
+
+    def call(
+        self,
+        func: Callable[[tuple[float, float]], T],
+        description: str = "",
+    ) -> T:
+        """Call a function performing network requests, retrying it on transient \
+        failures.
+
+        Args:
+            func (Callable[[tuple[float, float]], T]): function to call with the \
+                (connect, read) timeouts to use for its requests. It must be \
+                idempotent.
+            description (str, optional): description of the call for the logs. \
+                Defaults to "".
+
+        Raises:
+            RequestException: error of the last attempt, if not retryable or if \
+                attempts or time are exhausted
+
+        Returns:
+            T: result of the function
+        """
+        deadline = None if self.deadline is None else monotonic() + self.deadline
+        attempt = 1
+        while True:
+            timeout = (self.connect_timeout, self.read_timeout)
+            if deadline is not None:
+                # the last attempt can't exceed the deadline
+                remaining = max(deadline - monotonic(), 0.1)
+                timeout = (min(timeout[0], remaining), min(timeout[1], remaining))
+
+            try:
+                return func(timeout)
+            except RequestException as error:
+                if attempt >= self.max_attempts or not self.is_retryable(error):
+                    raise
+
+                delay = self.get_delay(attempt=attempt, error=error)
+                if deadline is not None and monotonic() + delay >= deadline:
+                    logger.error(
+                        f"{description or 'Requête'} : délai maximal de "
+                        f"{self.deadline} s dépassé après {attempt} tentative(s)."
+                    )
+                    raise
+
+                logger.warning(
+                    f"{description or 'Requête'} : échec de la tentative {attempt}/"
+                    f"{self.max_attempts} ({error}). Nouvelle tentative dans "
+                    f"{delay:.1f} s."
+                )
+                sleep(delay)
+                attempt += 1
+
+
+# #############################################################################
+# ########## Functions #############
+# ##################################
+
+
+def _get_env_number(name: str, default: float, minimum: float) -> float:
+    """Read a number from an environment variable.
+
+    Args:
+        name (str): environment variable name
+        default (float): value to use if the variable is not set or invalid
+        minimum (float): minimum accepted value
+
+    Returns:
+        float: value, at least minimum
+    """
+    value = getenv(name)
+    if value is None:
+        return default
+
+    try:
+        return max(float(value), minimum)
+    except ValueError:
+        logger.warning(
+            f"Invalid value for {name}: {value}. Default value is used: {default}."
+        )
+        return default
+
+
+def get_retry_policy() -> RetryPolicy:
+    """Get the retry policy set by the environment variables \
+    GEOTRIBU_HTTP_MAX_ATTEMPTS, GEOTRIBU_HTTP_CONNECT_TIMEOUT, \
+    GEOTRIBU_HTTP_READ_TIMEOUT and GEOTRIBU_HTTP_DEADLINE (0 for no limit).
+
+    Returns:
+        RetryPolicy: retry policy, default values for unset variables
+    """
+    default_policy = RetryPolicy()
+    deadline = _get_env_number(
+        "GEOTRIBU_HTTP_DEADLINE", default=default_policy.deadline, minimum=0
+    )
+    return RetryPolicy(
+        max_attempts=int(
+            _get_env_number(
+                "GEOTRIBU_HTTP_MAX_ATTEMPTS",
+                default=default_policy.max_attempts,
+                minimum=1,
+            )
+        ),
+        connect_timeout=_get_env_number(
+            "GEOTRIBU_HTTP_CONNECT_TIMEOUT",
+            default=default_policy.connect_timeout,
+            minimum=0.1,
+        ),
+        read_timeout=_get_env_number(
+            "GEOTRIBU_HTTP_READ_TIMEOUT",
+            default=default_policy.read_timeout,
+            minimum=0.1,
+        ),
+        deadline=deadline or None,
+    )
@@ -10,13 +10,15 @@ Usage from the repo root folder:
 
 # standard
 import unittest
-from os import getenv
+from os import environ, getenv
 from pathlib import Path
 from tempfile import TemporaryDirectory
+from unittest.mock import patch
 
 # project
 from geotribu_cli.__about__ import __title_clean__, __version__
 from geotribu_cli.social.mastodon_client import ExtendedMastodonClient
+from geotribu_cli.utils.http_client import OfflineModeError, get_http_session
 
 # ############################################################################
 # ########## Classes #############
@@ -56,6 +58,19 @@ class TestCustomMastodonClient(unittest.TestCase):
             "mapstodon.space",
         )
 
+    def test_session(self):
+        """The shared session must be used, and only retrieved on request."""
+        fake_token = "geotribu-tests-fake-access-token"
+        masto_client = ExtendedMastodonClient(
+            access_token=fake_token, version_check_mode="none"
+        )
+        self.assertIs(masto_client.session, get_http_session())
+
+        with patch.dict(environ, {"GEOTRIBU_OFFLINE": "true"}):
+            masto_client = ExtendedMastodonClient(access_token=fake_token)
+            with self.assertRaises(OfflineModeError):
+                masto_client.session
+
     @unittest.skipIf(
         condition=not getenv("GEOTRIBU_MASTODON_API_ACCESS_TOKEN"),
         reason="Le jeton d'API Mastodon est requis pour exécuter ce test.",
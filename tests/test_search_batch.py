@@ -0,0 +1,111 @@
+#! python3  # noqa E265
+
+"""
+Usage from the repo root folder:
+
+.. code-block:: bash
+    # for whole tests
+    python -m unittest tests.test_search_batch
+    # for specific test
+    python -m unittest tests.test_search_batch.TestSearchBatch.test_run_batch
+"""
+
+# standard library
+import argparse
+import unittest
+from datetime import date
+from io import StringIO
+
+# 3rd party
+import orjson
+from lunr import lunr
+
+# project
+from geotribu_cli.search.search_batch import parse_batch_line, run_batch
+
+# ############################################################################
+# ########## Globals #############
+# ################################
+
+SAMPLE_ARGS: dict = {
+    "search_term": None,
+    "filter_type": None,
+    "filter_date_start": date(2020, 1, 1),
+    "results_number": 5,
+}
+
+# ############################################################################
+# ########## Classes #############
+# ################################
+
+
+class TestSearchBatch(unittest.TestCase):
+    """Test batch searches."""
+
+    def test_parse_batch_line(self):
+        """Plain and JSON lines must override the subcommand arguments."""
+        args = argparse.Namespace(**SAMPLE_ARGS)
+        query_args_names = ("filter_type", "filter_date_start", "results_number")
+
+        query_args = parse_batch_line("title:qgis", args, query_args_names)
+        self.assertEqual(query_args.search_term, "title:qgis")
+        self.assertEqual(query_args.results_number, 5)
+
+        query_args = parse_batch_line(
+            '{"search_term": "qgis", "filter_date_start": "2022-01-01"}',
+            args,
+            query_args_names,
+        )
+        self.assertEqual(query_args.search_term, "qgis")
+        self.assertEqual(query_args.filter_date_start, date(2022, 1, 1))
+        # subcommand arguments are left untouched
+        self.assertEqual(args.filter_date_start, date(2020, 1, 1))
+
+        for invalid_line in (
+            '{"filter_type": "rdp"}',
+            '{"search_term": "qgis", "local_index_file": "/tmp/index.json"}',
+            '{"search_term": "qgis"',
+        ):
+            with self.subTest(line=invalid_line), self.assertRaises(ValueError):
+                parse_batch_line(invalid_line, args, query_args_names)
+
+    def test_run_batch(self):
+        """Every query must get its own JSON line, errors included."""
+        idx = lunr(
+            ref="name",
+            fields=["name"],
+            documents=[{"name": "qgis"}, {"name": "postgis"}],
+            languages="en",
+        )
+
+        def search(query_args: argparse.Namespace) -> dict:
+            results = idx.search(query_args.search_term)
+            return {"results": [result.get("ref") for result in results]}
+
+        output_stream = StringIO()
+        count_errors = run_batch(
+            args=argparse.Namespace(
+                **SAMPLE_ARGS,
+                batch_file=StringIO('qgis\n\n{"search_term": "post*"}\nname:\n'),
+            ),
+            search=search,
+            query_args_names=("results_number",),
+            output_stream=output_stream,
+        )
+
+        self.assertEqual(count_errors, 1)
+        responses = [
+            orjson.loads(line) for line in output_stream.getvalue().splitlines()
+        ]
+        self.assertEqual(len(responses), 3)
+        self.assertEqual(responses[0], {"search_term": "qgis", "results": ["qgis"]})
+        self.assertEqual(responses[1].get("results"), ["postgis"])
+        self.assertEqual(responses[2].get("line"), 4)
+        self.assertIn("error", responses[2])
+
+
+# ############################################################################
+# ####### Stand-alone run ########
+# ################################
+if __name__ == "__main__":
+    unittest.main()
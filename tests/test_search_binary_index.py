@@ -0,0 +1,364 @@
+#! python3  # noqa E265
+
+"""
+Usage from the repo root folder:
+
+.. code-block:: bash
+    # for whole tests
+    python -m unittest tests.test_search_binary_index
+    # for specific test
+    python -m unittest tests.test_search_binary_index.TestSearchBinaryIndex.test_same_results_as_lunr
+"""
+
+# standard library
+import unittest
+from datetime import date
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+# 3rd party
+from lunr import lunr
+
+# project
+from geotribu_cli.__about__ import __title_clean__, __version__
+from geotribu_cli.search.binary_index import (
+    BinaryIndexReader,
+    get_edit_distance,
+    load_binary_index,
+    write_binary_index,
+)
+from geotribu_cli.search.contents_metadata import get_content_attributes
+
+# ############################################################################
+# ########## Globals #############
+# ################################
+
+SAMPLE_DOCUMENTS: tuple[dict, ...] = (
+    {
+        "location": "articles/2020/2020-01-01_qgis-python/",
+        "title": "QGIS and Python",
+        "tags": ["QGIS", "Python"],
+        "text": "Automate your maps with PyQGIS scripts.",
+    },
+    {
+        "location": "articles/2020/2020-01-01_qgis-python/#install",
+        "title": "Installation",
+        "tags": [],
+        "text": "Install QGIS then open the Python console.",
+    },
+    {
+        "location": "rdp/2021/rdp_2021-02-03/#news",
+        "title": "Latest news",
+        "tags": ["PostGIS"],
+        "text": "PostGIS 3.1 and QGIS 3.16 have been released.",
+    },
+    {
+        "location": "articles/2022/2022-05-04_openlayers/",
+        "title": "OpenLayers for dummies",
+        "tags": ["OpenLayers", "JavaScript"],
+        "text": "Display your PostGIS layers in a web map.",
+    },
+)
+
+# ############################################################################
+# ########## Classes #############
+# ################################
+
+
+class TestSearchBinaryIndex(unittest.TestCase):
+    """Test binary search index."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Build a small index once for all tests."""
+        cls.idx = lunr(
+            ref="location",
+            fields=[
+                dict(field_name="title", boost=10),
+                dict(field_name="tags", boost=5),
+                dict(field_name="text"),
+            ],
+            documents=SAMPLE_DOCUMENTS,
+            languages="en",
+        )
+
+    def test_same_results_as_lunr(self):
+        """Search results must be identical to those of the original lunr index."""
+        with TemporaryDirectory(
+            prefix=f"{__title_clean__}_{__version__}_binary_index_"
+        ) as tempo_dir:
+            binary_path = write_binary_index(
+                idx=self.idx, output_path=Path(tempo_dir, "index.bin")
+            )
+            reader = BinaryIndexReader(binary_path)
+            binary_idx = reader.as_lunr_index()
+
+            for query in (
+                "qgis",
+                "postgis -qgis",
+                "+qgis +python",
+                "title:qgis",
+                "post*",
+                "*gis",
+                "qgiss~1",
+                "-qgis",
+                "unknown",
+            ):
+                with self.subTest(query=query):
+                    self.assertEqual(
+                        [(r["ref"], r["score"]) for r in self.idx.search(query)],
+                        [(r["ref"], r["score"]) for r in binary_idx.search(query)],
+                    )
+
+            # mapping must be released to allow the file to be removed (Windows)
+            reader.close()
+            self.assertTrue(reader._mmap.closed)
+
+    def test_reader_term_dictionary(self):
+        """Test term lookups in the memory-mapped dictionary."""
+        with TemporaryDirectory(
+            prefix=f"{__title_clean__}_{__version__}_binary_index_"
+        ) as tempo_dir:
+            binary_path = write_binary_index(
+                idx=self.idx, output_path=Path(tempo_dir, "index.bin")
+            )
+            reader = BinaryIndexReader(binary_path)
+
+            self.assertEqual(reader.docs_count, len(SAMPLE_DOCUMENTS))
+            self.assertEqual(reader.fields, ["title", "tags", "text"])
+            self.assertIsNotNone(reader.find_term("qgi"))
+            self.assertIsNone(reader.find_term("kinkeliba"))
+
+            start, end = reader.prefix_range(b"post")
+            self.assertGreater(end, start)
+            for position in range(start, end):
+                self.assertTrue(reader.terms[position].startswith(b"post"))
+
+            reader.close()
+            self.assertTrue(reader._mmap.closed)
+
+    def test_restrict(self):
+        """Restricted index must return the matching documents with the same scores."""
+        with TemporaryDirectory(
+            prefix=f"{__title_clean__}_{__version__}_binary_index_"
+        ) as tempo_dir:
+            binary_path = write_binary_index(
+                idx=self.idx,
+                output_path=Path(tempo_dir, "index.bin"),
+                doc_attributes=get_content_attributes,
+            )
+            binary_idx = load_binary_index(binary_path)
+            all_results = {r["ref"]: r["score"] for r in binary_idx.search("qgis")}
+
+            # articles only
+            articles_idx = binary_idx.restrict(doc_types=(1,))
+            self.assertEqual(
+                {r["ref"]: r["score"] for r in articles_idx.search("qgis")},
+                {
+                    ref: score
+                    for ref, score in all_results.items()
+                    if ref.startswith("articles/")
+                },
+            )
+
+            # published since 2021
+            recent_idx = binary_idx.restrict(date_min=date(2021, 1, 1).toordinal())
+            self.assertEqual(
+                [r["ref"] for r in recent_idx.search("qgis")],
+                ["rdp/2021/rdp_2021-02-03/#news"],
+            )
+            self.assertEqual(
+                [r["ref"] for r in recent_idx.search("-qgis")],
+                ["articles/2022/2022-05-04_openlayers/"],
+            )
+
+            # matching documents are counted before and after the filter
+            results, count, count_unfiltered = recent_idx.iter_search("qgis")
+            self.assertEqual((len(list(results)), count), (1, 1))
+            self.assertEqual(count_unfiltered, len(all_results))
+            results, count, count_unfiltered = binary_idx.restrict(
+                date_min=date(2030, 1, 1).toordinal()
+            ).iter_search("qgis")
+            self.assertEqual((list(results), count), ([], 0))
+            self.assertEqual(count_unfiltered, len(all_results))
+            self.assertEqual(binary_idx.iter_search("qgis")[1:], (3, 3))
+            # same counts as without filter, for every kind of clause
+            for query in ("qgis", "+qgis +python", "qgis -python", "-qgis", "python"):
+                with self.subTest(query=query):
+                    self.assertEqual(
+                        recent_idx.iter_search(query)[2],
+                        binary_idx.iter_search(query)[1],
+                    )
+
+            # nothing to filter
+            self.assertIs(binary_idx.restrict(), binary_idx)
+
+    def test_search_top_k(self):
+        """Best results must be the first ones of lunr, with the same scores."""
+        with TemporaryDirectory(
+            prefix=f"{__title_clean__}_{__version__}_binary_index_"
+        ) as tempo_dir:
+            binary_path = write_binary_index(
+                idx=self.idx,
+                output_path=Path(tempo_dir, "index.bin"),
+                doc_attributes=get_content_attributes,
+            )
+            binary_idx = load_binary_index(binary_path)
+
+            for query in (
+                "qgis",
+                "postgis -qgis",
+                "+qgis +python",
+                "title:qgis^2 python",
+                "*gis",
+                "qgiss~1",
+                "-qgis",
+                "unknown",
+            ):
+                expected = [(r["ref"], r["score"]) for r in self.idx.search(query)]
+                for k in (None, 1, 2, 10):
+                    with self.subTest(query=query, k=k):
+                        results, total = binary_idx.search_top_k(query, k=k)
+                        self.assertEqual(total, len(expected))
+                        self.assertEqual(
+                            [(r["ref"], r["score"]) for r in results],
+                            expected[:k],
+                        )
+                        # results beyond the k best ones, if consumed
+                        results, _, _ = binary_idx.iter_search(query, k=k)
+                        self.assertEqual(
+                            [(r["ref"], r["score"]) for r in results], expected
+                        )
+
+            # filters are applied before ranking
+            results, total = binary_idx.restrict(
+                date_min=date(2021, 1, 1).toordinal()
+            ).search_top_k("qgis", k=1)
+            self.assertEqual(total, 1)
+
+    def test_compile_query(self):
+        """Compiled queries must be cached and shared with restricted indexes."""
+        with TemporaryDirectory(
+            prefix=f"{__title_clean__}_{__version__}_binary_index_"
+        ) as tempo_dir:
+            binary_path = write_binary_index(
+                idx=self.idx,
+                output_path=Path(tempo_dir, "index.bin"),
+                doc_attributes=get_content_attributes,
+            )
+            binary_idx = load_binary_index(binary_path)
+
+            query_plan = binary_idx.compile_query("title:qgis^2 post* -javascript")
+            self.assertEqual(len(query_plan.clauses), 3)
+            self.assertEqual(query_plan.clauses[0].fields, ("title",))
+            self.assertEqual(query_plan.clauses[0].boost, 2)
+            self.assertEqual(
+                [
+                    binary_idx.reader.terms.get_str(term_position)
+                    for term_position in query_plan.clauses[1].term_positions
+                ],
+                ["postgi"],
+            )
+            self.assertFalse(query_plan.is_negated)
+            self.assertTrue(binary_idx.compile_query("-qgis").is_negated)
+            self.assertTrue(
+                binary_idx.compile_query("+kinkeliba")
+                .clauses[0]
+                .has_unmatched_required_term
+            )
+
+            # same plan from the cache, including on a restricted index
+            restricted_idx = binary_idx.restrict(doc_types=(1,))
+            self.assertIs(
+                restricted_idx.compile_query("title:qgis^2 post* -javascript"),
+                query_plan,
+            )
+
+            # least recently used plans are evicted
+            with patch("geotribu_cli.search.binary_index.QUERY_PLANS_MAX_ENTRIES", 2):
+                binary_idx.compile_query("qgis")
+                binary_idx.compile_query("python")
+                self.assertNotIn(
+                    ("title:qgis^2 post* -javascript", False), binary_idx.query_plans
+                )
+                self.assertEqual(
+                    list(binary_idx.query_plans), [("qgis", False), ("python", False)]
+                )
+
+    def test_approximate_terms(self):
+        """Vocabulary trigrams must find terms by pattern and despite typos."""
+        with TemporaryDirectory(
+            prefix=f"{__title_clean__}_{__version__}_binary_index_"
+        ) as tempo_dir:
+            binary_path = write_binary_index(
+                idx=self.idx, output_path=Path(tempo_dir, "index.bin")
+            )
+            binary_idx = load_binary_index(binary_path)
+            reader = binary_idx.reader
+
+            def as_terms(term_positions: list[int]) -> list[str]:
+                return [reader.terms.get_str(position) for position in term_positions]
+
+            self.assertEqual(
+                as_terms(reader.find_pattern_terms("*gi")), ["postgi", "pyqgi", "qgi"]
+            )
+            self.assertEqual(
+                as_terms(reader.find_pattern_terms("p*gi")), ["postgi", "pyqgi"]
+            )
+            self.assertEqual(reader.find_pattern_terms("*zzz*"), [])
+            # no literal part long enough
+            self.assertIsNone(reader.find_pattern_terms("*g*"))
+
+            self.assertEqual(
+                as_terms(reader.find_similar_terms("pyhton", 1)), ["python"]
+            )
+            self.assertEqual(as_terms(reader.find_similar_terms("pyhtno", 1)), [])
+            self.assertEqual(
+                as_terms(reader.find_approximate_terms("open")), ["open", "openlay"]
+            )
+
+            # only approximate searches tolerate typos
+            self.assertEqual(binary_idx.search_top_k("pyhton")[1], 0)
+            results, count = binary_idx.search_top_k("pyhton", is_approximate=True)
+            self.assertEqual(count, 2)
+            self.assertEqual(
+                {result.get("ref") for result in results},
+                {
+                    "articles/2020/2020-01-01_qgis-python/",
+                    "articles/2020/2020-01-01_qgis-python/#install",
+                },
+            )
+
+    def test_edit_distance(self):
+        """Edit distance must count transpositions as one edit."""
+        for source, target, expected in (
+            ("qgis", "qgis", 0),
+            ("qgis", "qgiss", 1),
+            ("qgis", "qigs", 1),
+            ("qgis", "gis", 1),
+            ("qgis", "pgis", 1),
+            ("postgis", "potsgsi", 2),
+            ("qgis", "arcgis", 3),
+        ):
+            with self.subTest(source=source, target=target):
+                self.assertEqual(get_edit_distance(source, target, 3), expected)
+        self.assertEqual(get_edit_distance("qgis", "arcmap", 1), 2)
+
+    def test_invalid_file(self):
+        """A file which is not a binary index must be rejected."""
+        with TemporaryDirectory(
+            prefix=f"{__title_clean__}_{__version__}_binary_index_"
+        ) as tempo_dir:
+            not_an_index = Path(tempo_dir, "index.bin")
+            not_an_index.write_bytes(b'{"version": "2.3.9"}' * 20)
+
+            with self.assertRaises(ValueError):
+                load_binary_index(not_an_index)
+
+
+# ############################################################################
+# ####### Stand-alone run ########
+# ################################
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,161 @@
+#! python3  # noqa E265
+
+"""
+Usage from the repo root folder:
+
+.. code-block:: bash
+    # for whole tests
+    python -m unittest tests.test_search_content
+    # for specific test
+    python -m unittest tests.test_search_content.TestSearchContent.test_filters_exclude_everything
+"""
+
+# standard library
+import argparse
+import unittest
+from datetime import date
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+# 3rd party
+from lunr import lunr
+
+# project
+from geotribu_cli import cli  # noqa: F401 - import subcommands like the CLI does
+from geotribu_cli.__about__ import __title_clean__, __version__
+from geotribu_cli.search.binary_index import load_binary_index, write_binary_index
+from geotribu_cli.search.contents_metadata import (
+    ContentsMetadataReader,
+    get_content_attributes,
+    write_contents_metadata,
+)
+from geotribu_cli.search.search_content import search_contents
+
+# ############################################################################
+# ########## Globals #############
+# ################################
+
+SAMPLE_DOCUMENTS: tuple[dict, ...] = (
+    {
+        "location": "articles/2020/2020-01-01_qgis-python/",
+        "title": "QGIS and Python",
+        "tags": ["QGIS", "Python"],
+        "text": "Automate your maps with PyQGIS scripts.",
+    },
+    {
+        "location": "articles/2020/2020-01-01_qgis-python/#install",
+        "title": "Installation",
+        "tags": [],
+        "text": "Install QGIS then open the Python console.",
+    },
+    {
+        "location": "rdp/2021/rdp_2021-02-03/#news",
+        "title": "Latest news",
+        "tags": ["PostGIS"],
+        "text": "PostGIS 3.1 and QGIS 3.16 have been released.",
+    },
+)
+
+# ############################################################################
+# ########## Classes #############
+# ################################
+
+
+class TestSearchContent(unittest.TestCase):
+    """Test contents search."""
+
+    def setUp(self):
+        """Build a small binary index and its contents metadata."""
+        self.tempo_dir = TemporaryDirectory(
+            prefix=f"{__title_clean__}_{__version__}_search_content_"
+        )
+        idx = lunr(
+            ref="location",
+            fields=[
+                dict(field_name="title", boost=10),
+                dict(field_name="tags", boost=5),
+                dict(field_name="text"),
+            ],
+            documents=SAMPLE_DOCUMENTS,
+            languages="en",
+        )
+        self.binary_idx = load_binary_index(
+            write_binary_index(
+                idx=idx,
+                output_path=Path(self.tempo_dir.name, "site_search_index.bin"),
+                doc_attributes=get_content_attributes,
+            )
+        )
+        self.contents_metadata = ContentsMetadataReader(
+            write_contents_metadata(
+                contents_listing=SAMPLE_DOCUMENTS,
+                output_path=Path(self.tempo_dir.name, "site_content_metadata.bin"),
+            )
+        )
+
+    def tearDown(self):
+        """Remove temporary files."""
+        self.tempo_dir.cleanup()
+
+    def get_args(self, **kwargs) -> argparse.Namespace:
+        """Build search arguments, without filters by default.
+
+        Returns:
+            argparse.Namespace: search arguments
+        """
+        return argparse.Namespace(
+            **{
+                "search_term": "qgis",
+                "filter_type": None,
+                "filter_date_start": None,
+                "filter_date_end": None,
+                "opt_merge_unique_url": False,
+                "opt_fuzzy": False,
+                "results_number": 10,
+                **kwargs,
+            }
+        )
+
+    def test_filters(self):
+        """Filtered out contents must be counted in search and ignored results."""
+        final_results, count_search_results, count_ignored_results = search_contents(
+            idx=self.binary_idx,
+            contents_metadata=self.contents_metadata,
+            args=self.get_args(filter_type="rdp"),
+        )
+        self.assertEqual(
+            [rezult.get("url").split("/", 3)[-1] for rezult in final_results],
+            ["rdp/2021/rdp_2021-02-03/#news"],
+        )
+        self.assertEqual((count_search_results, count_ignored_results), (3, 2))
+
+    def test_filters_exclude_everything(self):
+        """Contents matching the search but not the filters must be reported as \
+        ignored, without approximate search."""
+        final_results, count_search_results, count_ignored_results = search_contents(
+            idx=self.binary_idx,
+            contents_metadata=self.contents_metadata,
+            args=self.get_args(
+                search_term="python",
+                filter_date_start=date(2022, 1, 1),
+                opt_fuzzy=True,
+            ),
+        )
+        self.assertEqual(final_results, [])
+        self.assertEqual((count_search_results, count_ignored_results), (2, 2))
+
+        # nothing matches, even without filters: approximate search
+        final_results, count_search_results, _ = search_contents(
+            idx=self.binary_idx,
+            contents_metadata=self.contents_metadata,
+            args=self.get_args(search_term="pyhton", opt_fuzzy=True),
+        )
+        self.assertEqual(count_search_results, 2)
+        self.assertEqual(len(final_results), 2)
+
+
+# ############################################################################
+# ####### Stand-alone run ########
+# ################################
+if __name__ == "__main__":
+    unittest.main()
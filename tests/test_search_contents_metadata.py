@@ -0,0 +1,119 @@
+#! python3  # noqa E265
+
+"""
+Usage from the repo root folder:
+
+.. code-block:: bash
+    # for whole tests
+    python -m unittest tests.test_search_contents_metadata
+    # for specific test
+    python -m unittest tests.test_search_contents_metadata.TestContentsMetadata.test_write_read
+"""
+
+# standard library
+import unittest
+from datetime import date
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+# project
+from geotribu_cli.__about__ import __title_clean__, __version__
+from geotribu_cli.search.contents_metadata import (
+    ContentsMetadataReader,
+    write_contents_metadata,
+)
+from geotribu_cli.search.mdl_search import MkdocsSearchDocument
+
+# ############################################################################
+# ########## Globals #############
+# ################################
+
+SAMPLE_DOCS: list[MkdocsSearchDocument] = [
+    {
+        "location": "rdp/2023/rdp_2023-06-30/",
+        "title": "Revue de presse du 30 juin 2023",
+        "tags": ["QGIS", "PostGIS"],
+        "text": "Une revue de presse estivale.",
+    },
+    {
+        "location": "articles/2022/2022-01-14_publier-en-ligne/#gérer-les-étapes",
+        "title": "Gérer les étapes",
+        "tags": None,
+        "text": "Section d'un article.",
+    },
+    {
+        "location": "articles/2022/2022-01-14_publier-en-ligne/",
+        "title": "Publier en ligne",
+        "tags": [],
+        "text": "Un article.",
+    },
+]
+
+# ############################################################################
+# ########## Classes #############
+# ################################
+
+
+class TestContentsMetadata(unittest.TestCase):
+    """Test contents metadata store."""
+
+    def test_write_read(self):
+        """Metadata must be found by location."""
+        with TemporaryDirectory(
+            prefix=f"{__title_clean__}_{__version__}_contents_metadata_"
+        ) as tempo_dir:
+            metadata_file = write_contents_metadata(
+                contents_listing=SAMPLE_DOCS,
+                output_path=Path(tempo_dir, "site_content_metadata.bin"),
+            )
+            contents_metadata = ContentsMetadataReader(metadata_file)
+
+            self.assertEqual(len(contents_metadata), len(SAMPLE_DOCS))
+            for doc in SAMPLE_DOCS:
+                content_metadata = contents_metadata.get(doc.get("location"))
+                self.assertEqual(content_metadata.get("title"), doc.get("title"))
+                self.assertEqual(content_metadata.get("tags"), doc.get("tags"))
+
+            content_metadata = contents_metadata.get("rdp/2023/rdp_2023-06-30/")
+            self.assertEqual(content_metadata.get("type"), "rdp")
+            self.assertEqual(content_metadata.get("date"), date(2023, 6, 30))
+            content_metadata = contents_metadata.get(
+                "articles/2022/2022-01-14_publier-en-ligne/#gérer-les-étapes"
+            )
+            self.assertEqual(content_metadata.get("type"), "article")
+            self.assertEqual(content_metadata.get("date"), date(2022, 1, 14))
+
+            # sections share the id of their page
+            self.assertEqual(
+                content_metadata.get("parent_id"),
+                contents_metadata.get("articles/2022/2022-01-14_publier-en-ligne/").get(
+                    "parent_id"
+                ),
+            )
+            self.assertNotEqual(
+                content_metadata.get("parent_id"),
+                contents_metadata.get("rdp/2023/rdp_2023-06-30/").get("parent_id"),
+            )
+
+            self.assertIsNone(contents_metadata.get("articles/2022/"))
+            self.assertNotIn("rdp/", contents_metadata)
+
+            contents_metadata.close()
+
+    def test_invalid_file(self):
+        """Files which are not a metadata store must be rejected."""
+        with TemporaryDirectory(
+            prefix=f"{__title_clean__}_{__version__}_contents_metadata_"
+        ) as tempo_dir:
+            invalid_file = Path(tempo_dir, "site_content_metadata.bin")
+            invalid_file.write_bytes(b"GTBX" + b"\x00" * 256)
+
+            with self.assertRaises(ValueError):
+                ContentsMetadataReader(invalid_file)
+
+
+# ############################################################################
+# ####### Stand-alone run ########
+# ################################
+if __name__ == "__main__":
+    unittest.main()
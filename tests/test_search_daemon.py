@@ -0,0 +1,266 @@
+#! python3  # noqa E265
+
+"""
+Usage from the repo root folder:
+
+.. code-block:: bash
+    # for whole tests
+    python -m unittest tests.test_search_daemon
+    # for specific test
+    python -m unittest tests.test_search_daemon.TestSearchDaemon.test_search_image
+"""
+
+# standard library
+import argparse
+import unittest
+from datetime import date
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from threading import Thread
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+# 3rd party
+import orjson
+from lunr import lunr
+
+# project
+from geotribu_cli import cli  # noqa: F401 - import subcommands like the CLI does
+from geotribu_cli.__about__ import __title_clean__, __version__
+from geotribu_cli.search.binary_index import load_binary_index, write_binary_index
+from geotribu_cli.search.contents_metadata import (
+    ContentsMetadataReader,
+    get_content_attributes,
+    write_contents_metadata,
+)
+from geotribu_cli.search.search_content import decode_search_response, search_contents
+from geotribu_cli.search.search_daemon import (
+    IS_DAEMON_SUPPORTED,
+    SearchIndexes,
+    decode_request_args,
+    send_daemon_request,
+)
+from geotribu_cli.search.search_image import search_images
+
+if IS_DAEMON_SUPPORTED:
+    from geotribu_cli.search.search_daemon import SearchDaemonServer
+
+# ############################################################################
+# ########## Globals #############
+# ################################
+
+SAMPLE_IMAGES: dict[str, list[int]] = {
+    "logos-icones/logiciels/qgis.png": [512, 512],
+    "logos-icones/logiciels/postgis.png": [256, 256],
+    "articles/2023/postgis_schema.webp": [1200, 800],
+}
+
+SAMPLE_DOCUMENTS: tuple[dict, ...] = (
+    {
+        "location": "articles/2020/2020-01-01_qgis-python/",
+        "title": "QGIS and Python",
+        "tags": ["QGIS", "Python"],
+        "text": "Automate your maps with PyQGIS scripts.",
+    },
+    {
+        "location": "rdp/2021/rdp_2021-02-03/#news",
+        "title": "Latest news",
+        "tags": ["PostGIS"],
+        "text": "PostGIS 3.1 and QGIS 3.16 have been released.",
+    },
+    # no date in location
+    {
+        "location": "articles/2021/presentation-qgis/",
+        "title": "Presentation",
+        "tags": ["QGIS"],
+        "text": "QGIS team presentation.",
+    },
+)
+
+# ############################################################################
+# ########## Classes #############
+# ################################
+
+
+@unittest.skipUnless(IS_DAEMON_SUPPORTED, "Unix sockets are not supported.")
+class TestSearchDaemon(unittest.TestCase):
+    """Test search daemon."""
+
+    def setUp(self):
+        """Start a daemon on a temporary socket."""
+        self.tempo_dir = TemporaryDirectory(
+            prefix=f"{__title_clean__}_{__version__}_search_daemon_"
+        )
+        self.socket_path = Path(self.tempo_dir.name, "daemon.sock")
+
+        # local images index, fresh so it's not downloaded again
+        self.local_index_file = Path(self.tempo_dir.name, "cdn_search_index.json")
+        self.idx = lunr(
+            ref="path",
+            fields=["path"],
+            documents=[{"path": path} for path in SAMPLE_IMAGES],
+            languages="en",
+        )
+        self.local_index_file.write_bytes(
+            orjson.dumps({"index": self.idx.serialize(), "images": SAMPLE_IMAGES})
+        )
+
+        self.server = SearchDaemonServer(socket_path=self.socket_path)
+        self.server_thread = Thread(target=self.server.serve_forever, daemon=True)
+        self.server_thread.start()
+
+    def tearDown(self):
+        """Stop the daemon."""
+        self.server.shutdown()
+        self.server.server_close()
+        self.tempo_dir.cleanup()
+
+    def test_ping(self):
+        """Daemon must answer to ping and report errors without stopping."""
+        self.assertEqual(
+            send_daemon_request({"command": "ping"}, socket_path=self.socket_path),
+            {"status": "ok"},
+        )
+        self.assertIn(
+            "error",
+            send_daemon_request({"command": "rss"}, socket_path=self.socket_path),
+        )
+        self.assertTrue(self.server_thread.is_alive())
+
+    def test_socket_permissions(self):
+        """Socket must be created accessible to its owner only."""
+        self.assertEqual(self.socket_path.stat().st_mode & 0o077, 0)
+
+    def test_no_daemon(self):
+        """Without daemon, requests must return None."""
+        self.assertIsNone(
+            send_daemon_request(
+                {"command": "ping"},
+                socket_path=Path(self.tempo_dir.name, "no_daemon.sock"),
+            )
+        )
+
+    def test_search_image(self):
+        """Results from the daemon must be the same as the local search."""
+        request_args = {
+            "search_term": "*postgis*",
+            "remote_index_file": "https://cdn.geotribu.fr/img/search-index.json",
+            "local_index_file": str(self.local_index_file),
+            "expiration_rotating_hours": 24,
+            "filter_type": "logo",
+            "results_number": 5,
+        }
+        response = send_daemon_request(
+            {"command": "search-image", "args": request_args},
+            socket_path=self.socket_path,
+        )
+
+        final_results, count_search_results = search_images(
+            idx=self.idx,
+            images_catalog=SAMPLE_IMAGES,
+            args=argparse.Namespace(**request_args),
+        )
+        self.assertEqual(response.get("results"), final_results)
+        self.assertEqual(response.get("count_search_results"), count_search_results)
+        self.assertEqual(len(final_results), 1)
+
+    def test_search_content(self):
+        """Results from the daemon must be the same as the local search, including \
+        undated contents."""
+        # local contents index, fresh so it's not downloaded again
+        local_index_file = Path(self.tempo_dir.name, "site_search_index.json")
+        idx = lunr(
+            ref="location",
+            fields=[
+                dict(field_name="title", boost=10),
+                dict(field_name="tags", boost=5),
+                dict(field_name="text"),
+            ],
+            documents=SAMPLE_DOCUMENTS,
+            languages="en",
+        )
+        local_index_file.write_bytes(orjson.dumps(idx.serialize()))
+        write_binary_index(
+            idx=idx,
+            output_path=local_index_file.with_suffix(".bin"),
+            doc_attributes=get_content_attributes,
+        )
+        write_contents_metadata(
+            contents_listing=SAMPLE_DOCUMENTS,
+            output_path=Path(self.tempo_dir.name, "site_content_metadata.bin"),
+        )
+
+        request_args = {
+            "search_term": "qgis",
+            "remote_index_file": "https://geotribu.fr/search/search_index.json",
+            "local_index_file": str(local_index_file),
+            "expiration_rotating_hours": 24,
+            "opt_incremental_index": False,
+            "index_workers": 1,
+            "filter_type": None,
+            "filter_date_start": None,
+            "filter_date_end": None,
+            "opt_merge_unique_url": True,
+            "opt_fuzzy": False,
+            "results_number": 5,
+        }
+        response = send_daemon_request(
+            {"command": "search-content", "args": request_args},
+            socket_path=self.socket_path,
+        )
+
+        expected = search_contents(
+            idx=load_binary_index(local_index_file.with_suffix(".bin")),
+            contents_metadata=ContentsMetadataReader(
+                Path(self.tempo_dir.name, "site_content_metadata.bin")
+            ),
+            args=decode_request_args(request_args),
+        )
+        self.assertEqual(decode_search_response(response), expected)
+        self.assertIn(None, [rezult.get("date") for rezult in expected[0]])
+        self.assertIn(date(2020, 1, 1), [rezult.get("date") for rezult in expected[0]])
+
+    def test_stale_index(self):
+        """A stale index must be reloaded, except while its files are revalidated."""
+        load_local_index = MagicMock(side_effect=lambda args: (MagicMock(),))
+        args = argparse.Namespace(
+            local_index_file=self.local_index_file, expiration_rotating_hours=0
+        )
+        search_indexes = SearchIndexes()
+        with patch(
+            "geotribu_cli.search.search_daemon.get_search_module",
+            return_value=SimpleNamespace(load_local_index=load_local_index),
+        ):
+            with patch(
+                "geotribu_cli.search.search_daemon.get_running_revalidations",
+                return_value=[self.local_index_file],
+            ):
+                index = search_indexes.get("search-image", args)
+                search_indexes.get("search-image", args)
+            self.assertEqual(load_local_index.call_count, 1)
+
+            search_indexes.get("search-image", args)
+            self.assertEqual(load_local_index.call_count, 2)
+            # previous index released before its files are written again
+            index[0].close.assert_called_once()
+
+    def test_decode_request_args(self):
+        """Paths and dates must be converted back."""
+        args = decode_request_args(
+            {
+                "search_term": "qgis",
+                "local_index_file": "/tmp/site_search_index.json",
+                "filter_date_start": "2020-01-01",
+                "filter_date_end": None,
+            }
+        )
+        self.assertEqual(args.local_index_file, Path("/tmp/site_search_index.json"))
+        self.assertEqual(args.filter_date_start, date(2020, 1, 1))
+        self.assertIsNone(args.filter_date_end)
+
+
+# ############################################################################
+# ####### Stand-alone run ########
+# ################################
+if __name__ == "__main__":
+    unittest.main()
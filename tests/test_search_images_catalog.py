@@ -0,0 +1,151 @@
+#! python3  # noqa E265
+
+"""
+Usage from the repo root folder:
+
+.. code-block:: bash
+    # for whole tests
+    python -m unittest tests.test_search_images_catalog
+    # for specific test
+    python -m unittest tests.test_search_images_catalog.TestImagesCatalog.test_write_read
+"""
+
+# standard library
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+# project
+from geotribu_cli.__about__ import __title_clean__, __version__
+from geotribu_cli.search.images_catalog import (
+    UNKNOWN_DIMENSIONS,
+    ImagesCatalogReader,
+    write_images_catalog,
+)
+from geotribu_cli.search.mdl_search import ImageDimensionsFilter
+
+# ############################################################################
+# ########## Globals #############
+# ################################
+
+SAMPLE_IMAGES: dict[str, list[int] | None] = {
+    "logos-icones/logiciels/qgis.png": [512, 512],
+    "logos-icones/logiciels/postgis.png": [256, 256],
+    "articles/2023/postgis_schéma.webp": [1200, 800],
+    "favicon.png": [32, 32],
+    "logos-icones/logiciels/geoserver.svg": None,
+}
+
+# ############################################################################
+# ########## Classes #############
+# ################################
+
+
+class TestImagesCatalog(unittest.TestCase):
+    """Test images catalog."""
+
+    def test_write_read(self):
+        """Dimensions must be found by image path."""
+        with TemporaryDirectory(
+            prefix=f"{__title_clean__}_{__version__}_images_catalog_"
+        ) as tempo_dir:
+            images_catalog = ImagesCatalogReader(
+                write_images_catalog(
+                    images=SAMPLE_IMAGES,
+                    output_path=Path(tempo_dir, "cdn_search_index_images.bin"),
+                )
+            )
+
+            self.assertEqual(len(images_catalog), len(SAMPLE_IMAGES))
+            for path, dimensions in SAMPLE_IMAGES.items():
+                with self.subTest(path=path):
+                    self.assertEqual(
+                        images_catalog.get(path),
+                        tuple(dimensions or UNKNOWN_DIMENSIONS),
+                    )
+
+            # folders are stored once
+            self.assertEqual(len(images_catalog.folders), 3)
+            self.assertEqual(
+                list(images_catalog),
+                sorted(SAMPLE_IMAGES, key=lambda path: path.encode("utf-8")),
+            )
+
+            self.assertIsNone(images_catalog.get("logos-icones/logiciels/"))
+            self.assertNotIn("qgis.png", images_catalog)
+            with self.assertRaises(KeyError):
+                images_catalog["logos-icones/logiciels/mapserver.png"]
+
+            images_catalog.close()
+
+    def test_find_by_dimensions(self):
+        """Images within dimensions ranges must be found by the sorted indexes."""
+        images = {
+            f"articles/image_{i:03d}.png": [(i * 37) % 500 + 1, (i * 53) % 400 + 1]
+            for i in range(300)
+        }
+        images.update(SAMPLE_IMAGES)
+
+        with TemporaryDirectory(
+            prefix=f"{__title_clean__}_{__version__}_images_catalog_"
+        ) as tempo_dir:
+            images_catalog = ImagesCatalogReader(
+                write_images_catalog(
+                    images=images,
+                    output_path=Path(tempo_dir, "cdn_search_index_images.bin"),
+                )
+            )
+
+            for dimensions_filter in (
+                ImageDimensionsFilter(),
+                ImageDimensionsFilter(min_width=100, max_width=300),
+                ImageDimensionsFilter(max_height=50),
+                ImageDimensionsFilter(min_ratio=1, max_ratio=1),
+                ImageDimensionsFilter(min_width=256, min_ratio=1.2, max_height=900),
+                ImageDimensionsFilter(min_width=1000, max_width=10),
+            ):
+                with self.subTest(dimensions_filter=dimensions_filter):
+                    expected = [
+                        position
+                        for position, dimensions in enumerate(images_catalog.values())
+                        if dimensions_filter.is_empty()
+                        or dimensions_filter.match(*dimensions)
+                    ]
+                    self.assertEqual(
+                        images_catalog.find_by_dimensions(dimensions_filter), expected
+                    )
+
+            # square images
+            self.assertEqual(
+                [
+                    images_catalog.paths[position].decode("utf-8")
+                    for position in images_catalog.find_by_dimensions(
+                        ImageDimensionsFilter(min_ratio=1, max_ratio=1, min_width=256)
+                    )
+                ],
+                [
+                    "articles/image_225.png",
+                    "logos-icones/logiciels/postgis.png",
+                    "logos-icones/logiciels/qgis.png",
+                ],
+            )
+
+            images_catalog.close()
+
+    def test_invalid_file(self):
+        """Files which are not an images catalog must be rejected."""
+        with TemporaryDirectory(
+            prefix=f"{__title_clean__}_{__version__}_images_catalog_"
+        ) as tempo_dir:
+            invalid_file = Path(tempo_dir, "cdn_search_index_images.bin")
+            invalid_file.write_bytes(b"GTBM" + b"\x00" * 256)
+
+            with self.assertRaises(ValueError):
+                ImagesCatalogReader(invalid_file)
+
+
+# ############################################################################
+# ####### Stand-alone run ########
+# ################################
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,210 @@
+#! python3  # noqa E265
+
+"""
+Usage from the repo root folder:
+
+.. code-block:: bash
+    # for whole tests
+    python -m unittest tests.test_search_index_builder
+    # for specific test
+    python -m unittest tests.test_search_index_builder.TestSearchIndexBuilder.test_incremental_build_is_identical
+"""
+
+# standard library
+import unittest
+from copy import deepcopy
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+# 3rd party
+import orjson
+from lunr import lunr
+
+# project
+from geotribu_cli.__about__ import __title_clean__, __version__
+from geotribu_cli.search.index_builder import (
+    build_index,
+    build_index_incrementally,
+    get_index_builder,
+    iter_documents_analyses,
+    load_analysis_cache,
+)
+
+# ############################################################################
+# ########## Globals #############
+# ################################
+
+INDEX_SETTINGS: dict = dict(
+    index_ref_id="location",
+    index_configuration={"lang": "en"},
+    index_fieds_definition=[
+        dict(field_name="title", boost=10),
+        dict(field_name="tags", boost=5),
+        dict(field_name="text"),
+    ],
+)
+
+SAMPLE_DOCUMENTS: list[dict] = [
+    {
+        "location": "articles/2020/2020-01-01_qgis-python/",
+        "title": "QGIS and Python",
+        "tags": ["QGIS", "Python"],
+        "text": "Automate your maps with PyQGIS scripts.",
+    },
+    {
+        "location": "rdp/2021/rdp_2021-02-03/#news",
+        "title": "Latest news",
+        "tags": ["PostGIS"],
+        "text": "PostGIS 3.1 and QGIS 3.16 have been released.",
+    },
+    {
+        "location": "articles/2022/2022-05-04_openlayers/",
+        "title": "OpenLayers for dummies",
+        "tags": ["OpenLayers", "JavaScript"],
+        "text": "Display your PostGIS layers in a web map.",
+    },
+]
+
+# ############################################################################
+# ########## Classes #############
+# ################################
+
+
+class TestSearchIndexBuilder(unittest.TestCase):
+    """Test incremental search index builder."""
+
+    def test_incremental_build_is_identical(self):
+        """Index built from cached analyses must be the same as a full build."""
+        with TemporaryDirectory(
+            prefix=f"{__title_clean__}_{__version__}_index_builder_"
+        ) as tempo_dir:
+            analysis_cache = Path(tempo_dir, "analysis.json")
+
+            # first build: cache is empty
+            build_index_incrementally(
+                input_documents_to_index=SAMPLE_DOCUMENTS,
+                analysis_cache_path=analysis_cache,
+                **INDEX_SETTINGS,
+            )
+            self.assertTrue(analysis_cache.is_file())
+
+            # modify, remove and add documents
+            updated_documents = deepcopy(SAMPLE_DOCUMENTS)
+            updated_documents[0]["text"] += " Now with QGIS processing."
+            del updated_documents[1]
+            updated_documents.append(
+                {
+                    "location": "articles/2023/2023-06-07_gdal/",
+                    "title": "GDAL tips",
+                    "tags": ["GDAL"],
+                    "text": "Convert rasters to COG with gdal_translate.",
+                }
+            )
+
+            incremental_idx = build_index_incrementally(
+                input_documents_to_index=updated_documents,
+                analysis_cache_path=analysis_cache,
+                **INDEX_SETTINGS,
+            )
+            full_idx = lunr(
+                ref="location",
+                fields=INDEX_SETTINGS.get("index_fieds_definition"),
+                documents=updated_documents,
+                languages="en",
+            )
+
+            self.assertEqual(
+                orjson.dumps(incremental_idx.serialize()),
+                orjson.dumps(full_idx.serialize()),
+            )
+
+    @patch("geotribu_cli.search.index_builder.MIN_DOCUMENTS_PER_WORKER", 1)
+    def test_parallel_build_is_identical(self):
+        """Index built by several processes must be the same as lunr's one."""
+        parallel_idx = build_index(
+            input_documents_to_index=SAMPLE_DOCUMENTS, max_workers=2, **INDEX_SETTINGS
+        )
+        full_idx = lunr(
+            ref="location",
+            fields=INDEX_SETTINGS.get("index_fieds_definition"),
+            documents=SAMPLE_DOCUMENTS,
+            languages="en",
+        )
+
+        self.assertEqual(
+            orjson.dumps(parallel_idx.serialize()),
+            orjson.dumps(full_idx.serialize()),
+        )
+
+    @patch("geotribu_cli.search.index_builder.ANALYSIS_CHUNK_SIZE", 2)
+    @patch("geotribu_cli.search.index_builder.MIN_DOCUMENTS_PER_WORKER", 1)
+    def test_documents_read_by_chunks(self):
+        """Documents must be analyzed as they are read, by chunks."""
+        count_read = 0
+
+        def iter_documents():
+            nonlocal count_read
+            for document in SAMPLE_DOCUMENTS * 3:
+                count_read += 1
+                yield document
+
+        for max_workers in (1, 2):
+            with self.subTest(max_workers=max_workers):
+                count_read = 0
+                analyses = iter_documents_analyses(
+                    builder=get_index_builder(**INDEX_SETTINGS),
+                    documents=iter_documents(),
+                    max_workers=max_workers,
+                    **INDEX_SETTINGS,
+                )
+                document, _ = next(analyses)
+                self.assertEqual(document, SAMPLE_DOCUMENTS[0])
+                # 2 chunks being analyzed and the next one
+                self.assertLessEqual(count_read, 6)
+                self.assertEqual(
+                    [document for document, _ in analyses], (SAMPLE_DOCUMENTS * 3)[1:]
+                )
+
+        parallel_idx = build_index(
+            input_documents_to_index=iter(SAMPLE_DOCUMENTS),
+            max_workers=2,
+            **INDEX_SETTINGS,
+        )
+        self.assertEqual(
+            orjson.dumps(parallel_idx.serialize()),
+            orjson.dumps(
+                build_index(
+                    input_documents_to_index=SAMPLE_DOCUMENTS, **INDEX_SETTINGS
+                ).serialize()
+            ),
+        )
+
+    def test_analysis_cache_configuration_mismatch(self):
+        """Cached analyses must be ignored if the index configuration changed."""
+        with TemporaryDirectory(
+            prefix=f"{__title_clean__}_{__version__}_index_builder_"
+        ) as tempo_dir:
+            analysis_cache = Path(tempo_dir, "analysis.json")
+            analysis_cache.write_bytes(
+                orjson.dumps(
+                    {
+                        "configuration": {"lang": "fr"},
+                        "documents": {"articles/": {"hash": "x", "fields": {}}},
+                    }
+                )
+            )
+
+            self.assertEqual(
+                load_analysis_cache(analysis_cache, {"lang": "fr"}),
+                {"articles/": {"hash": "x", "fields": {}}},
+            )
+            self.assertEqual(load_analysis_cache(analysis_cache, {"lang": "en"}), {})
+            self.assertEqual(load_analysis_cache(Path(tempo_dir, "nope.json"), {}), {})
+
+
+# ############################################################################
+# ####### Stand-alone run ########
+# ################################
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,169 @@
+#! python3  # noqa E265
+
+"""
+Usage from the repo root folder:
+
+.. code-block:: bash
+    # for whole tests
+    python -m unittest tests.test_search_interactive
+    # for specific test
+    python -m unittest tests.test_search_interactive.TestSearchInteractive.test_incremental_search
+"""
+
+# standard library
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+# 3rd party
+from lunr import lunr
+
+# project
+from geotribu_cli.__about__ import __title_clean__, __version__
+from geotribu_cli.search.binary_index import load_binary_index, write_binary_index
+from geotribu_cli.search.search_interactive import (
+    IncrementalSearch,
+    edit_text,
+    is_refinement,
+)
+from geotribu_cli.utils.keyboard import KEY_BACKSPACE, KEY_DELETE_WORD, KEY_UP
+
+# ############################################################################
+# ########## Globals #############
+# ################################
+
+SAMPLE_DOCUMENTS: tuple[dict, ...] = (
+    {
+        "location": "articles/2020/2020-01-01_qgis-python/",
+        "title": "QGIS and Python",
+        "tags": ["QGIS", "Python"],
+        "text": "Automate your maps with PyQGIS scripts.",
+    },
+    {
+        "location": "articles/2020/2020-01-01_qgis-python/#install",
+        "title": "Installation",
+        "tags": [],
+        "text": "Install QGIS then open the Python console.",
+    },
+    {
+        "location": "rdp/2021/rdp_2021-02-03/#news",
+        "title": "Latest news",
+        "tags": ["PostGIS"],
+        "text": "PostGIS 3.1 and QGIS 3.16 have been released.",
+    },
+    {
+        "location": "articles/2022/2022-05-04_openlayers/",
+        "title": "OpenLayers for dummies",
+        "tags": ["OpenLayers", "JavaScript"],
+        "text": "Display your PostGIS layers in a web map.",
+    },
+)
+
+# ############################################################################
+# ########## Classes #############
+# ################################
+
+
+class TestSearchInteractive(unittest.TestCase):
+    """Test search-as-you-type."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Build a small index once for all tests."""
+        cls.idx = lunr(
+            ref="location",
+            fields=[
+                dict(field_name="title", boost=10),
+                dict(field_name="tags", boost=5),
+                dict(field_name="text"),
+            ],
+            documents=SAMPLE_DOCUMENTS,
+            languages="en",
+        )
+
+    def test_incremental_search(self):
+        """Results must be the same as a search from scratch on each keystroke."""
+        with TemporaryDirectory(
+            prefix=f"{__title_clean__}_{__version__}_search_interactive_"
+        ) as tempo_dir:
+            binary_idx = load_binary_index(
+                write_binary_index(idx=self.idx, output_path=Path(tempo_dir, "idx.bin"))
+            )
+            incremental_search = IncrementalSearch(binary_idx)
+
+            text = ""
+            for key in [*"qgis python -post", KEY_BACKSPACE, KEY_BACKSPACE, *"stgis"]:
+                text = edit_text(text=text, key=key)
+                if text.endswith(("-", " ")):
+                    continue
+                with self.subTest(text=text):
+                    query_plan = incremental_search.compile_query(text)
+                    results, count = incremental_search.iter_search(text)
+                    self.assertEqual(
+                        list(results),
+                        list(
+                            binary_idx.iter_ranked(binary_idx.query_scores(query_plan))
+                        ),
+                    )
+                    self.assertEqual(count, len(binary_idx.query_scores(query_plan)))
+
+            # words already typed are required, like lunr's presence
+            self.assertEqual(
+                [r["ref"] for r in incremental_search.iter_search("qgis python ")[0]],
+                [r["ref"] for r in self.idx.search("+qgis +python")],
+            )
+            # the word being typed also matches the terms starting with it
+            self.assertEqual(
+                [r["ref"] for r in incremental_search.iter_search("openl")[0]],
+                ["articles/2022/2022-05-04_openlayers/"],
+            )
+            self.assertEqual(
+                [r["ref"] for r in incremental_search.iter_search("title:inst")[0]],
+                ["articles/2020/2020-01-01_qgis-python/#install"],
+            )
+            # too short to be a prefix
+            self.assertEqual(incremental_search.iter_search("op")[1], 0)
+
+    def test_is_refinement(self):
+        """Refinements must only be detected when results can only be removed."""
+        with TemporaryDirectory(
+            prefix=f"{__title_clean__}_{__version__}_search_interactive_"
+        ) as tempo_dir:
+            binary_idx = load_binary_index(
+                write_binary_index(idx=self.idx, output_path=Path(tempo_dir, "idx.bin"))
+            )
+            incremental_search = IncrementalSearch(binary_idx)
+
+            for previous_text, text, expected in (
+                ("pos", "post", True),
+                ("qgis", "qgis pyt", True),
+                ("qgis", "qgis -post", True),
+                ("qgis -postgis", "qgis -post", False),
+                ("qgis pyt", "qgis", False),
+                ("qgis", "python", False),
+                ("-qgis", "-qgis layers", True),
+            ):
+                with self.subTest(previous_text=previous_text, text=text):
+                    self.assertEqual(
+                        is_refinement(
+                            incremental_search.compile_query(previous_text),
+                            incremental_search.compile_query(text),
+                        ),
+                        expected,
+                    )
+
+    def test_edit_text(self):
+        """Keys must edit the typed text."""
+        self.assertEqual(edit_text("qgis", "3"), "qgis3")
+        self.assertEqual(edit_text("qgis", KEY_BACKSPACE), "qgi")
+        self.assertEqual(edit_text("qgis python ", KEY_DELETE_WORD), "qgis ")
+        self.assertEqual(edit_text("qgis", KEY_DELETE_WORD), "")
+        self.assertEqual(edit_text("qgis", KEY_UP), "qgis")
+        self.assertEqual(edit_text("qgis", "\x01"), "qgis")
+
+
+# ############################################################################
+# ####### Stand-alone run ########
+# ################################
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,162 @@
+#! python3  # noqa E265
+
+"""
+Usage from the repo root folder:
+
+.. code-block:: bash
+    # for whole tests
+    python -m unittest tests.test_search_query_cache
+    # for specific test
+    python -m unittest tests.test_search_query_cache.TestSearchQueryCache.test_cache_key
+"""
+
+# standard library
+import argparse
+import os
+import unittest
+from datetime import date
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+# project
+from geotribu_cli import cli  # noqa: F401 - import subcommands like the CLI does
+from geotribu_cli.__about__ import __title_clean__, __version__
+from geotribu_cli.search.query_cache import QueryCache
+from geotribu_cli.search.search_content import (
+    decode_search_response,
+    parser_search_content,
+    run,
+)
+
+# ############################################################################
+# ########## Classes #############
+# ################################
+
+
+class TestSearchQueryCache(unittest.TestCase):
+    """Test search results cache."""
+
+    def setUp(self):
+        """Create a temporary index file."""
+        self.tempo_dir = TemporaryDirectory(
+            prefix=f"{__title_clean__}_{__version__}_query_cache_"
+        )
+        self.index_file = Path(self.tempo_dir.name, "site_search_index.json")
+        self.index_file.write_bytes(b'{"version": "2.3.9"}')
+
+    def tearDown(self):
+        """Remove temporary files."""
+        self.tempo_dir.cleanup()
+
+    def test_cache_key(self):
+        """Key must depend on the index, the query and the filters."""
+        filters = {"filter_type": "article", "filter_date_start": date(2020, 1, 1)}
+        key = QueryCache.get_key(self.index_file, "title:qgis  python", filters)
+
+        self.assertEqual(
+            key, QueryCache.get_key(self.index_file, " title:qgis python ", filters)
+        )
+        self.assertNotEqual(
+            key, QueryCache.get_key(self.index_file, "title:qgis", filters)
+        )
+        self.assertNotEqual(
+            key,
+            QueryCache.get_key(
+                self.index_file, "title:qgis python", {"filter_type": "rdp"}
+            ),
+        )
+
+        # index has been rebuilt
+        self.index_file.write_bytes(b'{"version": "2.3.9", "fields": []}')
+        self.assertNotEqual(
+            key, QueryCache.get_key(self.index_file, "title:qgis  python", filters)
+        )
+
+    def test_get_set_evict(self):
+        """Least recently used entries must be evicted."""
+        query_cache = QueryCache(
+            cache_folder=Path(self.tempo_dir.name, "query_cache"), max_entries=2
+        )
+        keys = [QueryCache.get_key(self.index_file, f"q{i}", {}) for i in range(3)]
+
+        self.assertIsNone(query_cache.get(keys[0]))
+
+        for i, key in enumerate(keys[:2]):
+            query_cache.set(key, {"results": [i]})
+            # make sure modification times differ
+            os.utime(query_cache.get_entry_path(key), (i, i))
+
+        # first entry is used again, so the second one is the least recently used
+        self.assertEqual(query_cache.get(keys[0]), {"results": [0]})
+        query_cache.set(keys[2], {"results": [2]})
+
+        self.assertIsNotNone(query_cache.get(keys[0]))
+        self.assertIsNone(query_cache.get(keys[1]))
+        self.assertEqual(query_cache.get(keys[2]), {"results": [2]})
+
+    def test_undated_results(self):
+        """Cached results of contents without date must be read back."""
+        query_cache = QueryCache(cache_folder=Path(self.tempo_dir.name, "query_cache"))
+        key = QueryCache.get_key(self.index_file, "qgis", {})
+        search_response = {
+            "results": [
+                {"url": "articles/2020/2020-01-01_qgis/", "date": date(2020, 1, 1)},
+                {"url": "articles/2021/presentation-qgis/", "date": None},
+            ],
+            "count_search_results": 2,
+            "count_ignored_results": 0,
+        }
+        query_cache.set(key, search_response)
+
+        cached_response = query_cache.get(key)
+        self.assertIsNone(cached_response["results"][1]["date"])
+        self.assertEqual(
+            decode_search_response(cached_response),
+            (search_response["results"], 2, 0),
+        )
+
+    def test_outdated_index(self):
+        """Cached results must be used while the local index is outdated."""
+        args = parser_search_content(argparse.ArgumentParser()).parse_args(
+            ["qgis", "--local-index-file", str(self.index_file)]
+        )
+        args.command = "search-content"
+        args.expiration_rotating_hours = 0
+        query_cache = QueryCache(cache_folder=Path(self.tempo_dir.name, "query_cache"))
+        query_cache.set(
+            QueryCache.get_key(
+                index_file=self.index_file,
+                query="qgis",
+                filters={
+                    "filter_type": args.filter_type,
+                    "filter_date_start": args.filter_date_start,
+                    "filter_date_end": args.filter_date_end,
+                    "opt_merge_unique_url": args.opt_merge_unique_url,
+                    "opt_fuzzy": args.opt_fuzzy,
+                    "results_number": args.results_number,
+                },
+            ),
+            {"results": [], "count_search_results": 0, "count_ignored_results": 0},
+        )
+
+        with (
+            patch(
+                "geotribu_cli.search.search_content.query_search_daemon",
+                return_value=None,
+            ),
+            patch(
+                "geotribu_cli.search.search_content.load_local_index"
+            ) as load_local_index,
+            patch("geotribu_cli.search.search_content.CliHistory"),
+        ):
+            with self.assertRaises(SystemExit):
+                run(args)
+        load_local_index.assert_not_called()
+
+
+# ############################################################################
+# ####### Stand-alone run ########
+# ################################
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+#! python3  # noqa E265
+
+"""
+Usage from the repo root folder:
+
+.. code-block:: bash
+    # for whole tests
+    python -m unittest tests.test_utils_atomic_files
+    # for specific test
+    python -m unittest tests.test_utils_atomic_files.TestUtilsAtomicFiles.test_atomic_write
+"""
+
+# standard library
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+# project
+from geotribu_cli.__about__ import __title_clean__, __version__
+from geotribu_cli.utils.atomic_files import atomic_write, file_lock, get_lock_path
+
+# ############################################################################
+# ########## Classes #############
+# ################################
+
+
+class TestUtilsAtomicFiles(unittest.TestCase):
+    """Test atomic writes and file locks."""
+
+    def test_atomic_write(self):
+        """File must be replaced only once completely written."""
+        with TemporaryDirectory(
+            prefix=f"{__title_clean__}_{__version__}_atomic_"
+        ) as tempo_dir:
+            output_file = Path(tempo_dir, "index.json")
+            output_file.write_text("previous", encoding="UTF-8")
+
+            with atomic_write(output_file, mode="w") as fd:
+                fd.write("new")
+                self.assertEqual(output_file.read_text(encoding="UTF-8"), "previous")
+            self.assertEqual(output_file.read_text(encoding="UTF-8"), "new")
+            # same permissions as a file created by open(), not only the owner's ones
+            reference_file = Path(tempo_dir, "reference.json")
+            reference_file.write_text("reference", encoding="UTF-8")
+            self.assertEqual(output_file.stat().st_mode, reference_file.stat().st_mode)
+            reference_file.unlink()
+
+            # on error, previous file is kept and temporary file removed
+            with self.assertRaises(RuntimeError):
+                with atomic_write(output_file) as fd:
+                    fd.write(b"partial")
+                    raise RuntimeError("interrupted")
+            self.assertEqual(output_file.read_text(encoding="UTF-8"), "new")
+            self.assertEqual(list(Path(tempo_dir).iterdir()), [output_file])
+
+    def test_file_lock(self):
+        """Lock must be exclusive until released."""
+        with TemporaryDirectory(
+            prefix=f"{__title_clean__}_{__version__}_atomic_"
+        ) as tempo_dir:
+            resource = Path(tempo_dir, "index.json")
+
+            with file_lock(resource) as lock_path:
+                self.assertEqual(lock_path, get_lock_path(resource))
+                with self.assertRaises(TimeoutError):
+                    with file_lock(resource, timeout=0.3):
+                        pass
+
+            # released
+            with file_lock(resource, timeout=0.3):
+                pass
+
+
+# ############################################################################
+# ####### Stand-alone run ########
+# ################################
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,294 @@
+#! python3  # noqa E265
+
+"""
+Usage from the repo root folder:
+
+.. code-block:: bash
+    # for whole tests
+    python -m unittest tests.test_utils_cache_store
+    # for specific test
+    python -m unittest tests.test_utils_cache_store.TestUtilsCacheStore.test_fetch
+"""
+
+# standard library
+import hashlib
+import unittest
+from dataclasses import replace
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from os import environ, utime
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from threading import Thread
+from unittest.mock import patch
+
+# 3rd party
+from requests.exceptions import HTTPError
+
+# project
+from geotribu_cli.__about__ import __title_clean__, __version__
+from geotribu_cli.utils.cache_store import (
+    DEFAULT_CACHE_MAX_SIZE,
+    CacheStore,
+    get_cache_max_size,
+)
+from geotribu_cli.utils.http_client import OfflineModeError
+
+# ############################################################################
+# ########## Classes #############
+# ################################
+
+
+class ContentsRequestHandler(BaseHTTPRequestHandler):
+    """Serve /<size>/<name>.md files of <size> bytes, honoring If-None-Match."""
+
+    requests_log: list[tuple[str, int]] = []
+    # set to False to answer 404 to every request
+    is_available: bool = True
+
+    @staticmethod
+    def get_content(path: str) -> bytes:
+        """Build the content of a file: as many bytes as the size in its path.
+
+        Args:
+            path (str): requested path
+
+        Returns:
+            bytes: content, the same for the same size whatever the name
+        """
+        return b"#" * int(path.split("/")[1])
+
+    def do_GET(self):
+        """Answer with 304 if the client has the current version of the file."""
+        if not self.path.endswith(".md") or not ContentsRequestHandler.is_available:
+            self.send_error(404)
+            return
+
+        body = self.get_content(self.path)
+        etag = f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_response(self, code, message=None):
+        """Log requests before answering."""
+        self.requests_log.append((self.path, code))
+        super().send_response(code, message)
+
+    def log_message(self, format, *args):
+        """Keep tests output clean."""
+
+
+class TestUtilsCacheStore(unittest.TestCase):
+    """Test content-addressed cache store."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Start a local HTTP server."""
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), ContentsRequestHandler)
+        cls.server_thread = Thread(target=cls.server.serve_forever, daemon=True)
+        cls.server_thread.start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_port}"
+
+    @classmethod
+    def tearDownClass(cls):
+        """Stop the local HTTP server."""
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        """Reset the requests log."""
+        ContentsRequestHandler.requests_log.clear()
+        ContentsRequestHandler.is_available = True
+
+    def test_fetch(self):
+        """Files must be stored once by content and revalidated when outdated."""
+        with TemporaryDirectory(
+            prefix=f"{__title_clean__}_{__version__}_cache_store_"
+        ) as tempo_dir:
+            store = CacheStore(cache_folder=Path(tempo_dir), max_size=1024 * 1024)
+            url = f"{self.base_url}/1000/article.md"
+
+            object_path = store.fetch(url)
+            content = ContentsRequestHandler.get_content("/1000/article.md")
+            self.assertEqual(object_path.read_bytes(), content)
+            self.assertEqual(object_path.name, hashlib.sha256(content).hexdigest())
+            entry = store.read_manifest()[url]
+            self.assertEqual(entry.size, 1000)
+            self.assertIsNotNone(entry.etag)
+            self.assertFalse(any(store.incoming_folder.glob("*.md")))
+
+            # fresh: no request
+            self.assertEqual(store.fetch(url), object_path)
+            self.assertEqual(len(ContentsRequestHandler.requests_log), 1)
+
+            # outdated: revalidated
+            self.assertEqual(store.fetch(url, expiration_rotating_hours=0), object_path)
+            self.assertEqual(ContentsRequestHandler.requests_log[-1][1], 304)
+            self.assertGreater(store.read_manifest()[url].fetched, entry.fetched)
+
+            # same content at another URL: stored once
+            self.assertEqual(store.fetch(f"{self.base_url}/1000/rdp.md"), object_path)
+            self.assertEqual(len(store.read_manifest()), 2)
+            self.assertEqual(store.get_size(), 1000)
+
+            # missing remote file
+            with self.assertRaises(HTTPError):
+                store.fetch(f"{self.base_url}/missing.json")
+
+    def test_eviction(self):
+        """The least recently used entries must be evicted beyond the maximum size."""
+        with TemporaryDirectory(
+            prefix=f"{__title_clean__}_{__version__}_cache_store_"
+        ) as tempo_dir:
+            store = CacheStore(cache_folder=Path(tempo_dir), max_size=2500)
+            urls = [f"{self.base_url}/{size}/article.md" for size in (1000, 1001, 1002)]
+
+            first_object = store.fetch(urls[0])
+            store.fetch(urls[1])
+            # first one used again: the second one is the least recently used
+            with patch(
+                "geotribu_cli.utils.cache_store.CACHE_ACCESS_TIME_RESOLUTION", 0
+            ):
+                store.fetch(urls[0])
+            store.fetch(urls[2])
+
+            self.assertEqual(set(store.read_manifest()), {urls[0], urls[2]})
+            self.assertEqual(store.get_size(), 2002)
+            self.assertTrue(first_object.exists())
+            self.assertEqual(len(list(store.objects_folder.glob("*/*"))), 2)
+
+            # larger than the maximum size: kept since it's returned
+            big_object = store.fetch(f"{self.base_url}/3000/article.md")
+            self.assertTrue(big_object.exists())
+            self.assertEqual(len(store.read_manifest()), 1)
+
+            # explicit eviction and clear
+            self.assertEqual(len(store.evict(max_size=0)), 1)
+            self.assertFalse(big_object.exists())
+            store.fetch(urls[0])
+            self.assertEqual(len(store.clear()), 1)
+            self.assertEqual(store.get_size(), 0)
+            self.assertFalse(any(store.objects_folder.glob("*/*")))
+
+    def test_access_time(self):
+        """Cache hits must not rewrite the manifest if the entry was used recently."""
+        with TemporaryDirectory(
+            prefix=f"{__title_clean__}_{__version__}_cache_store_"
+        ) as tempo_dir:
+            store = CacheStore(cache_folder=Path(tempo_dir), max_size=1024 * 1024)
+            url = f"{self.base_url}/1000/article.md"
+            store.fetch(url)
+            last_access = store.read_manifest()[url].last_access
+
+            with patch.object(store, "write_manifest") as write_manifest:
+                store.fetch(url)
+                write_manifest.assert_not_called()
+
+            with patch(
+                "geotribu_cli.utils.cache_store.CACHE_ACCESS_TIME_RESOLUTION", 0
+            ):
+                store.fetch(url)
+            self.assertGreater(store.read_manifest()[url].last_access, last_access)
+
+    def test_cached_folders(self):
+        """Cached folders must count in the size and be evicted as a whole, keeping \
+        their lock files."""
+        with TemporaryDirectory(
+            prefix=f"{__title_clean__}_{__version__}_cache_store_"
+        ) as tempo_dir:
+            search_folder = Path(tempo_dir, "search")
+            Path(search_folder, "query_cache").mkdir(parents=True)
+            Path(search_folder, "index.json").write_bytes(b"#" * 1000)
+            Path(search_folder, "index.json.lock").touch()
+            Path(search_folder, "query_cache", "qgis.json").write_bytes(b"#" * 500)
+            rss_folder = Path(tempo_dir, "rss")
+            rss_folder.mkdir()
+            Path(rss_folder, "rss.xml").write_bytes(b"#" * 700)
+            # search folder used long ago
+            for file_path in search_folder.rglob("*"):
+                utime(file_path, (1000, 1000))
+
+            store = CacheStore(
+                cache_folder=Path(tempo_dir, "cache"),
+                max_size=2500,
+                cached_folders=(search_folder, rss_folder, Path(tempo_dir, "img")),
+            )
+            self.assertEqual(
+                [(folder.path, folder.size) for folder in store.read_cached_folders()],
+                [(search_folder, 1500), (rss_folder, 700)],
+            )
+
+            # least recently used: the search folder
+            url = f"{self.base_url}/1000/article.md"
+            store.fetch(url)
+            self.assertEqual(store.get_total_size(), 1700)
+            self.assertEqual(
+                [path.name for path in search_folder.rglob("*")], ["index.json.lock"]
+            )
+            self.assertTrue(Path(rss_folder, "rss.xml").exists())
+
+            # the entry and the RSS folder: nothing left to remove in the search one
+            self.assertEqual(len(store.clear()), 2)
+            self.assertEqual(store.get_total_size(), 0)
+
+    def test_fetched_meanwhile(self):
+        """A file downloaded by another process while waiting for the lock must not \
+        be downloaded again."""
+        with TemporaryDirectory(
+            prefix=f"{__title_clean__}_{__version__}_cache_store_"
+        ) as tempo_dir:
+            store = CacheStore(cache_folder=Path(tempo_dir), max_size=1024 * 1024)
+            url = f"{self.base_url}/1000/article.md"
+            object_path = store.fetch(url)
+            entries = store.read_manifest()
+            # read before the other process revalidated it, then after
+            outdated_entries = {url: replace(entries[url], fetched=0)}
+            with patch.object(
+                store, "read_manifest", side_effect=[outdated_entries, entries]
+            ):
+                self.assertEqual(store.fetch(url), object_path)
+            self.assertEqual(len(ContentsRequestHandler.requests_log), 1)
+
+    def test_stale_copy(self):
+        """An outdated copy must be used offline and if the download fails."""
+        with TemporaryDirectory(
+            prefix=f"{__title_clean__}_{__version__}_cache_store_"
+        ) as tempo_dir:
+            store = CacheStore(cache_folder=Path(tempo_dir), max_size=1024 * 1024)
+            url = f"{self.base_url}/1000/article.md"
+            object_path = store.fetch(url)
+
+            with patch.dict(environ, {"GEOTRIBU_OFFLINE": "true"}):
+                self.assertEqual(
+                    store.fetch(url, expiration_rotating_hours=0), object_path
+                )
+                with self.assertRaises(OfflineModeError):
+                    store.fetch(f"{self.base_url}/1001/article.md")
+            self.assertEqual(len(ContentsRequestHandler.requests_log), 1)
+
+            # server not available anymore
+            ContentsRequestHandler.is_available = False
+            self.assertEqual(store.fetch(url, expiration_rotating_hours=0), object_path)
+            self.assertEqual(ContentsRequestHandler.requests_log[-1][1], 404)
+
+    def test_max_size_from_environment(self):
+        """Test maximum size from environment variable, in Mo."""
+        with patch.dict(environ, {"GEOTRIBU_CACHE_MAX_SIZE": "2.5"}):
+            self.assertEqual(get_cache_max_size(), int(2.5 * 1024 * 1024))
+        with patch.dict(environ, {"GEOTRIBU_CACHE_MAX_SIZE": "many"}):
+            self.assertEqual(get_cache_max_size(), DEFAULT_CACHE_MAX_SIZE * 1024 * 1024)
+
+
+# ############################################################################
+# ####### Stand-alone run ########
+# ################################
+if __name__ == "__main__":
+    unittest.main()
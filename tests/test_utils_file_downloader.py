@@ -0,0 +1,476 @@
+#! python3  # noqa E265
+
+"""
+Usage from the repo root folder:
+
+.. code-block:: bash
+    # for whole tests
+    python -m unittest tests.test_utils_file_downloader
+    # for specific test
+    python -m unittest tests.test_utils_file_downloader.TestUtilsFileDownloader.test_revalidation_not_modified
+"""
+
+# standard library
+import gzip
+import hashlib
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from os import environ
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from threading import Event, Thread
+from unittest.mock import patch
+
+# 3rd party
+from requests.exceptions import ChunkedEncodingError, HTTPError
+
+# project
+from geotribu_cli.__about__ import __title_clean__, __version__
+from geotribu_cli.utils.file_compression import (
+    COMPRESSION_GZIP,
+    detect_file_compression,
+    read_local_file,
+)
+from geotribu_cli.utils.file_downloader import (
+    DOWNLOAD_CHUNK_SIZE_MAX,
+    DOWNLOAD_CHUNK_SIZE_MIN,
+    download_remote_file_to_local,
+    download_remote_files_to_local,
+    get_download_chunk_size,
+    get_local_file_metadata_path,
+    get_partial_file_path,
+    get_running_revalidations,
+    read_local_file_metadata,
+    start_background_revalidation,
+    wait_for_background_revalidations,
+    write_local_file_metadata,
+)
+from geotribu_cli.utils.http_client import OfflineModeError
+from geotribu_cli.utils.json_stream import iter_json_array_items
+from geotribu_cli.utils.retry_policy import RetryPolicy
+
+# ############################################################################
+# ########## Globals #############
+# ################################
+
+REMOTE_CONTENT: bytes = b'{"docs": []}'
+REMOTE_ETAG: str = '"geotribu-v1"'
+RESUMABLE_CONTENT: bytes = bytes(range(256)) * 1024
+
+# ############################################################################
+# ########## Classes #############
+# ################################
+
+
+class ConditionalRequestHandler(BaseHTTPRequestHandler):
+    """Serve a single file, honoring the If-None-Match and Accept-Encoding headers."""
+
+    requests_log: list[tuple[int, dict]] = []
+    # number of bytes sent before closing the connection, for the next response only
+    interrupt_after: int | None = None
+
+    def send_resumable_content(self):
+        """Serve a larger file, honoring the Range and If-Range headers."""
+        start = 0
+        if (
+            self.headers.get("Range", "").startswith("bytes=")
+            and self.headers.get("If-Range") == REMOTE_ETAG
+        ):
+            start = int(self.headers.get("Range")[6:].rstrip("-"))
+        if start >= len(RESUMABLE_CONTENT):
+            self.send_error(416)
+            return
+
+        body = RESUMABLE_CONTENT[start:]
+        self.send_response(206 if start else 200)
+        self.send_header("ETag", REMOTE_ETAG)
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Content-Length", str(len(body)))
+        if start:
+            self.send_header(
+                "Content-Range",
+                f"bytes {start}-{len(RESUMABLE_CONTENT) - 1}/{len(RESUMABLE_CONTENT)}",
+            )
+        self.end_headers()
+
+        interrupt_after = ConditionalRequestHandler.interrupt_after
+        ConditionalRequestHandler.interrupt_after = None
+        self.wfile.write(body[:interrupt_after])
+
+    def do_GET(self):
+        """Answer with 304 if the client has the current version of the file."""
+        if self.path.endswith("/resumable.json"):
+            self.send_resumable_content()
+        elif not self.path.endswith(".json"):
+            self.send_error(404)
+        elif self.headers.get("If-None-Match") == REMOTE_ETAG:
+            self.send_response(304)
+            self.send_header("ETag", REMOTE_ETAG)
+            self.end_headers()
+        else:
+            body = REMOTE_CONTENT
+            self.send_response(200)
+            self.send_header("ETag", REMOTE_ETAG)
+            if "gzip" in self.headers.get("Accept-Encoding", ""):
+                body = gzip.compress(REMOTE_CONTENT)
+                self.send_header("Content-Encoding", "gzip")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    def send_response(self, code, message=None):
+        """Log requests before answering: the client may check the log as soon as \
+        it gets the response."""
+        self.requests_log.append((code, dict(self.headers)))
+        super().send_response(code, message)
+
+    def log_message(self, format, *args):
+        """Keep tests output clean."""
+
+
+class TestUtilsFileDownloader(unittest.TestCase):
+    """Test remote file downloader."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Start a local HTTP server."""
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), ConditionalRequestHandler)
+        cls.server_thread = Thread(target=cls.server.serve_forever, daemon=True)
+        cls.server_thread.start()
+        cls.remote_url = f"http://127.0.0.1:{cls.server.server_port}/search_index.json"
+
+    @classmethod
+    def tearDownClass(cls):
+        """Stop the local HTTP server."""
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        """Reset the requests log."""
+        ConditionalRequestHandler.requests_log.clear()
+
+    def test_revalidation_not_modified(self):
+        """An outdated file must be revalidated and kept if not modified."""
+        with TemporaryDirectory(
+            prefix=f"{__title_clean__}_{__version__}_downloader_"
+        ) as tempo_dir:
+            local_file = Path(tempo_dir, "search_index.json")
+
+            # first download
+            download_remote_file_to_local(
+                remote_url_to_download=self.remote_url, local_file_path=local_file
+            )
+            self.assertEqual(local_file.read_bytes(), REMOTE_CONTENT)
+            self.assertTrue(get_local_file_metadata_path(local_file).is_file())
+            metadata = read_local_file_metadata(local_file)
+            self.assertEqual(metadata.get("url"), self.remote_url)
+            self.assertEqual(metadata.get("etag"), REMOTE_ETAG)
+            self.assertEqual(len(metadata.get("sha256")), 64)
+
+            # file is fresh: no request
+            download_remote_file_to_local(
+                remote_url_to_download=self.remote_url, local_file_path=local_file
+            )
+            self.assertEqual(len(ConditionalRequestHandler.requests_log), 1)
+
+            # file is outdated: conditional request
+            download_remote_file_to_local(
+                remote_url_to_download=self.remote_url,
+                local_file_path=local_file,
+                expiration_rotating_hours=0,
+            )
+            self.assertEqual(len(ConditionalRequestHandler.requests_log), 2)
+            status, headers = ConditionalRequestHandler.requests_log[-1]
+            self.assertEqual(status, 304)
+            self.assertEqual(headers.get("If-None-Match"), REMOTE_ETAG)
+            self.assertEqual(local_file.read_bytes(), REMOTE_CONTENT)
+            self.assertEqual(read_local_file_metadata(local_file), metadata)
+
+    def test_no_validators_without_metadata(self):
+        """Without metadata, an outdated file must be downloaded again."""
+        with TemporaryDirectory(
+            prefix=f"{__title_clean__}_{__version__}_downloader_"
+        ) as tempo_dir:
+            local_file = Path(tempo_dir, "search_index.json")
+            local_file.write_bytes(b"outdated")
+
+            download_remote_file_to_local(
+                remote_url_to_download=self.remote_url,
+                local_file_path=local_file,
+                expiration_rotating_hours=0,
+            )
+            status, headers = ConditionalRequestHandler.requests_log[-1]
+            self.assertEqual(status, 200)
+            self.assertNotIn("If-None-Match", headers)
+            self.assertEqual(local_file.read_bytes(), REMOTE_CONTENT)
+
+    def test_compression(self):
+        """Transfer must be decoded and files compressed at rest only if enabled."""
+        with TemporaryDirectory(
+            prefix=f"{__title_clean__}_{__version__}_downloader_"
+        ) as tempo_dir:
+            local_file = Path(tempo_dir, "search_index.json")
+            compressed_file = Path(tempo_dir, "compressed_search_index.json")
+
+            with patch.dict(environ, {"GEOTRIBU_CACHE_COMPRESSION": "gzip"}):
+                # not enabled by the caller
+                download_remote_file_to_local(
+                    remote_url_to_download=self.remote_url, local_file_path=local_file
+                )
+                download_remote_file_to_local(
+                    remote_url_to_download=self.remote_url,
+                    local_file_path=compressed_file,
+                    compress_at_rest=True,
+                )
+
+            # compressed transfer, decoded while downloading
+            status, headers = ConditionalRequestHandler.requests_log[-1]
+            self.assertIn("gzip", headers.get("Accept-Encoding"))
+            self.assertEqual(local_file.read_bytes(), REMOTE_CONTENT)
+            self.assertIsNone(detect_file_compression(local_file))
+
+            # compressed at rest, transparently decompressed
+            self.assertEqual(detect_file_compression(compressed_file), COMPRESSION_GZIP)
+            self.assertEqual(read_local_file(compressed_file), REMOTE_CONTENT)
+            self.assertEqual(read_local_file(local_file), REMOTE_CONTENT)
+            self.assertEqual(list(iter_json_array_items(compressed_file, "docs")), [])
+            self.assertEqual(
+                read_local_file_metadata(compressed_file).get("sha256"),
+                hashlib.sha256(REMOTE_CONTENT).hexdigest(),
+            )
+
+    def test_resume_download(self):
+        """An interrupted download must be resumed from where it stopped."""
+        remote_url = self.remote_url.replace("search_index", "resumable")
+        with TemporaryDirectory(
+            prefix=f"{__title_clean__}_{__version__}_downloader_"
+        ) as tempo_dir:
+            local_file = Path(tempo_dir, "resumable.json")
+            partial_file = get_partial_file_path(local_file)
+
+            # interrupted, without retry: the partial download is kept
+            ConditionalRequestHandler.interrupt_after = 100_000
+            with self.assertRaises(ChunkedEncodingError):
+                download_remote_file_to_local(
+                    remote_url_to_download=remote_url,
+                    local_file_path=local_file,
+                    retry_policy=RetryPolicy(max_attempts=1),
+                )
+            self.assertFalse(local_file.exists())
+            partial_size = partial_file.stat().st_size
+            self.assertTrue(0 < partial_size <= 100_000)
+            self.assertEqual(
+                partial_file.read_bytes(), RESUMABLE_CONTENT[:partial_size]
+            )
+
+            download_remote_file_to_local(
+                remote_url_to_download=remote_url, local_file_path=local_file
+            )
+            status, headers = ConditionalRequestHandler.requests_log[-1]
+            self.assertEqual(status, 206)
+            self.assertEqual(headers.get("Range"), f"bytes={partial_size}-")
+            self.assertEqual(headers.get("If-Range"), REMOTE_ETAG)
+            self.assertEqual(local_file.read_bytes(), RESUMABLE_CONTENT)
+            self.assertEqual(
+                read_local_file_metadata(local_file).get("sha256"),
+                hashlib.sha256(RESUMABLE_CONTENT).hexdigest(),
+            )
+            self.assertFalse(partial_file.exists())
+            self.assertFalse(get_local_file_metadata_path(partial_file).exists())
+
+            # interrupted then retried: resumed by the next attempt
+            ConditionalRequestHandler.interrupt_after = 100_000
+            ConditionalRequestHandler.requests_log.clear()
+            download_remote_file_to_local(
+                remote_url_to_download=remote_url,
+                local_file_path=local_file,
+                expiration_rotating_hours=0,
+                retry_policy=RetryPolicy(backoff_factor=0),
+            )
+            self.assertEqual(
+                [status for status, _ in ConditionalRequestHandler.requests_log],
+                [200, 206],
+            )
+            self.assertEqual(local_file.read_bytes(), RESUMABLE_CONTENT)
+
+    def test_resume_changed_download(self):
+        """A partial download of another version must be started over."""
+        remote_url = self.remote_url.replace("search_index", "resumable")
+        with TemporaryDirectory(
+            prefix=f"{__title_clean__}_{__version__}_downloader_"
+        ) as tempo_dir:
+            local_file = Path(tempo_dir, "resumable.json")
+            partial_file = get_partial_file_path(local_file)
+            partial_file.write_bytes(b"previous version")
+            write_local_file_metadata(
+                local_file_path=partial_file,
+                metadata={"url": remote_url, "etag": '"geotribu-v0"'},
+            )
+
+            download_remote_file_to_local(
+                remote_url_to_download=remote_url, local_file_path=local_file
+            )
+            status, headers = ConditionalRequestHandler.requests_log[-1]
+            self.assertEqual(status, 200)
+            self.assertEqual(headers.get("If-Range"), '"geotribu-v0"')
+            self.assertEqual(local_file.read_bytes(), RESUMABLE_CONTENT)
+            self.assertFalse(partial_file.exists())
+
+    def test_deprecated_timeout(self):
+        """The deprecated timeout must replace the timeouts of the retry policy."""
+        with (
+            TemporaryDirectory(
+                prefix=f"{__title_clean__}_{__version__}_downloader_"
+            ) as tempo_dir,
+            patch(
+                "geotribu_cli.utils.file_downloader.revalidate_local_file",
+                side_effect=lambda **kwargs: kwargs.get("local_file_path"),
+            ) as revalidate_local_file,
+        ):
+            local_file = Path(tempo_dir, "search_index.json")
+            with self.assertWarns(DeprecationWarning):
+                download_remote_file_to_local(
+                    remote_url_to_download=self.remote_url,
+                    local_file_path=local_file,
+                    timeout=(5, 7),
+                    retry_policy=RetryPolicy(max_attempts=1),
+                )
+            retry_policy = revalidate_local_file.call_args.kwargs.get("retry_policy")
+            self.assertEqual(retry_policy.connect_timeout, 5)
+            self.assertEqual(retry_policy.read_timeout, 7)
+            self.assertEqual(retry_policy.max_attempts, 1)
+
+            with self.assertWarns(DeprecationWarning):
+                download_remote_file_to_local(
+                    remote_url_to_download=self.remote_url,
+                    local_file_path=local_file,
+                    timeout=3,
+                )
+            retry_policy = revalidate_local_file.call_args.kwargs.get("retry_policy")
+            self.assertEqual(retry_policy.connect_timeout, 3)
+            self.assertEqual(retry_policy.read_timeout, 3)
+
+    def test_background_revalidations(self):
+        """A file must be revalidated once at a time, ended revalidations forgotten."""
+        local_file = Path("search_index.json")
+        revalidation_allowed = Event()
+        with patch(
+            "geotribu_cli.utils.file_downloader.revalidate_local_file",
+            side_effect=lambda **kwargs: revalidation_allowed.wait(),
+        ) as revalidate_local_file:
+            thread = start_background_revalidation(local_file_path=local_file)
+            self.assertIs(
+                start_background_revalidation(local_file_path=local_file), thread
+            )
+            self.assertEqual(get_running_revalidations(), [local_file])
+
+            revalidation_allowed.set()
+            wait_for_background_revalidations(timeout=None)
+            self.assertEqual(get_running_revalidations(), [])
+            self.assertEqual(revalidate_local_file.call_count, 1)
+
+    def test_stale_copy(self):
+        """An outdated file must be used while revalidated, on failure and offline."""
+        with TemporaryDirectory(
+            prefix=f"{__title_clean__}_{__version__}_downloader_"
+        ) as tempo_dir:
+            local_file = Path(tempo_dir, "search_index.json")
+            local_file.write_bytes(b"outdated")
+
+            # returned right away, then downloaded in background
+            self.assertEqual(
+                download_remote_file_to_local(
+                    remote_url_to_download=self.remote_url,
+                    local_file_path=local_file,
+                    expiration_rotating_hours=0,
+                    stale_while_revalidate=True,
+                ),
+                local_file,
+            )
+            wait_for_background_revalidations(timeout=None)
+            self.assertEqual(ConditionalRequestHandler.requests_log[-1][0], 200)
+            self.assertEqual(local_file.read_bytes(), REMOTE_CONTENT)
+
+            # kept if the download fails
+            missing_remote_url = f"{self.remote_url}.missing"
+            self.assertEqual(
+                download_remote_file_to_local(
+                    remote_url_to_download=missing_remote_url,
+                    local_file_path=local_file,
+                    expiration_rotating_hours=0,
+                ),
+                local_file,
+            )
+            self.assertEqual(local_file.read_bytes(), REMOTE_CONTENT)
+            with self.assertRaises(HTTPError):
+                download_remote_file_to_local(
+                    remote_url_to_download=missing_remote_url,
+                    local_file_path=Path(tempo_dir, "missing.json"),
+                )
+
+            # offline: no request at all
+            requests_count = len(ConditionalRequestHandler.requests_log)
+            with patch.dict(environ, {"GEOTRIBU_OFFLINE": "true"}):
+                self.assertEqual(
+                    download_remote_file_to_local(
+                        remote_url_to_download=self.remote_url,
+                        local_file_path=local_file,
+                        expiration_rotating_hours=0,
+                    ),
+                    local_file,
+                )
+                with self.assertRaises(OfflineModeError):
+                    download_remote_file_to_local(
+                        remote_url_to_download=self.remote_url,
+                        local_file_path=Path(tempo_dir, "never_downloaded.json"),
+                    )
+            self.assertEqual(
+                len(ConditionalRequestHandler.requests_log), requests_count
+            )
+
+    def test_download_chunk_size(self):
+        """Chunks must be larger for larger files, within bounds."""
+        self.assertEqual(get_download_chunk_size(None), DOWNLOAD_CHUNK_SIZE_MIN * 4)
+        self.assertEqual(get_download_chunk_size(1024), DOWNLOAD_CHUNK_SIZE_MIN)
+        self.assertEqual(get_download_chunk_size(10 * 1024 * 1024), 320 * 1024)
+        self.assertEqual(
+            get_download_chunk_size(1024 * 1024 * 1024), DOWNLOAD_CHUNK_SIZE_MAX
+        )
+
+    def test_batch_download(self):
+        """Files must be downloaded at once, with errors returned per file."""
+        with TemporaryDirectory(
+            prefix=f"{__title_clean__}_{__version__}_downloader_"
+        ) as tempo_dir:
+            files_to_download = [
+                (
+                    self.remote_url.replace("search_index", f"file_{i}"),
+                    Path(tempo_dir, f"file_{i}.json"),
+                    24,
+                )
+                for i in range(5)
+            ]
+            files_to_download.insert(
+                2, (f"{self.remote_url}.missing", Path(tempo_dir, "missing.json"), 24)
+            )
+
+            results = download_remote_files_to_local(
+                files_to_download=files_to_download, max_workers=3
+            )
+
+            self.assertEqual(len(results), len(files_to_download))
+            self.assertIsInstance(results[2], Exception)
+            for (_, local_file, _), result in zip(files_to_download, results):
+                if result is results[2]:
+                    continue
+                self.assertEqual(result, local_file)
+                self.assertEqual(local_file.read_bytes(), REMOTE_CONTENT)
+
+            self.assertEqual(download_remote_files_to_local([]), [])
+
+
+# ############################################################################
+# ####### Stand-alone run ########
+# ################################
+if __name__ == "__main__":
+    unittest.main()
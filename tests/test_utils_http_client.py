@@ -0,0 +1,58 @@
+#! python3  # noqa E265
+
+"""
+Usage from the repo root folder:
+
+.. code-block:: bash
+    # for whole tests
+    python -m unittest tests.test_utils_http_client
+    # for specific test
+    python -m unittest tests.test_utils_http_client.TestUtilsHttpClient.test_shared_session
+"""
+
+# standard library
+import unittest
+from os import environ
+from unittest.mock import patch
+
+# project
+from geotribu_cli.utils.http_client import (
+    DEFAULT_POOL_SIZE,
+    get_http_session,
+    get_pool_size,
+)
+from geotribu_cli.utils.proxies import get_proxy_settings
+
+# ############################################################################
+# ########## Classes #############
+# ################################
+
+
+class TestUtilsHttpClient(unittest.TestCase):
+    """Test shared HTTP session."""
+
+    def test_shared_session(self):
+        """The same session must be returned to every caller."""
+        session = get_http_session()
+        self.assertIs(session, get_http_session())
+        self.assertEqual(session.proxies, get_proxy_settings())
+        self.assertIn("User-Agent", session.headers)
+        self.assertEqual(
+            session.get_adapter("https://geotribu.fr")._pool_maxsize, get_pool_size()
+        )
+
+    def test_pool_size(self):
+        """Test pool size from environment variable."""
+        with patch.dict(environ, {"GEOTRIBU_HTTP_POOL_SIZE": "4"}):
+            self.assertEqual(get_pool_size(), 4)
+        with patch.dict(environ, {"GEOTRIBU_HTTP_POOL_SIZE": "0"}):
+            self.assertEqual(get_pool_size(), 1)
+        with patch.dict(environ, {"GEOTRIBU_HTTP_POOL_SIZE": "many"}):
+            self.assertEqual(get_pool_size(), DEFAULT_POOL_SIZE)
+
+
+# ############################################################################
+# ####### Stand-alone run ########
+# ################################
+if __name__ == "__main__":
+    unittest.main()
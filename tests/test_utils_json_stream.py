@@ -0,0 +1,131 @@
+#! python3  # noqa E265
+
+"""
+Usage from the repo root folder:
+
+.. code-block:: bash
+    # for whole tests
+    python -m unittest tests.test_utils_json_stream
+    # for specific test
+    python -m unittest tests.test_utils_json_stream.TestUtilsJsonStream.test_same_items
+"""
+
+# standard library
+import json
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+# project
+from geotribu_cli.__about__ import __title_clean__, __version__
+from geotribu_cli.utils.json_stream import iter_json_array_items
+
+# ############################################################################
+# ########## Globals #############
+# ################################
+
+SAMPLE_LISTING: dict = {
+    "config": {"lang": ["fr"], "separator": "[\\s\\-]+", "pipeline": ["stemmer"]},
+    "docs": [
+        {
+            "location": "articles/2023/2023-01-05_qgis/",
+            "title": 'Écrire un plugin "QGIS"',
+            "tags": ["QGIS", "Python"],
+            "text": "Du texte avec des accents : é, à, ç et un émoji 🌍.",
+        },
+        {"location": "", "title": "Accueil", "text": "", "tags": []},
+        1234567890,
+        -12.5e3,
+        None,
+        True,
+        [],
+        {"location": "rdp/2021/rdp_2021-02-05/", "title": "GeoRDP", "text": "ok"},
+        {
+            "location": "articles/2024/2024-02-01_windows/",
+            "title": "Chemins Windows",
+            "text": 'C:\\OSGeo4W\\ et "crochets" ] } [ { \u0001 \\',
+        },
+    ],
+}
+
+# ############################################################################
+# ########## Classes #############
+# ################################
+
+
+class TestUtilsJsonStream(unittest.TestCase):
+    """Test incremental JSON reader."""
+
+    def setUp(self):
+        """Create a temporary folder."""
+        self.tempo_dir = TemporaryDirectory(
+            prefix=f"{__title_clean__}_{__version__}_json_stream_"
+        )
+        self.json_file = Path(self.tempo_dir.name, "search_index.json")
+
+    def tearDown(self):
+        """Remove temporary files."""
+        self.tempo_dir.cleanup()
+
+    def test_same_items(self):
+        """Items must be the same as the ones parsed from the whole file."""
+        for indent in (None, 4):
+            self.json_file.write_text(
+                json.dumps(SAMPLE_LISTING, ensure_ascii=False, indent=indent),
+                encoding="UTF-8",
+            )
+            # small chunks so that values are split between several chunks
+            for chunk_size in (1, 3, 7, 64, 64 * 1024):
+                with self.subTest(indent=indent, chunk_size=chunk_size):
+                    self.assertEqual(
+                        list(
+                            iter_json_array_items(
+                                json_filepath=self.json_file,
+                                array_key="docs",
+                                chunk_size=chunk_size,
+                            )
+                        ),
+                        SAMPLE_LISTING.get("docs"),
+                    )
+
+    def test_decoded_once(self):
+        """Values spanning many chunks must be decoded once."""
+        listing = {"docs": [{"location": "articles/", "text": "texte " * 10000}] * 3}
+        self.json_file.write_text(json.dumps(listing), encoding="UTF-8")
+        with patch.object(
+            json.JSONDecoder,
+            "raw_decode",
+            autospec=True,
+            side_effect=json.JSONDecoder.raw_decode,
+        ) as raw_decode:
+            items = list(iter_json_array_items(self.json_file, "docs", chunk_size=64))
+        self.assertEqual(items, listing.get("docs"))
+        # key then items, each one after at most one attempt on an incomplete buffer
+        self.assertLessEqual(raw_decode.call_count, 2 * (1 + len(items)))
+
+    def test_empty_array(self):
+        """An empty array must not yield anything."""
+        self.json_file.write_text('{"docs": [ ]}', encoding="UTF-8")
+        self.assertEqual(list(iter_json_array_items(self.json_file, "docs")), [])
+
+    def test_invalid_data(self):
+        """Invalid files must raise a ValueError."""
+        for content in (
+            '{"config": {}}',
+            "{}",
+            '["docs"]',
+            '{"docs": {"location": "articles/"}}',
+            '{"docs": [{"location": "articles/"} {"location": "rdp/"}]}',
+            '{"docs": [{"location": "articles/"',
+        ):
+            self.json_file.write_text(content, encoding="UTF-8")
+            with self.subTest(content=content), self.assertRaises(ValueError):
+                list(iter_json_array_items(self.json_file, "docs", chunk_size=4))
+
+
+# ############################################################################
+# ####### Stand-alone run ########
+# ################################
+if __name__ == "__main__":
+    unittest.main()
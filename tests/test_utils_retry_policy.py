@@ -0,0 +1,153 @@
+#! python3  # noqa E265
+
+"""
+Usage from the repo root folder:
+
+.. code-block:: bash
+    # for whole tests
+    python -m unittest tests.test_utils_retry_policy
+    # for specific test
+    python -m unittest tests.test_utils_retry_policy.TestUtilsRetryPolicy.test_call
+"""
+
+# standard library
+import unittest
+from os import environ
+from unittest.mock import patch
+
+# 3rd party
+from requests import Response
+from requests.exceptions import ConnectionError, HTTPError, ReadTimeout
+
+# project
+from geotribu_cli.utils.retry_policy import RetryPolicy, get_retry_policy
+
+# ############################################################################
+# ########## Functions ###########
+# ################################
+
+
+def http_error(status_code: int, headers: dict | None = None) -> HTTPError:
+    """Build an HTTP error as raised by Response.raise_for_status.
+
+    Args:
+        status_code (int): HTTP status code
+        headers (dict | None, optional): response headers. Defaults to None.
+
+    Returns:
+        HTTPError: error with its response
+    """
+    response = Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    return HTTPError(f"HTTP {status_code}", response=response)
+
+
+# ############################################################################
+# ########## Classes #############
+# ################################
+
+
+class TestUtilsRetryPolicy(unittest.TestCase):
+    """Test retry policy."""
+
+    def test_is_retryable(self):
+        """Only transient errors must be retried."""
+        policy = RetryPolicy()
+        self.assertTrue(policy.is_retryable(ConnectionError()))
+        self.assertTrue(policy.is_retryable(ReadTimeout()))
+        self.assertTrue(policy.is_retryable(http_error(503)))
+        self.assertTrue(policy.is_retryable(http_error(429)))
+        self.assertFalse(policy.is_retryable(http_error(404)))
+        self.assertFalse(policy.is_retryable(http_error(403)))
+
+    def test_get_delay(self):
+        """Delays must grow exponentially, with jitter, up to the maximum."""
+        policy = RetryPolicy(backoff_factor=1, backoff_max=5, jitter=0.5)
+        for attempt, expected in ((1, 1), (2, 2), (3, 4), (4, 5), (10, 5)):
+            with self.subTest(attempt=attempt):
+                delay = policy.get_delay(attempt)
+                self.assertGreaterEqual(delay, expected * 0.5)
+                self.assertLessEqual(delay, expected)
+
+        self.assertEqual(RetryPolicy(jitter=0, backoff_factor=1).get_delay(3), 4)
+        # Retry-After is honored, up to the maximum
+        self.assertEqual(policy.get_delay(1, http_error(503, {"Retry-After": "3"})), 3)
+        self.assertEqual(
+            policy.get_delay(1, http_error(503, {"Retry-After": "120"})), 5
+        )
+
+    def test_call(self):
+        """Transient failures must be retried up to the maximum of attempts."""
+        policy = RetryPolicy(
+            max_attempts=3, connect_timeout=2, read_timeout=5, backoff_factor=0
+        )
+        timeouts = []
+
+        def flaky(timeout: tuple[float, float]) -> str:
+            timeouts.append(timeout)
+            if len(timeouts) < 3:
+                raise ConnectionError("connection reset")
+            return "ok"
+
+        self.assertEqual(policy.call(flaky), "ok")
+        self.assertEqual(len(timeouts), 3)
+        for connect_timeout, read_timeout in timeouts:
+            self.assertLessEqual(connect_timeout, 2)
+            self.assertLessEqual(read_timeout, 5)
+
+        # attempts exhausted
+        timeouts.clear()
+        with self.assertRaises(ConnectionError):
+            RetryPolicy(max_attempts=2, backoff_factor=0).call(flaky)
+        self.assertEqual(len(timeouts), 2)
+
+        # not retryable
+        calls = []
+
+        def not_found(timeout: tuple[float, float]):
+            calls.append(timeout)
+            raise http_error(404)
+
+        with self.assertRaises(HTTPError):
+            policy.call(not_found)
+        self.assertEqual(len(calls), 1)
+
+        # no retry after the deadline, timeouts bounded by the remaining time
+        calls.clear()
+
+        def unavailable(timeout: tuple[float, float]):
+            calls.append(timeout)
+            raise http_error(503, {"Retry-After": "1"})
+
+        with self.assertRaises(HTTPError):
+            RetryPolicy(max_attempts=5, deadline=0.5).call(unavailable)
+        self.assertEqual(len(calls), 1)
+        self.assertLessEqual(calls[0][1], 0.5)
+
+    def test_policy_from_environment(self):
+        """Test retry policy from environment variables."""
+        with patch.dict(
+            environ,
+            {
+                "GEOTRIBU_HTTP_MAX_ATTEMPTS": "5",
+                "GEOTRIBU_HTTP_CONNECT_TIMEOUT": "2.5",
+                "GEOTRIBU_HTTP_READ_TIMEOUT": "many",
+                "GEOTRIBU_HTTP_DEADLINE": "0",
+            },
+        ):
+            policy = get_retry_policy()
+        self.assertEqual(policy.max_attempts, 5)
+        self.assertEqual(policy.connect_timeout, 2.5)
+        self.assertEqual(policy.read_timeout, RetryPolicy().read_timeout)
+        self.assertIsNone(policy.deadline)
+
+        with patch.dict(environ, {"GEOTRIBU_HTTP_MAX_ATTEMPTS": "0"}):
+            self.assertEqual(get_retry_policy().max_attempts, 1)
+
+
+# ############################################################################
+# ####### Stand-alone run ########
+# ################################
+if __name__ == "__main__":
+    unittest.main()